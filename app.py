@@ -10,10 +10,17 @@ project_root = Path(__file__).parent
 sys.path.append(str(project_root))
 
 from config import Config, setup_page_config
-from utils.ai_services import GeminiService, FactCheckService
+from utils.ai_services import (GeminiService, FactCheckService, StreamIncompleteError, iter_sections, GEMINI_MODELS,
+                               FACTCHECK_BREAKER)
 from utils.news_services import NewsAggregator
 from utils.security import SecurityService
 from utils.database import FirebaseService
+from utils.http_client import get_http_client
+from utils.health import get_health_monitor
+from utils.concurrency import run_stages
+from utils.near_duplicate import get_near_duplicate_index
+from utils.resilience import get_breaker
+from utils.response_parser import ForensicReport, parse_forensic_response, report_risk
 from pages.authority import authority_interface
 from pages.admin import admin_interface
 
@@ -25,6 +32,17 @@ news_aggregator = NewsAggregator()
 security_service = SecurityService()
 firebase_service = FirebaseService()
 
+# Pre-warm pooled connections to the external APIs (no-op after the first run)
+get_http_client().warm_up(Config.HTTP_WARMUP_URLS)
+
+# Dependency health is probed in the background; reruns only read the cached status
+health_monitor = get_health_monitor()
+health_monitor.register("gemini", gemini_service.health_check)
+health_monitor.register("factcheck", fact_check_service.health_check)
+health_monitor.register("news", news_aggregator.test_connection)
+health_monitor.register("security", security_service.test_connection)
+health_monitor.register("database", firebase_service.test_connection)
+
 def main():
     setup_page_config()
     
@@ -232,18 +250,32 @@ def display_api_status():
     st.sidebar.markdown("---")
     st.sidebar.subheader("🔑 System Status")
     
-    # Test all services
-    services_status = {
-        "🤖 Gemini AI": gemini_service.test_connection(),
-        "✅ Fact Check": fact_check_service.test_connection(),
-        "📰 News APIs": news_aggregator.test_connection(),
-        "🔒 Security": security_service.test_connection(),
-        "☁️ Database": firebase_service.test_connection()
+    # Last results of the background health probes
+    services = {
+        "gemini": "🤖 Gemini AI",
+        "factcheck": "✅ Fact Check",
+        "news": "📰 News APIs",
+        "security": "🔒 Security",
+        "database": "☁️ Database"
     }
     
-    for service, status in services_status.items():
-        icon = "✅" if status else "❌"
-        st.sidebar.write(f"{icon} {service}")
+    for name, service in services.items():
+        status = health_monitor.status(name)
+        icon = "⏳" if status['ok'] is None else "✅" if status['ok'] else "❌"
+        label = f"{icon} {service}"
+        if status['checked_at']:
+            label += f" ({int(datetime.now().timestamp() - status['checked_at'])}s ago)"
+        st.sidebar.write(label)
+    
+    # Circuit breakers around the external APIs
+    st.sidebar.markdown("**⚡ Circuit Breakers**")
+    breaker_icons = {"closed": "🟢", "half_open": "🟡", "open": "🔴"}
+    for name in GEMINI_MODELS + [FACTCHECK_BREAKER]:
+        breaker = get_breaker(name).snapshot()
+        label = f"{breaker_icons[breaker['state']]} {name}: {breaker['state'].replace('_', '-')}"
+        if breaker['state'] == "open":
+            label += f" ({breaker['retry_in']:.0f}s)"
+        st.sidebar.write(label)
     
     # User info
     st.sidebar.markdown("---")
@@ -333,7 +365,7 @@ def text_forensics_interface():
     if st.button("🚀 Analyze Text", type="primary", use_container_width=True):
         if user_text.strip():
             # Validate input
-            is_valid, validation_msg = security_service.validate_input(user_text)
+            is_valid, validation_msg = security_service.validate_input(user_text, max_length=Config.MAX_DOCUMENT_CHARS)
             if not is_valid:
                 st.error(f"❌ {validation_msg}")
                 return
@@ -345,10 +377,19 @@ def text_forensics_interface():
             forensic_level = "Deep Forensics" if analysis_level == "Deep Analysis" else "Quick Scan"
             track_origin = (analysis_level == "Deep Analysis")
             
+            # Render each section of the AI verdict as soon as it is generated
+            live_preview = st.empty()
+            live_sections = live_preview.container()
+            
+            def show_section(title, body):
+                live_sections.markdown(f"**{title}**\n\n{body}")
+            
             with st.spinner("🔍 AI is analyzing your text..."):
                 results = conduct_forensic_analysis(
-                    sanitized_text, language, forensic_level, True, track_origin, safety_check
+                    sanitized_text, language, forensic_level, True, track_origin, safety_check,
+                    on_section=show_section if Config.GEMINI_STREAMING else None
                 )
+                live_preview.empty()
                 display_forensic_results(results)
                 
                 # Save to database
@@ -358,8 +399,8 @@ def text_forensics_interface():
         else:
             st.warning("⚠️ Please enter some text to analyze")
 
-def conduct_forensic_analysis(text, language, level, context, origin, safety):
-    """Comprehensive forensic analysis"""
+def conduct_forensic_analysis(text, language, level, context, origin, safety, on_section=None):
+    """Comprehensive forensic analysis (on_section streams the AI verdict section by section)"""
     results = {
         'risk_score': 0,
         'credibility_score': 0,
@@ -370,17 +411,19 @@ def conduct_forensic_analysis(text, language, level, context, origin, safety):
         'context_analysis': None,
         'safety_analysis': None,
         'structure_analysis': None,
-        'recommendations': []
+        'recommendations': [],
+        'language': language
     }
     
     # Basic risk calculation
     results['risk_score'] = calculate_risk_score(text)
     
+    manipulation_results = security_service.detect_manipulation_patterns(text)
+    
     # Security analysis
     if safety:
         results['safety_analysis'] = security_service.check_content_safety(text)
         results['structure_analysis'] = security_service.analyze_text_structure(text)
-        manipulation_results = security_service.detect_manipulation_patterns(text)
         results['manipulation_tactics'] = list(manipulation_results['patterns'].keys())
         
         # Adjust risk score based on security analysis
@@ -391,38 +434,141 @@ def conduct_forensic_analysis(text, language, level, context, origin, safety):
     if not results['manipulation_tactics']:
         results['manipulation_tactics'] = detect_manipulation_tactics(text)
     
-    # Fact checking
-    results['fact_checks'] = fact_check_service.search_claims(text)
+    # Kept apart so a later AI re-score can be combined with it the same way
+    results['heuristic_risk_score'] = results['risk_score']
     
-    # AI analysis with Gemini - ALWAYS run for all levels
-    try:
-        results['ai_analysis'] = gemini_service.forensic_analysis(text, language)
-        # Update risk score based on AI analysis
-        ai_risk_adjustment = analyze_ai_response_for_risk(results['ai_analysis'])
-        results['risk_score'] = max(results['risk_score'], ai_risk_adjustment)
+    # Fact checking, AI analysis, origin tracking and context analysis are
+    # independent network calls, so run them concurrently and merge as they land
+    deadlines = Config.PIPELINE_STAGE_DEADLINES
+    
+    def stream_ai_analysis(model="gemini-1.5-pro"):
+        chunks = []
+        
+        def collect():
+            for chunk in gemini_service.stream_forensic_analysis(text, language, model=model):
+                chunks.append(chunk)
+                yield chunk
         
-        # Extract sources and reporting information
-        sources_and_reporting = gemini_service.extract_sources_and_reporting(results['ai_analysis'])
-        results['source_links'] = sources_and_reporting['sources']
-        results['reporting_emails'] = sources_and_reporting['reporting_emails']
-    except Exception as e:
-        results['ai_analysis'] = f"AI analysis temporarily unavailable: {str(e)}"
-        results['source_links'] = []
-        results['reporting_emails'] = []
-    
-    # Origin tracking
-    if origin and level == "Deep Forensics":
+        if model == "gemini-1.5-pro" and Config.GEMINI_CASCADE:
+            on_section("ESCALATING TO GEMINI-1.5-PRO", "Getting a second opinion on an uncertain verdict...")
         try:
-            results['origin_analysis'] = gemini_service.trace_origin(text)
-        except Exception as e:
-            results['origin_analysis'] = f"Origin tracking unavailable: {str(e)}"
+            for title, body in iter_sections(collect()):
+                on_section(title, body)
+        except StreamIncompleteError:
+            # A cut-off stream is not a verdict; retry once without streaming
+            return gemini_service.forensic_analysis(text, language, model=model)
+        return "".join(chunks) or None
+    
+    def run_ai_analysis():
+        if not Config.GEMINI_CASCADE:
+            return stream_ai_analysis() if on_section else gemini_service.forensic_analysis(text, language)
+        # Flash answers confident cases consistent with the local heuristics
+        return gemini_service.cascade_forensic_analysis(
+            text, language,
+            heuristic_risk=results['risk_score'],
+            manipulation_risk=manipulation_results['risk_assessment'],
+            run=stream_ai_analysis if on_section else None
+        )
     
-    # Context analysis
-    if context:
-        try:
-            results['context_analysis'] = gemini_service.analyze_context(text)
-        except Exception as e:
-            results['context_analysis'] = f"Context analysis unavailable: {str(e)}"
+    stages = {
+        # Slow claims time out inside; the slack lets the claims that finished come back
+        'fact_checks': (
+            lambda: fact_check_service.search_text_claims(text, language, deadlines['fact_checks']),
+            deadlines['fact_checks'] + 5
+        )
+    }
+    deep = origin and level == "Deep Forensics"
+    long_document = len(text) > Config.LONG_DOCUMENT_CHARS
+    # Origin and context cues sit in the lead of a long document
+    lead = text[:Config.LONG_DOCUMENT_CHARS]
+    
+    # A near-duplicate of an analyzed text (same hoax, new emoji or one changed word)
+    # reuses its AI verdict; the local checks above still run on this text
+    near_duplicate = None
+    if Config.NEAR_DUPLICATE_REUSE and not long_document:
+        # The reused verdict is written in the language of the original analysis
+        near_duplicate = get_near_duplicate_index().lookup(text, language=language)
+        if near_duplicate and not near_duplicate['payload'].get('ai_analysis'):
+            near_duplicate = None  # nothing worth reusing
+    reused = near_duplicate['payload'] if near_duplicate else {}
+    
+    if long_document:
+        # Map-reduce over excerpts; they time out inside, the slack lets the reduce finish
+        stages['long_document'] = (
+            lambda: gemini_service.long_document_analysis(text, language, deadlines['long_document']),
+            deadlines['long_document'] + 10
+        )
+    elif reused:
+        pass
+    elif deep and context and Config.GEMINI_COMBINED_MODE:
+        # One structured request covers forensic, origin and context analysis
+        stages['combined'] = (lambda: gemini_service.combined_analysis(text, language), deadlines['combined'])
+    else:
+        # AI analysis with Gemini - ALWAYS run for all levels
+        stages['ai_analysis'] = (run_ai_analysis, deadlines['ai_analysis'])
+    if 'combined' not in stages:
+        if deep and not reused.get('origin_analysis'):
+            stages['origin_analysis'] = (lambda: gemini_service.trace_origin(lead), deadlines['origin_analysis'])
+        if context and not reused.get('context_analysis'):
+            stages['context_analysis'] = (lambda: gemini_service.analyze_context(lead), deadlines['context_analysis'])
+    
+    results['source_links'] = []
+    results['reporting_emails'] = []
+    
+    def merge_stage(name, value, error, structured_report=None):
+        if name == 'combined':
+            if error is None and value is None:
+                error = "no response"
+            merge_stage('ai_analysis', value and value['forensic'], error, value and value['report'])
+            merge_stage('origin_analysis', value and value['origin'], error)
+            merge_stage('context_analysis', value and value['context'], error)
+        elif name == 'long_document':
+            if error is None and value is None:
+                error = "no excerpt could be analyzed"
+            if value:
+                # Tactics found in any excerpt count for the whole document
+                results['manipulation_tactics'] = list(dict.fromkeys(
+                    results['manipulation_tactics'] + value['manipulation_tactics']
+                ))
+            merge_stage('ai_analysis', value and value['text'], error)
+        elif name == 'fact_checks':
+            results['fact_checks'] = value if error is None else []
+        elif name == 'ai_analysis':
+            if error is None and not value:
+                # Rate limited, breaker open or HTTP error: the service returned nothing
+                error = "no response"
+            if error is not None:
+                results['ai_analysis'] = f"AI analysis temporarily unavailable: {str(error)}"
+                return
+            results['ai_analysis'] = value
+            # Parse once; scoring, sources and reporting all read the typed report
+            report = structured_report or gemini_service.parse_analysis(value)
+            results['ai_report'] = report
+            
+            # Update risk score based on AI analysis
+            ai_risk_adjustment = analyze_ai_response_for_risk(report)
+            results['risk_score'] = max(results['risk_score'], ai_risk_adjustment)
+            
+            # Extract sources and reporting information
+            results['source_links'] = report.sources_as_dicts()
+            results['reporting_emails'] = report.reporting_as_dicts()
+        elif name == 'origin_analysis':
+            results['origin_analysis'] = value if error is None else f"Origin tracking unavailable: {str(error)}"
+        elif name == 'context_analysis':
+            results['context_analysis'] = value if error is None else f"Context analysis unavailable: {str(error)}"
+    
+    if reused:
+        results['near_duplicate'] = {
+            'analysis_id': reused['analysis_id'],
+            'similarity': near_duplicate['similarity']
+        }
+        merge_stage('ai_analysis', reused['ai_analysis'], None)
+        if deep and reused.get('origin_analysis'):
+            merge_stage('origin_analysis', reused['origin_analysis'], None)
+        if context and reused.get('context_analysis'):
+            merge_stage('context_analysis', reused['context_analysis'], None)
+    
+    run_stages(stages, on_result=merge_stage)
     
     # Calculate credibility score
     results['credibility_score'] = calculate_credibility(results)
@@ -433,45 +579,13 @@ def conduct_forensic_analysis(text, language, level, context, origin, safety):
     return results
 
 def analyze_ai_response_for_risk(ai_response):
-    """Analyze AI response to determine risk level"""
-    if not ai_response or "AI analysis temporarily unavailable" in str(ai_response):
+    """Analyze AI response (text or parsed ForensicReport) to determine risk level"""
+    if not ai_response or "AI analysis temporarily unavailable" in str(getattr(ai_response, 'raw', ai_response)):
         return 0
     
-    response_lower = str(ai_response).lower()
-    
-    # Check for explicit veracity assessment from AI
-    if 'false information' in response_lower:
-        return 90  # Very high risk for false information
-    elif 'misleading' in response_lower:
-        return 80  # High risk for misleading content
-    elif 'unverified' in response_lower:
-        return 60  # Medium-high risk for unverified content
-    elif 'true' in response_lower and 'veracity assessment' in response_lower:
-        return 10  # Low risk for verified true content
-    
-    # Fallback to keyword analysis
-    high_risk_indicators = [
-        'false', 'misinformation', 'disinformation', 'fake', 'untrue', 
-        'deceptive', 'manipulative', 'harmful', 'dangerous',
-        'conspiracy', 'hoax', 'scam', 'fraud', 'deceit'
-    ]
-    
-    medium_risk_indicators = [
-        'questionable', 'suspicious', 'unreliable', 
-        'biased', 'exaggerated', 'incomplete', 'outdated'
-    ]
-    
-    # Check for high risk indicators
-    high_risk_count = sum(1 for indicator in high_risk_indicators if indicator in response_lower)
-    medium_risk_count = sum(1 for indicator in medium_risk_indicators if indicator in response_lower)
-    
-    # Calculate risk score based on AI assessment
-    if high_risk_count > 0:
-        return 75  # High risk for concerning factors
-    elif medium_risk_count > 0:
-        return 50  # Medium risk
-    else:
-        return 0  # No additional risk from AI analysis
+    report = ai_response if isinstance(ai_response, ForensicReport) else parse_forensic_response(ai_response)
+    # The explicit veracity verdict, else the risk wording the parser collected
+    return report_risk(report)
 
 def calculate_risk_score(text):
     """Enhanced risk score calculation"""
@@ -579,6 +693,11 @@ def display_forensic_results(results):
     # Executive summary
     st.subheader("📋 Analysis Results")
     
+    if results.get('near_duplicate'):
+        match = results['near_duplicate']
+        st.info(f"♻️ This closely matches content analyzed before ({match['similarity']:.0%} similar, "
+                f"analysis {match['analysis_id']}). Its AI verdict was reused alongside fresh checks of this text.")
+    
     col1, col2, col3 = st.columns(3)
     with col1:
         risk_score = results['risk_score']
@@ -627,7 +746,7 @@ def display_forensic_results(results):
             st.info(results['ai_analysis'])
             
             # Show risk assessment
-            ai_risk = analyze_ai_response_for_risk(results['ai_analysis'])
+            ai_risk = analyze_ai_response_for_risk(results.get('ai_report') or results['ai_analysis'])
             if ai_risk > 70:
                 st.error("🚨 AI identified this as HIGH RISK content")
             elif ai_risk > 40:
@@ -979,7 +1098,8 @@ def display_detailed_analysis(results):
     if results.get('fact_checks'):
         st.write("**📋 Fact Check Results:**")
         for check in results['fact_checks'][:3]:  # Show only first 3
-            st.info(f"• {check}")
+            st.info(f"• **{check['verdict']}** ({check['publisher']}): [{check['title']}]({check['url']})\n\n"
+                    f"Claim: _{check['claim']}_")
     
     # Safety analysis
     if results.get('safety_analysis'):
@@ -1067,6 +1187,10 @@ def news_center_interface():
         
         if st.button("🔍 Verify Article", type="primary"):
             if article_input:
+                is_valid, validation_msg = security_service.validate_input(article_input, max_length=Config.MAX_DOCUMENT_CHARS)
+                if not is_valid:
+                    st.error(f"❌ {validation_msg}")
+                    return
                 with st.spinner("🔍 Analyzing article with AI..."):
                     results = conduct_forensic_analysis(article_input, "en", "Standard Analysis", True, False, True)
                     display_forensic_results(results)
@@ -1076,14 +1200,25 @@ def news_center_interface():
     with tab2:
         st.subheader("📊 Breaking News Feed")
         if st.button("🔄 Refresh News", type="primary"):
-            with st.spinner("📰 Fetching latest news..."):
-                news_articles = news_aggregator.get_breaking_news()
-                for article in news_articles[:5]:
-                    with st.expander(f"📰 {article.get('title', 'No title')}"):
-                        st.write(f"**Source:** {article.get('source', {}).get('name', 'Unknown')}")
-                        st.write(f"**Description:** {article.get('description', 'No description')}")
-                        if article.get('url'):
-                            st.write(f"**Link:** [Read Full Article]({article['url']})")
+            if news_aggregator.refresh_breaking_news():
+                st.info("🔄 Fetching the latest headlines in the background...")
+        
+        # Shared snapshot, kept fresh by the background refresher for every session
+        with st.spinner("📰 Fetching latest news..."):
+            snapshot = news_aggregator.get_breaking_news_snapshot()
+        if snapshot['fetched_at']:
+            age = int(datetime.now().timestamp() - snapshot['fetched_at'])
+            st.caption(f"Updated {age}s ago" + (" · last refresh failed" if snapshot['error'] else ""))
+        if snapshot['error'] and not snapshot['articles']:
+            st.warning(f"News API failed: {snapshot['error']}")
+        for article in snapshot['articles'][:5]:
+            with st.expander(f"📰 {article.get('title', 'No title')}"):
+                st.write(f"**Source:** {article.get('source', {}).get('name', 'Unknown')}")
+                if article.get('also_reported_by'):
+                    st.caption(f"Also reported by: {', '.join(article['also_reported_by'])}")
+                st.write(f"**Description:** {article.get('description', 'No description')}")
+                if article.get('url'):
+                    st.write(f"**Link:** [Read Full Article]({article['url']})")
 
 def url_investigation_interface():
     """URL investigation interface"""
@@ -1094,10 +1229,35 @@ def url_investigation_interface():
     
     if st.button("🔍 Investigate URL", type="primary"):
         if url_input:
-            with st.spinner("🔍 Investigating URL..."):
-                st.success(f"🔍 Investigating: {url_input}")
-                # Add URL analysis logic here
-                st.info("URL investigation feature ready for implementation!")
+            with st.spinner("🌐 Fetching article..."):
+                article = news_aggregator.verify_article(url_input)
+            if not article['verified']:
+                st.error(f"❌ Could not read an article at this URL: {article['error']}")
+                return
+
+            st.success(f"📰 {article['title'] or article['domain']}")
+            fetch_notes = {'fetched': "downloaded", 'not_modified': "unchanged since last fetch (304)",
+                           'cached': "from cache", 'stale': "cached copy"}
+            st.caption(" · ".join(filter(None, [
+                article['site_name'] or article['domain'],
+                article['published_at'] and f"published {article['published_at']}",
+                f"{article['word_count']} words",
+                fetch_notes[article['fetch']]
+            ])))
+            for flag in article['warning_flags']:
+                st.warning(f"⚠️ {flag}")
+            with st.expander("📄 Extracted article text"):
+                st.write(article['text'])
+
+            is_valid, validation_msg = security_service.validate_input(article['text'], max_length=Config.MAX_DOCUMENT_CHARS)
+            if not is_valid:
+                st.error(f"❌ {validation_msg}")
+                return
+            with st.spinner("🔍 Analyzing article with AI..."):
+                results = conduct_forensic_analysis(
+                    security_service.sanitize_input(article['text']), "en", "Standard Analysis", True, False, True
+                )
+                display_forensic_results(results)
         else:
             st.warning("Please enter a URL to investigate")
 
@@ -1135,7 +1295,22 @@ def analytics_interface():
     with tabs[0]:
         st.subheader("📈 Trend Analysis")
         st.info("📊 Analyze misinformation trends and patterns over time")
-        # Add trend analysis charts here
+        
+        st.write("**📰 Trending in the News**")
+        rank_by = st.radio("Rank by", ["count", "growth"], horizontal=True,
+                           format_func=lambda by: "📊 Mentions" if by == "count" else "🚀 Growth")
+        topics = news_aggregator.get_trending_topics(limit=10, by=rank_by)
+        if topics:
+            st.dataframe([{
+                "Topic": topic['topic'],
+                f"Mentions ({Config.TRENDING_BUCKETS * Config.TRENDING_BUCKET_SECONDS // 3600}h)": topic['count'],
+                f"Recent ({Config.TRENDING_RECENT_BUCKETS * Config.TRENDING_BUCKET_SECONDS // 3600}h)": topic['recent'],
+                "Growth": "n/a" if topic['growth'] is None else f"{topic['growth']:+.0%}"
+            } for topic in topics], use_container_width=True)
+            if all(topic['growth'] is None for topic in topics):
+                st.caption("Growth is shown once the window holds older headlines to compare against")
+        else:
+            st.caption("No trending topics yet, headlines are still being collected")
     
     with tabs[1]:
         st.subheader("🎯 Content Analytics")
@@ -6,6 +6,9 @@ from utils.ai_services import GeminiService
 from utils.database import FirebaseService
 from utils.news_services import NewsAggregator
 from utils.security import SecurityService
+from utils.http_client import get_http_client
+from utils.health import get_health_monitor
+from config import Config
 
 # Configure Streamlit page
 st.set_page_config(
@@ -42,6 +45,7 @@ st.markdown(hide_streamlit_style, unsafe_allow_html=True)
 @st.cache_resource
 def initialize_services():
     """Initialize all backend services"""
+    get_http_client().warm_up(Config.HTTP_WARMUP_URLS)
     return {
         'ai': GeminiService(),
         'database': FirebaseService(),
@@ -52,12 +56,19 @@ def initialize_services():
 # Get services
 services = initialize_services()
 
-# Check services status for React frontend
+# Services status for React frontend, from the background health probes
+health_monitor = get_health_monitor()
+health_monitor.register("gemini", services['ai'].health_check)
+health_monitor.register("database", services['database'].test_connection)
+health_monitor.register("news", services['news'].test_connection)
+health_monitor.register("security", services['security'].test_connection)
+
+# A probe that has not reported yet counts as connected
 services_status = {
-    'ai': True,  # You can add actual health checks here
-    'database': True,
-    'news': True,
-    'security': True
+    'ai': health_monitor.status("gemini")['ok'] is not False,
+    'database': health_monitor.status("database")['ok'] is not False,
+    'news': health_monitor.status("news")['ok'] is not False,
+    'security': health_monitor.status("security")['ok'] is not False
 }
 
 # Render your complete React frontend directly (no loading text)
@@ -0,0 +1,72 @@
+"""
+Benchmark near-duplicate lookups in the MinHash/LSH index as it grows.
+
+Usage:
+    python benchmarks/bench_near_duplicate.py [--entries 1000000] [--lookups 2000]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from utils.near_duplicate import NearDuplicateIndex  # noqa: E402
+
+VOCABULARY = (
+    "vaccine covid government secret doctors confirm share microchip track election fraud ballots "
+    "climate hoax scientists study cure cancer banned media hiding truth breaking urgent millions "
+    "water poison towers signal children school tax bank collapse warning official leaked report"
+).split()
+
+
+def make_text(rng, words=30):
+    return " ".join(rng.choice(VOCABULARY) for _ in range(words))
+
+
+def mutate(rng, text):
+    """Same claim, different casing, emoji and one changed word"""
+    words = text.split()
+    words[rng.randrange(len(words))] = rng.choice(VOCABULARY)
+    return "🚨 " + " ".join(words).upper() + "!! 💉"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    index = NearDuplicateIndex()
+    originals = []
+
+    started = time.perf_counter()
+    for i in range(args.entries):
+        text = make_text(rng)
+        index.add(text, i)
+        if len(originals) < args.lookups:
+            originals.append((i, text))
+    print(f"indexed {len(index):,} texts in {time.perf_counter() - started:.1f}s")
+
+    queries = [(i, mutate(rng, text)) for i, text in originals]
+    found = 0
+    started = time.perf_counter()
+    for expected, query in queries:
+        match = index.lookup(query)
+        found += bool(match and match['payload'] == expected)
+    per_lookup = (time.perf_counter() - started) / len(queries) * 1e6
+
+    misses = [make_text(rng) for _ in range(len(queries))]
+    started = time.perf_counter()
+    false_hits = sum(index.lookup(query) is not None for query in misses)
+    per_miss = (time.perf_counter() - started) / len(misses) * 1e6
+
+    print(f"mutated variants: {per_lookup:8.1f} us/lookup   {found}/{len(queries)} matched their original")
+    print(f"unrelated texts:  {per_miss:8.1f} us/lookup   {false_hits}/{len(misses)} false matches")
+
+
+if __name__ == "__main__":
+    main()
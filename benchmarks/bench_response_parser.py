@@ -0,0 +1,133 @@
+"""
+Benchmark the single-pass forensic response parser against the legacy
+line-scanning extraction over a corpus of Gemini-style responses.
+
+The bundled corpus is synthetic: hand-written in the FORENSIC_PROMPT format
+(with padding sentences to reach realistic lengths), not captured from the
+API. Records carry "source": "synthetic" or "recorded"; pass --corpus to
+measure against real captures.
+
+Usage:
+    python benchmarks/bench_response_parser.py [--repeat 2000] [--corpus path.jsonl]
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from utils.response_parser import parse_forensic_response  # noqa: E402
+
+CORPUS = Path(__file__).parent / "corpus" / "forensic_responses.jsonl"
+
+
+# --- Legacy implementation (GeminiService + app.py before the parser) ---
+
+def legacy_extract_section(text, section_header):
+    lines = text.split('\n')
+    in_section = False
+    section_content = []
+
+    for line in lines:
+        if section_header in line:
+            in_section = True
+            continue
+        elif in_section and line.startswith('🔍') or line.startswith('🧬') or line.startswith('📊') or line.startswith('🎯') or line.startswith('⚠️') or line.startswith('🛡️') or line.startswith('📋'):
+            break
+        elif in_section:
+            section_content.append(line)
+
+    return '\n'.join(section_content).strip()
+
+
+def legacy_extract(ai_response):
+    sources, reporting_emails = [], []
+    source_section = legacy_extract_section(ai_response, "🔗 SOURCE LINKS & ARTICLES:")
+    for line in source_section.split('\n'):
+        line = line.strip()
+        if line.startswith('-') and ':' in line:
+            parts = line[1:].split(':', 1)
+            if ' - ' in parts[1]:
+                desc, url = parts[1].strip().rsplit(' - ', 1)
+                sources.append({'name': parts[0].strip(), 'description': desc.strip(), 'url': url.strip()})
+            else:
+                sources.append({'name': parts[0].strip(), 'description': parts[1].strip(), 'url': None})
+    reporting_section = legacy_extract_section(ai_response, "📧 REPORTING INFORMATION:")
+    for line in reporting_section.split('\n'):
+        line = line.strip()
+        if line.startswith('-') and '@' in line and ':' in line:
+            desc, email = line[1:].split(':', 1)
+            reporting_emails.append({'description': desc.strip(), 'email': email.strip()})
+    return sources, reporting_emails
+
+
+def legacy_verdict(ai_response):
+    response_lower = ai_response.lower()
+    if 'false information' in response_lower:
+        return "FALSE INFORMATION"
+    elif 'misleading' in response_lower:
+        return "MISLEADING"
+    elif 'unverified' in response_lower:
+        return "UNVERIFIED"
+    elif 'true' in response_lower and 'veracity assessment' in response_lower:
+        return "TRUE"
+    return "UNKNOWN"
+
+
+def legacy_parse(ai_response):
+    # The app scored the text twice (pipeline + results view) and extracted once
+    legacy_verdict(ai_response)
+    sources, contacts = legacy_extract(ai_response)
+    return legacy_verdict(ai_response), len(sources), len(contacts)
+
+
+def new_parse(ai_response):
+    report = parse_forensic_response(ai_response)
+    return report.verdict.value, len(report.sources), len(report.reporting_contacts)
+
+
+# --- Harness ---
+
+def load_corpus(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def run(name, parse, corpus, repeat):
+    correct = 0
+    for record in corpus:
+        got = parse(record['response'])
+        expected = (record['expected_verdict'], record['expected_sources'], record['expected_contacts'])
+        correct += got == expected
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for record in corpus:
+            parse(record['response'])
+    elapsed = time.perf_counter() - started
+
+    per_response = elapsed / (repeat * len(corpus)) * 1e6
+    print(f"{name:<8} {per_response:10.1f} us/response   {correct}/{len(corpus)} fully correct")
+    return per_response
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=2000)
+    parser.add_argument("--corpus", default=str(CORPUS))
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    total_chars = sum(len(r['response']) for r in corpus)
+    synthetic = sum(r.get('source') != 'recorded' for r in corpus)
+    print(f"{len(corpus)} responses ({synthetic} synthetic), {total_chars / len(corpus):.0f} chars on average\n")
+
+    legacy = run("legacy", legacy_parse, corpus, args.repeat)
+    new = run("parser", new_parse, corpus, args.repeat)
+    print(f"\nspeedup: {legacy / new:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
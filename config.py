@@ -29,6 +29,144 @@ class Config:
     # Google Cloud
     GOOGLE_CLOUD_PROJECT = os.getenv("GOOGLE_CLOUD_PROJECT", "misinformation-detector-2025")
     
+    # API Endpoints (override to point at tools/mock_api_server.py)
+    GEMINI_API_BASE = os.getenv("GEMINI_API_BASE", "https://generativelanguage.googleapis.com/v1beta")
+    FACTCHECK_API_BASE = os.getenv("FACTCHECK_API_BASE", "https://factchecktools.googleapis.com/v1alpha1")
+    NEWSAPI_BASE = os.getenv("NEWSAPI_BASE", "https://newsapi.org/v2")
+    NEWSDATA_BASE = os.getenv("NEWSDATA_BASE", "https://newsdata.io/api/1")
+    VISION_API_BASE = os.getenv("VISION_API_BASE", "https://vision.googleapis.com/v1")
+    
+    # HTTP Transport
+    HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))  # host pools kept alive
+    HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "20"))  # connections per host
+    HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+    HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "30"))
+    HTTP_ASYNC_MAX_CONNECTIONS = int(os.getenv("HTTP_ASYNC_MAX_CONNECTIONS", "200"))  # asyncio clients
+    HTTP_DNS_TTL = int(os.getenv("HTTP_DNS_TTL", "300"))  # seconds, 0 disables DNS caching
+    HTTP_DNS_CACHE_SIZE = int(os.getenv("HTTP_DNS_CACHE_SIZE", "256"))  # host:port answers kept by the pooled clients
+    HTTP_WARMUP_URLS = [GEMINI_API_BASE, FACTCHECK_API_BASE, NEWSAPI_BASE, NEWSDATA_BASE]
+
+    # Response Cache
+    CACHE_DIR = os.getenv("CACHE_DIR", ".cache/truthlens")
+    CACHE_TTL = int(os.getenv("CACHE_TTL", "86400"))  # seconds
+    CACHE_MEMORY_ENTRIES = int(os.getenv("CACHE_MEMORY_ENTRIES", "512"))
+    CACHE_MEMORY_BYTES = int(os.getenv("CACHE_MEMORY_BYTES", "67108864"))  # 64 MB of serialized values in memory
+    CACHE_DISK_ENTRIES = int(os.getenv("CACHE_DISK_ENTRIES", "20000"))
+    
+    # Fact Check Claims (one search per check-worthy claim of the input)
+    FACTCHECK_MAX_CLAIMS = int(os.getenv("FACTCHECK_MAX_CLAIMS", "8"))  # claims searched per input
+    FACTCHECK_PARALLELISM = int(os.getenv("FACTCHECK_PARALLELISM", "4"))  # concurrent searches per input
+    FACTCHECK_RESULTS_PER_CLAIM = int(os.getenv("FACTCHECK_RESULTS_PER_CLAIM", "5"))
+    FACTCHECK_MAX_RESULTS = int(os.getenv("FACTCHECK_MAX_RESULTS", "20"))  # merged reviews kept
+    
+    # Fact Check Mirror (local full-text index of harvested ClaimReview data)
+    FACTCHECK_MIRROR = os.getenv("FACTCHECK_MIRROR", "True").lower() == "true"
+    FACTCHECK_MIRROR_PATH = os.getenv("FACTCHECK_MIRROR_PATH", os.path.join(CACHE_DIR, "factcheck_mirror.sqlite3"))
+    FACTCHECK_MIRROR_MIN_MATCH = float(os.getenv("FACTCHECK_MIRROR_MIN_MATCH", "0.6"))  # query terms a claim must cover
+    FACTCHECK_MIRROR_PAGE_SIZE = int(os.getenv("FACTCHECK_MIRROR_PAGE_SIZE", "50"))
+    FACTCHECK_MIRROR_SYNC_PAGES = int(os.getenv("FACTCHECK_MIRROR_SYNC_PAGES", "10"))  # per query and sync
+    FACTCHECK_MIRROR_SEED_QUERIES = [q.strip() for q in os.getenv(
+        "FACTCHECK_MIRROR_SEED_QUERIES", "covid,vaccine,election,climate change,5g,cancer cure,immigration"
+    ).split(",") if q.strip()]
+    
+    # Fact Check Cache (entries live in the response cache)
+    FACTCHECK_CACHE_TTL = int(os.getenv("FACTCHECK_CACHE_TTL", "21600"))  # seconds a search result is fresh
+    FACTCHECK_NEGATIVE_TTL = int(os.getenv("FACTCHECK_NEGATIVE_TTL", "1800"))  # seconds an empty result is fresh
+    FACTCHECK_STALE_TTL = int(os.getenv("FACTCHECK_STALE_TTL", "86400"))  # served stale while refreshing
+    
+    # Retries & Circuit Breakers
+    RETRY_MAX_ATTEMPTS = int(os.getenv("RETRY_MAX_ATTEMPTS", "3"))
+    RETRY_BASE_DELAY = float(os.getenv("RETRY_BASE_DELAY", "0.5"))  # seconds, doubled per attempt
+    RETRY_MAX_DELAY = float(os.getenv("RETRY_MAX_DELAY", "8"))
+    RETRY_MAX_RETRY_AFTER = float(os.getenv("RETRY_MAX_RETRY_AFTER", "10"))  # longer waits open the breaker
+    BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5"))
+    BREAKER_RECOVERY_TIMEOUT = float(os.getenv("BREAKER_RECOVERY_TIMEOUT", "30"))
+    
+    # Gemini Quota (client-side token buckets, per model: requests/min, tokens/min)
+    GEMINI_RATE_LIMITS = {
+        'gemini-1.5-pro': (int(os.getenv("GEMINI_PRO_RPM", "360")), int(os.getenv("GEMINI_PRO_TPM", "4000000"))),
+        'gemini-1.5-flash': (int(os.getenv("GEMINI_FLASH_RPM", "1000")), int(os.getenv("GEMINI_FLASH_TPM", "4000000")))
+    }
+    RATE_LIMIT_OUTPUT_TOKENS = int(os.getenv("RATE_LIMIT_OUTPUT_TOKENS", "1000"))  # expected response size
+    RATE_LIMIT_MAX_WAIT = float(os.getenv("RATE_LIMIT_MAX_WAIT", "20"))  # seconds queued before giving up
+    RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")  # "file" shares budgets across processes
+    RATE_LIMIT_DIR = os.getenv("RATE_LIMIT_DIR", ".cache/truthlens/ratelimit")
+    
+    # Health Checks (background probes; the UI only reads their cached status)
+    HEALTH_CHECK_DEFAULT_INTERVAL = int(os.getenv("HEALTH_CHECK_DEFAULT_INTERVAL", "60"))  # seconds
+    HEALTH_CHECK_INTERVALS = {
+        'gemini': int(os.getenv("HEALTH_CHECK_GEMINI_INTERVAL", "60")),
+        'factcheck': int(os.getenv("HEALTH_CHECK_FACTCHECK_INTERVAL", "300")),
+        'news': int(os.getenv("HEALTH_CHECK_NEWS_INTERVAL", "900")),  # NewsAPI has a daily request quota
+    }
+    HEALTH_CHECK_TIMEOUT = float(os.getenv("HEALTH_CHECK_TIMEOUT", "5"))
+    
+    # News Feeds (shared snapshots refreshed in the background)
+    NEWS_REFRESH_INTERVAL = int(os.getenv("NEWS_REFRESH_INTERVAL", "300"))  # seconds between upstream fetches
+    NEWS_MIN_REFRESH_AGE = int(os.getenv("NEWS_MIN_REFRESH_AGE", "60"))  # manual refreshes of younger snapshots are ignored
+    NEWS_PROVIDER_TIMEOUTS = {  # seconds; a slow provider is dropped from the merged feed
+        'newsapi': float(os.getenv("NEWSAPI_TIMEOUT", "8")),
+        'newsdata': float(os.getenv("NEWSDATA_TIMEOUT", "8")),
+    }
+    NEWS_MAX_ARTICLES = int(os.getenv("NEWS_MAX_ARTICLES", "30"))  # merged articles per feed
+    NEWS_INCREMENTAL = os.getenv("NEWS_INCREMENTAL", "True").lower() == "true"  # poll past cursors into the store
+    NEWS_POLL_MAX_PAGES = int(os.getenv("NEWS_POLL_MAX_PAGES", "5"))  # per provider and poll
+    NEWS_STORE_PATH = os.getenv("NEWS_STORE_PATH", os.path.join(CACHE_DIR, "articles.sqlite3"))
+    NEWS_STORE_RETENTION_DAYS = int(os.getenv("NEWS_STORE_RETENTION_DAYS", "30"))
+    TRENDING_BUCKET_SECONDS = int(os.getenv("TRENDING_BUCKET_SECONDS", "3600"))  # sliding window granularity
+    TRENDING_BUCKETS = int(os.getenv("TRENDING_BUCKETS", "24"))  # window = buckets x bucket seconds
+    TRENDING_RECENT_BUCKETS = int(os.getenv("TRENDING_RECENT_BUCKETS", "3"))  # compared against the rest for growth
+    TRENDING_CAPACITY = int(os.getenv("TRENDING_CAPACITY", "200"))  # heavy-hitter topics tracked per bucket
+    TRENDING_MIN_COUNT = int(os.getenv("TRENDING_MIN_COUNT", "2"))  # mentions before a topic can trend
+    NEWS_FEED_IDLE_TTL = int(os.getenv("NEWS_FEED_IDLE_TTL", "3600"))  # stop refreshing feeds nobody reads
+    
+    # Article Verification (extracted article text, cached by URL in the response cache)
+    ARTICLE_MAX_BYTES = int(os.getenv("ARTICLE_MAX_BYTES", "3000000"))  # pages are cut off past this size
+    ARTICLE_FETCH_TIMEOUT = float(os.getenv("ARTICLE_FETCH_TIMEOUT", "15"))
+    ARTICLE_FRESH_TTL = int(os.getenv("ARTICLE_FRESH_TTL", "900"))  # seconds an extraction is used without revalidating
+    ARTICLE_CACHE_TTL = int(os.getenv("ARTICLE_CACHE_TTL", "604800"))  # seconds it is kept for conditional re-fetches
+    ARTICLE_USER_AGENT = os.getenv("ARTICLE_USER_AGENT", "TruthLens/1.0 (+article verification)")
+    ARTICLE_MAX_REDIRECTS = int(os.getenv("ARTICLE_MAX_REDIRECTS", "5"))  # each hop is re-checked
+    # Lets verification fetch loopback/private hosts; only for tools/mock_api_server.py
+    ARTICLE_ALLOW_PRIVATE_HOSTS = os.getenv("ARTICLE_ALLOW_PRIVATE_HOSTS", "False").lower() == "true"
+    
+    # Metrics
+    METRICS_MAX_CALLS = int(os.getenv("METRICS_MAX_CALLS", "10000"))  # most recent API calls kept
+    
+    # Analysis Pipeline
+    GEMINI_STREAMING = os.getenv("GEMINI_STREAMING", "True").lower() == "true"  # progressive verdicts
+    GEMINI_CASCADE = os.getenv("GEMINI_CASCADE", "True").lower() == "true"  # flash first, pro when unsure
+    CASCADE_HIGH_RISK = int(os.getenv("CASCADE_HIGH_RISK", "70"))  # heuristic risk that contradicts TRUE
+    CASCADE_LOW_RISK = int(os.getenv("CASCADE_LOW_RISK", "10"))  # heuristic risk that contradicts FALSE
+    GEMINI_COMBINED_MODE = os.getenv("GEMINI_COMBINED_MODE", "True").lower() == "true"  # one call per Deep Analysis
+    PIPELINE_MAX_WORKERS = int(os.getenv("PIPELINE_MAX_WORKERS", "16"))
+    PIPELINE_STAGE_DEADLINES = {  # seconds per stage of conduct_forensic_analysis
+        'fact_checks': float(os.getenv("DEADLINE_FACT_CHECKS", "20")),
+        'ai_analysis': float(os.getenv("DEADLINE_AI_ANALYSIS", "60")),
+        'origin_analysis': float(os.getenv("DEADLINE_ORIGIN_ANALYSIS", "60")),
+        'context_analysis': float(os.getenv("DEADLINE_CONTEXT_ANALYSIS", "45")),
+        'combined': float(os.getenv("DEADLINE_COMBINED", "75")),
+        'long_document': float(os.getenv("DEADLINE_LONG_DOCUMENT", "180"))
+    }
+    
+    # Batch Prediction (offline re-scoring)
+    GEMINI_BATCH_MAX_REQUESTS = int(os.getenv("GEMINI_BATCH_MAX_REQUESTS", "1000"))  # prompts per job
+    GEMINI_BATCH_MAX_BYTES = int(os.getenv("GEMINI_BATCH_MAX_BYTES", str(18 * 1024 * 1024)))  # inline limit is 20MB
+    GEMINI_BATCH_POLL_INTERVAL = float(os.getenv("GEMINI_BATCH_POLL_INTERVAL", "30"))  # seconds
+    GEMINI_BATCH_TIMEOUT = float(os.getenv("GEMINI_BATCH_TIMEOUT", str(24 * 3600)))  # jobs expire after 24h
+    
+    # Near-Duplicate Reuse (MinHash/LSH over analyzed texts)
+    NEAR_DUPLICATE_REUSE = os.getenv("NEAR_DUPLICATE_REUSE", "True").lower() == "true"
+    NEAR_DUPLICATE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.8"))  # estimated Jaccard
+    NEAR_DUPLICATE_PERMUTATIONS = int(os.getenv("NEAR_DUPLICATE_PERMUTATIONS", "64"))
+    NEAR_DUPLICATE_BANDS = int(os.getenv("NEAR_DUPLICATE_BANDS", "16"))  # more bands, higher recall
+    
+    # Long Documents (map-reduce over flash)
+    MAX_DOCUMENT_CHARS = int(os.getenv("MAX_DOCUMENT_CHARS", "1000000"))  # book-length input limit
+    LONG_DOCUMENT_CHARS = int(os.getenv("LONG_DOCUMENT_CHARS", "12000"))  # longer inputs are chunked
+    LONG_DOCUMENT_CHUNK_TOKENS = int(os.getenv("LONG_DOCUMENT_CHUNK_TOKENS", "1500"))
+    LONG_DOCUMENT_PARALLELISM = int(os.getenv("LONG_DOCUMENT_PARALLELISM", "8"))
+    
     # App Settings
     APP_NAME = "TruthLens"
     VERSION = "2.0.0"
@@ -9,6 +9,9 @@ import os
 from utils.database import FirebaseService
 from utils.security import SecurityService
 from utils.email_service import EmailService
+from utils.ai_services import FactCheckService, GeminiBatchService, cascade_stats
+from utils.metrics import get_metrics_store
+from utils.rate_limiter import get_rate_limiter
 
 # Admin credentials (you can change these)
 ADMIN_USERNAME = "admin"
@@ -280,15 +283,97 @@ def ai_responses_monitoring():
     """Monitor AI responses and performance"""
     st.markdown("### 🤖 AI Responses Monitoring")
     
-    # AI performance metrics
+    # Per-call Gemini latency and token metrics, recorded in-process
+    metrics = get_metrics_store()
+    window = st.selectbox(
+        "Window", [300, 3600, 86400, None],
+        format_func=lambda w: "All recorded calls" if w is None else f"Last {timedelta(seconds=w)}",
+        index=1
+    )
+    summary = metrics.summary(window=window)
+    
+    def seconds(value):
+        return f"{value:.2f}s" if value is not None else "n/a"
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.metric("⚡ p50 Latency", seconds(summary['p50']))
+    with col2:
+        st.metric("🐢 p95 Latency", seconds(summary['p95']))
+    with col3:
+        st.metric("🧊 p99 Latency", seconds(summary['p99']))
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.metric("🔄 API Calls", f"{summary['calls']:,}")
+    with col2:
+        st.metric("❌ Error Rate", f"{summary['error_rate']:.1%}")
+    with col3:
+        st.metric("🔤 Tokens / min", f"{summary['tokens_per_minute']:,.0f}")
+    
+    per_model = []
+    for model in metrics.models():
+        model_summary = metrics.summary(model=model, window=window)
+        if not model_summary['calls']:
+            continue
+        per_model.append({
+            "Model": model,
+            "Calls": model_summary['calls'],
+            "Errors": model_summary['errors'],
+            "p50 (s)": model_summary['p50'],
+            "p95 (s)": model_summary['p95'],
+            "p99 (s)": model_summary['p99'],
+            "TTFB p50 (s)": model_summary['ttfb_p50'],
+            "Avg retries": round(model_summary['avg_retries'], 2),
+            "Prompt tokens": model_summary['prompt_tokens'],
+            "Output tokens": model_summary['output_tokens'],
+            "Tokens / min": round(model_summary['tokens_per_minute'])
+        })
+    
+    if per_model:
+        st.dataframe(pd.DataFrame(per_model), use_container_width=True)
+    else:
+        st.info("No Gemini calls recorded in this window yet")
+    
+    # Model cascade (flash first, pro on escalation)
+    st.markdown("### 🪜 Model Cascade")
+    cascade = cascade_stats.report()
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.metric("🎯 Accuracy Rate", "94.2%", "+1.2%")
+        st.metric("🔁 Cascade Calls", cascade['calls'])
     with col2:
-        st.metric("⚡ Avg Response Time", "2.3s", "-0.5s")
+        st.metric("⬆️ Escalation Rate", f"{cascade['escalation_rate']:.0%}")
     with col3:
-        st.metric("🔄 Total Analyses", "2,156", "+45")
+        saved = cascade['estimated_seconds_saved']
+        st.metric("⏱️ Est. Time Saved", f"{saved:.1f}s" if saved is not None else "n/a")
+    
+    if cascade['reasons']:
+        st.dataframe(
+            pd.DataFrame(list(cascade['reasons'].items()), columns=["Escalation reason", "Count"]),
+            use_container_width=True
+        )
+    
+    # Client-side Gemini quota
+    st.markdown("### 🚦 Gemini Quota")
+    limiter = get_rate_limiter()
+    queue_depth = limiter.queue_depth()
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.metric("⏳ Queued Calls", sum(queue_depth.values()))
+    with col2:
+        st.metric("✅ Granted", limiter.stats['granted'])
+    with col3:
+        st.metric("🚫 Rejected (waited too long)", limiter.stats['rejected'])
+    
+    if queue_depth:
+        st.dataframe(
+            pd.DataFrame(list(queue_depth.items()), columns=["Model", "Queue depth"]),
+            use_container_width=True
+        )
     
     # Recent AI responses
     st.markdown("### 📊 Recent AI Responses")
@@ -413,6 +498,63 @@ def system_settings():
         
         if st.button("💾 Save Configuration"):
             st.success("✅ Configuration saved!")
+    
+    # Offline re-scoring of stored analyses
+    st.markdown("**🌙 Batch Re-scoring**")
+    st.caption("Re-run forensic analysis over every stored text analysis as Gemini batch jobs (cheaper, but may take hours)")
+    
+    if 'rescore_jobs' not in st.session_state and st.button("🌙 Re-score Archive"):
+        records = [r for r in FirebaseService().get_recent_analyses(limit=None) if r.get('full_content')]
+        if not records:
+            st.info("No stored text analyses to re-score")
+        else:
+            jobs = {}
+            try:
+                GeminiBatchService().submit_records(records, jobs=jobs)
+            except Exception as e:
+                kept = f"; tracking the {len(jobs)} jobs already submitted" if jobs else ""
+                st.error(f"❌ Batch re-scoring failed: {str(e)}{kept}")
+            if jobs:
+                # Only the records that made it into a job are counted towards progress
+                total = sum(len(keys) for keys in jobs.values())
+                st.session_state.rescore_jobs = {'jobs': jobs, 'total': total, 'rescored': 0, 'failed': 0}
+    
+    rescore = st.session_state.get('rescore_jobs')
+    if rescore:
+        # Jobs are checked once per rerun rather than polled until they finish, so the page stays usable
+        try:
+            for record in GeminiBatchService().poll_records(rescore['jobs'], FirebaseService().get_recent_analyses(limit=None)):
+                rescore['failed' if 'rescore_error' in record else 'rescored'] += 1
+        except Exception as e:
+            st.error(f"❌ Checking batch jobs failed: {str(e)}")
+        
+        done = rescore['rescored'] + rescore['failed']
+        if rescore['jobs']:
+            st.progress(min(done / rescore['total'], 1.0))
+            st.caption(f"⏳ {len(rescore['jobs'])} batch jobs running · {done}/{rescore['total']} analyses re-scored")
+            st.button("🔄 Check Batch Status")  # clicking reruns the page, which checks the jobs again
+        else:
+            st.success(f"✅ Re-scored {rescore['rescored']} analyses ({rescore['failed']} failed)")
+            del st.session_state.rescore_jobs
+    
+    st.markdown("---")
+    st.markdown("**🗂️ Fact-Check Mirror**")
+    fact_check_service = FactCheckService()
+    if fact_check_service.mirror is None:
+        st.caption("The local fact-check mirror is disabled (FACTCHECK_MIRROR)")
+        return
+    
+    mirror = fact_check_service.mirror
+    st.caption(f"{len(mirror):,} reviews stored locally · {mirror.stats['hits']} local hits, "
+               f"{mirror.stats['misses']} misses this session")
+    
+    if st.button("🔄 Sync Fact-Check Mirror"):
+        with st.spinner("Harvesting ClaimReview data..."):
+            try:
+                written = fact_check_service.sync_mirror()
+                st.success(f"✅ Stored {written} reviews")
+            except Exception as e:
+                st.error(f"❌ Mirror sync failed: {str(e)}")
 
 def send_report_email(report):
     """Send report details to admin email"""
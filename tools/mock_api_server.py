@@ -0,0 +1,568 @@
+"""
+Local stand-in for the Gemini, Fact Check, NewsAPI, NewsData and Vision APIs, for
+exercising TruthLens without live keys. It also serves HTML news articles under
+/articles/<slug> (with ETag and Last-Modified) for URL verification.
+
+Usage:
+    python tools/mock_api_server.py [--port 8765] [--seed 1]
+        [--latency gemini=lognormal:0.8,0.5] [--error-rate gemini=0.05]
+        [--rate-limit gemini=60] [--batch-delay 5]
+        [--record cassettes/run.jsonl | --replay cassettes/run.jsonl]
+
+Point the app at it with:
+    GEMINI_API_BASE=http://127.0.0.1:8765/v1beta
+    FACTCHECK_API_BASE=http://127.0.0.1:8765/v1alpha1
+    NEWSAPI_BASE=http://127.0.0.1:8765/v2
+    NEWSDATA_BASE=http://127.0.0.1:8765/api/1
+    VISION_API_BASE=http://127.0.0.1:8765/v1
+    ARTICLE_ALLOW_PRIVATE_HOSTS=True  (article verification refuses local hosts otherwise)
+
+Endpoint names for --latency/--error-rate/--rate-limit: gemini, gemini_stream,
+batch, factcheck, news, newsdata, vision, articles, or * for all of them. Latency distributions:
+fixed:S, uniform:LOW,HIGH, normal:MEAN,STDDEV, lognormal:MEDIAN,SIGMA (seconds).
+
+--record proxies every request to the real API and appends the responses to a
+cassette; --replay serves them back in recorded order, without the network.
+"""
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode
+
+ENDPOINTS = ["gemini", "gemini_stream", "batch", "factcheck", "news", "newsdata", "vision", "articles"]
+
+# Path prefix served by the mock -> real origin, for record mode
+UPSTREAMS = {
+    "/v1beta/": "https://generativelanguage.googleapis.com",
+    "/v1alpha1/": "https://factchecktools.googleapis.com",
+    "/v2/": "https://newsapi.org",
+    "/api/1/": "https://newsdata.io",
+    "/v1/": "https://vision.googleapis.com"
+}
+
+# Credentials never end up in a cassette
+SECRET_PARAMS = {"key", "apiKey", "apikey"}
+
+CANNED_FORENSIC_RESPONSE = """🔍 VERACITY ASSESSMENT:
+UNVERIFIED - This is a canned response from the local mock server.
+
+🧬 MANIPULATION TACTICS:
+None detected by the mock server.
+
+🔗 SOURCE LINKS & ARTICLES:
+- Mock Fact Check: Canned source - https://example.org/fact-check
+
+📧 REPORTING INFORMATION:
+- Mock Reporting: report@example.org
+"""
+
+
+def parse_latency(spec):
+    """Parse a latency distribution spec into a sampler(rng) -> seconds"""
+    kind, _, args = spec.partition(":")
+    values = [float(v) for v in args.split(",") if v]
+    if kind == "fixed":
+        return lambda rng: values[0]
+    if kind == "uniform":
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "normal":
+        return lambda rng: max(0.0, rng.gauss(values[0], values[1]))
+    if kind == "lognormal":
+        return lambda rng: rng.lognormvariate(math.log(values[0]), values[1])
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+def parse_per_endpoint(items, convert):
+    """Parse repeated ENDPOINT=VALUE options into a dict ('*' applies to all)"""
+    settings = {}
+    for item in items or []:
+        name, _, value = item.partition("=")
+        if name != "*" and name not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint {name!r}, expected one of {', '.join(ENDPOINTS)} or *")
+        for endpoint in (ENDPOINTS if name == "*" else [name]):
+            settings[endpoint] = convert(value)
+    return settings
+
+
+def sample_from_schema(schema, name="value"):
+    """A canned value matching a Gemini responseSchema (OpenAPI subset)"""
+    kind = (schema.get('type') or "STRING").upper()
+    if kind == "OBJECT":
+        return {key: sample_from_schema(sub, key) for key, sub in (schema.get('properties') or {}).items()}
+    if kind == "ARRAY":
+        return [sample_from_schema(schema.get('items') or {}, name)]
+    if kind in ("INTEGER", "NUMBER"):
+        return 0
+    if kind == "BOOLEAN":
+        return False
+    if schema.get('enum'):
+        return "UNVERIFIED" if "UNVERIFIED" in schema['enum'] else schema['enum'][0]
+    if name == "url":
+        return "https://example.org/fact-check"
+    if name == "email":
+        return "report@example.org"
+    return f"Canned mock {name.replace('_', ' ')}"
+
+
+def generate_content_response(request):
+    """A GenerateContentResponse for any GenerateContentRequest (JSON shaped by its responseSchema)"""
+    config = request.get('generationConfig') or {}
+    if config.get('responseMimeType') == "application/json":
+        schema = config.get('responseSchema') or {
+            "type": "OBJECT", "properties": {"verdict": {"type": "STRING"}, "summary": {"type": "STRING"}}
+        }
+        text = json.dumps(sample_from_schema(schema))
+    else:
+        text = CANNED_FORENSIC_RESPONSE
+    return {
+        "candidates": [{"content": {"parts": [{"text": text}], "role": "model"}, "finishReason": "STOP"}],
+        "usageMetadata": {"promptTokenCount": 0, "candidatesTokenCount": len(text) // 4}
+    }
+
+
+def claims_search_response(query):
+    return {"claims": [{
+        "text": query,
+        "claimant": "Mock claimant",
+        "claimReview": [{
+            "publisher": {"name": "Mock Fact Check", "site": "example.org"},
+            "url": f"https://example.org/fact-check/{hashlib.sha1(query.encode()).hexdigest()[:10]}",
+            "title": f"Fact check: {query[:60]}",
+            "reviewDate": "2024-01-15T00:00:00Z",
+            "textualRating": "False",
+            "languageCode": "en"
+        }]
+    }]}
+
+
+def news_response(params, count=10):
+    query = params.get('q') or params.get('category') or "headlines"
+    now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    articles = [{
+        "source": {"id": None, "name": f"Mock News {i % 3 + 1}"},
+        "author": "Mock Reporter",
+        "title": f"Mock {query} story {i + 1}",
+        "description": f"Canned article {i + 1} about {query}.",
+        "url": f"https://example.org/news/{query.replace(' ', '-')}/{i + 1}",
+        "urlToImage": None,
+        "publishedAt": now,
+        "content": f"Canned article {i + 1} about {query}."
+    } for i in range(min(count, int(params.get('pageSize') or count)))]
+    return {"status": "ok", "totalResults": len(articles), "articles": articles}
+
+
+def newsdata_response(params, count=10):
+    """NewsData.io results; the first half syndicate NewsAPI mock stories under other URLs"""
+    query = params.get('q') or params.get('category') or "headlines"
+    now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+    results = [{
+        "article_id": uuid.uuid5(uuid.NAMESPACE_URL, f"{query}/{i}").hex,
+        "title": f"Mock {query} story {i + 1}" if i < count // 2 else f"NewsData {query} exclusive {i + 1}",
+        "link": f"https://syndication.example.com/{query.replace(' ', '-')}/{i + 1}?utm_source=newsdata",
+        "creator": ["Mock Wire"],
+        "description": f"Syndicated article {i + 1} about {query}.",
+        "content": None,
+        "pubDate": now,
+        "image_url": None,
+        "source_id": "mockwire",
+        "source_name": "Mock Wire",
+        "country": [params.get('country', 'us')],
+        "category": [params.get('category', 'top')],
+        "language": params.get('language', 'english')
+    } for i in range(count)]
+    return {"status": "success", "totalResults": len(results), "results": results, "nextPage": None}
+
+
+# Articles are static, so every one was last modified when the mock started
+ARTICLES_MODIFIED = datetime.now(timezone.utc).strftime("%a, %d %b %Y %H:%M:%S GMT")
+
+
+def article_page(slug):
+    """HTML page of a mock news article, wrapped in navigation, share and comment chrome"""
+    topic = slug.replace("-", " ")
+    paragraphs = "".join(
+        f"<p>Paragraph {i + 1} of the mock report on {topic}: officials, analysts and residents described "
+        f"the situation in detail, and the figures quoted here are invented for testing.</p>"
+        for i in range(6)
+    )
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{topic.title()} | Mock News</title>
+<meta property="og:title" content="Mock report on {topic}">
+<meta property="og:site_name" content="Mock News">
+<meta property="article:published_time" content="{datetime.now(timezone.utc).strftime('%Y-%m-%dT00:00:00Z')}">
+</head><body>
+<header><nav><a href="/">Home</a> <a href="/world">World</a> <a href="/politics">Politics</a></nav></header>
+<main><article><h1>Mock report on {topic}</h1>
+<div class="share-tools"><a href="#">Share</a> <a href="#">Tweet</a></div>
+<div class="article-body">{paragraphs}</div></article></main>
+<aside class="related"><a href="/articles/other-story">Another mock story you may like</a></aside>
+<section id="comments"><p>First! This comment section should never reach the extracted text.</p></section>
+<footer><p>Copyright Mock News. All rights reserved.</p></footer>
+<script>window.analytics = {{}};</script>
+</body></html>""".encode("utf-8")
+
+
+def vision_response(request):
+    return {"responses": [{
+        "labelAnnotations": [{"description": "Mock label", "score": 0.9}],
+        "textAnnotations": [],
+        "safeSearchAnnotation": {"adult": "VERY_UNLIKELY", "violence": "UNLIKELY",
+                                 "racy": "UNLIKELY", "spoof": "UNLIKELY", "medical": "UNLIKELY"},
+        "webDetection": {"webEntities": [], "fullMatchingImages": []}
+    } for _ in request.get('requests') or [{}]]}
+
+
+class Cassette:
+    """Recorded exchanges in a JSONL file, replayed in recorded order per request key"""
+
+    def __init__(self, path, mode):
+        self.path = path
+        self.mode = mode
+        self.lock = threading.Lock()
+        self.recordings = {}
+        if mode == "replay":
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.recordings.setdefault(entry['key'], []).append(entry)
+        self.cursors = {}
+
+    @staticmethod
+    def key(method, path, params, body):
+        """Match requests on method, path, non-secret query params and body"""
+        query = urlencode(sorted((k, v) for k, v in params.items() if k not in SECRET_PARAMS))
+        digest = hashlib.sha256(body or b"").hexdigest()[:16]
+        return f"{method} {path}?{query} {digest}"
+
+    def record(self, key, status, content_type, body):
+        entry = {"key": key, "status": status, "content_type": content_type,
+                 "body": body.decode("utf-8", errors="replace")}
+        with self.lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+
+    def replay(self, key):
+        """Next recording for key (the last one repeats), or None"""
+        with self.lock:
+            entries = self.recordings.get(key)
+            if not entries:
+                return None
+            index = self.cursors.get(key, 0)
+            self.cursors[key] = index + 1
+            return entries[min(index, len(entries) - 1)]
+
+
+class MockState:
+    """Settings, rate limit buckets and batch jobs shared by every request handler"""
+
+    def __init__(self, latency=None, error_rates=None, rate_limits=None, batch_delay=5.0,
+                 stream_chunk_delay=0.05, cassette=None, seed=None):
+        self.latency = latency or {}
+        self.error_rates = error_rates or {}
+        self.rate_limits = rate_limits or {}
+        self.batch_delay = batch_delay
+        self.stream_chunk_delay = stream_chunk_delay
+        self.cassette = cassette
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.buckets = {}
+        self.batches = {}
+        self.stats = {}
+
+    def sample_latency(self, endpoint):
+        sampler = self.latency.get(endpoint)
+        if sampler is None:
+            return 0.0
+        with self.lock:
+            return sampler(self.rng)
+
+    def should_fail(self, endpoint):
+        rate = self.error_rates.get(endpoint, 0.0)
+        with self.lock:
+            return rate > 0 and self.rng.random() < rate
+
+    def take_token(self, endpoint):
+        """Per-endpoint requests-per-minute bucket; returns seconds to wait, 0 if allowed"""
+        rpm = self.rate_limits.get(endpoint)
+        if not rpm:
+            return 0.0
+        now = time.monotonic()
+        with self.lock:
+            tokens, updated_at = self.buckets.get(endpoint, (rpm, now))
+            tokens = min(rpm, tokens + (now - updated_at) * rpm / 60.0)
+            if tokens < 1:
+                self.buckets[endpoint] = (tokens, now)
+                return (1 - tokens) * 60.0 / rpm
+            self.buckets[endpoint] = (tokens - 1, now)
+            return 0.0
+
+    def count(self, endpoint, status):
+        with self.lock:
+            counts = self.stats.setdefault(endpoint, {})
+            counts[status] = counts.get(status, 0) + 1
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state = None
+    routes = [
+        ("POST", re.compile(r"^/v1beta/models/(?P<model>[^/:]+):generateContent$"), "gemini", "generate_content"),
+        ("POST", re.compile(r"^/v1beta/models/(?P<model>[^/:]+):streamGenerateContent$"), "gemini_stream",
+         "stream_generate_content"),
+        ("POST", re.compile(r"^/v1beta/models/(?P<model>[^/:]+):batchGenerateContent$"), "batch", "create_batch"),
+        ("GET", re.compile(r"^/v1beta/(?P<name>batches/[^/]+)$"), "batch", "get_batch"),
+        ("GET", re.compile(r"^/v1alpha1/claims:search$"), "factcheck", "claims_search"),
+        ("GET", re.compile(r"^/v2/top-headlines$"), "news", "news"),
+        ("GET", re.compile(r"^/v2/everything$"), "news", "news"),
+        ("GET", re.compile(r"^/api/1/(?:news|latest)$"), "newsdata", "newsdata"),
+        ("POST", re.compile(r"^/v1/images:annotate$"), "vision", "annotate"),
+        ("GET", re.compile(r"^/articles/(?P<slug>[\w-]+)$"), "articles", "article")
+    ]
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def _dispatch(self, method):
+        path, _, query = self.path.partition("?")
+        self.params = dict(parse_qsl(query))
+        length = int(self.headers.get('Content-Length') or 0)
+        self.body = self.rfile.read(length) if length else b""
+
+        for route_method, pattern, endpoint, handler in self.routes:
+            match = pattern.match(path)
+            if route_method == method and match:
+                return self._serve(endpoint, method, path, handler, match.groupdict())
+        self._send_json(404, {"error": {"code": 404, "message": f"No mock for {method} {path}"}})
+
+    def _serve(self, endpoint, method, path, handler, args):
+        state = self.state
+        time.sleep(state.sample_latency(endpoint))
+
+        wait = state.take_token(endpoint)
+        if wait:
+            state.count(endpoint, 429)
+            return self._send_json(429, {"error": {"code": 429, "message": "Resource has been exhausted",
+                                                   "status": "RESOURCE_EXHAUSTED"}},
+                                   headers={"Retry-After": str(math.ceil(wait))})
+        if state.should_fail(endpoint):
+            status = state.rng.choice([500, 503])
+            state.count(endpoint, status)
+            return self._send_json(status, {"error": {"code": status, "message": "Injected mock failure"}})
+
+        state.count(endpoint, 200)
+        cassette = state.cassette
+        if cassette is not None and endpoint != "articles":
+            key = Cassette.key(method, path, self.params, self.body)
+            if cassette.mode == "record":
+                return self._proxy(method, path, key)
+            entry = cassette.replay(key)
+            if entry is None:
+                return self._send_json(404, {"error": {"code": 404, "message": f"No recording for {key}"}})
+            return self._send_raw(entry['status'], entry['content_type'], entry['body'].encode("utf-8"))
+        getattr(self, handler)(**args)
+
+    def _read_json(self):
+        return json.loads(self.body or b"{}")
+
+    def _send_raw(self, status, content_type, payload, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_json(self, status, body, headers=None):
+        self._send_raw(status, "application/json", json.dumps(body).encode(), headers)
+
+    # --- Record mode ---
+
+    def _proxy(self, method, path, key):
+        """Forward to the real API and record its response"""
+        origin = next((o for prefix, o in UPSTREAMS.items() if path.startswith(prefix)), None)
+        url = f"{origin}{path}" + (f"?{urlencode(self.params)}" if self.params else "")
+        headers = {name: value for name, value in self.headers.items()
+                   if name.lower() in ("content-type", "x-goog-api-key", "x-api-key", "authorization")}
+        request = urllib.request.Request(url, data=self.body or None, method=method, headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=120) as response:
+                status, content_type, payload = response.status, response.headers.get("Content-Type"), response.read()
+        except urllib.error.HTTPError as e:
+            status, content_type, payload = e.code, e.headers.get("Content-Type"), e.read()
+        except OSError as e:
+            return self._send_json(502, {"error": {"code": 502, "message": f"Upstream unreachable: {e}"}})
+
+        content_type = content_type or "application/json"
+        self.state.cassette.record(key, status, content_type, payload)
+        self._send_raw(status, content_type, payload)
+
+    # --- Gemini ---
+
+    def generate_content(self, model):
+        self._send_json(200, generate_content_response(self._read_json()))
+
+    def stream_generate_content(self, model):
+        """Server-sent events (alt=sse), one chunk of the response text per event"""
+        response = generate_content_response(self._read_json())
+        text = response['candidates'][0]['content']['parts'][0]['text']
+        pieces = [text[i:i + 80] for i in range(0, len(text), 80)] or [""]
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for i, piece in enumerate(pieces):
+            event = {"candidates": [{"content": {"parts": [{"text": piece}], "role": "model"}}]}
+            if i == len(pieces) - 1:
+                # Like the real API, only the last event carries the finish reason
+                event["candidates"][0]["finishReason"] = "STOP"
+            self._write_chunk(f"data: {json.dumps(event)}\r\n\r\n".encode())
+            time.sleep(self.state.stream_chunk_delay)
+        self._write_chunk(b"")
+
+    def _write_chunk(self, data):
+        self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def create_batch(self, model):
+        batch = self._read_json().get('batch', {})
+        requests = batch.get('input_config', {}).get('requests', {}).get('requests', [])
+        name = f"batches/{uuid.uuid4().hex[:12]}"
+        with self.state.lock:
+            self.state.batches[name] = {
+                'created': time.monotonic(),
+                'model': model,
+                'display_name': batch.get('display_name', ''),
+                'requests': requests
+            }
+        self._send_json(200, self._batch_operation(name))
+
+    def get_batch(self, name):
+        if name not in self.state.batches:
+            return self._send_json(404, {"error": {"code": 404, "message": f"{name} not found"}})
+        self._send_json(200, self._batch_operation(name))
+
+    def _batch_operation(self, name):
+        with self.state.lock:
+            job = self.state.batches[name]
+        done = time.monotonic() - job['created'] >= self.state.batch_delay
+        operation = {
+            "name": name,
+            "metadata": {
+                "@type": "type.googleapis.com/google.ai.generativelanguage.v1main.GenerateContentBatch",
+                "model": f"models/{job['model']}",
+                "displayName": job['display_name'],
+                "state": "BATCH_STATE_SUCCEEDED" if done else "BATCH_STATE_RUNNING"
+            },
+            "done": done
+        }
+        if done:
+            operation["response"] = {
+                "@type": "type.googleapis.com/google.ai.generativelanguage.v1main.GenerateContentBatchOutput",
+                "inlinedResponses": {"inlinedResponses": [
+                    {"response": generate_content_response(entry.get('request') or {}),
+                     "metadata": entry.get('metadata') or {}}
+                    for entry in job['requests']
+                ]}
+            }
+        return operation
+
+    # --- Fact Check, NewsAPI, Vision ---
+
+    def claims_search(self):
+        self._send_json(200, claims_search_response(self.params.get('query', '')))
+
+    def news(self):
+        self._send_json(200, news_response(self.params))
+
+    def newsdata(self):
+        self._send_json(200, newsdata_response(self.params))
+
+    def annotate(self):
+        self._send_json(200, vision_response(self._read_json()))
+
+    # --- Articles ---
+
+    def article(self, slug):
+        """Article page, or 304 Not Modified when the client's ETag still matches"""
+        etag = f'"{hashlib.sha256(slug.encode()).hexdigest()[:16]}"'
+        validators = {"ETag": etag, "Last-Modified": ARTICLES_MODIFIED}
+        if self.headers.get("If-None-Match") == etag or (
+                not self.headers.get("If-None-Match") and self.headers.get("If-Modified-Since") == ARTICLES_MODIFIED):
+            self.send_response(304)
+            for name, value in validators.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self._send_raw(200, "text/html; charset=utf-8", article_page(slug), headers=validators)
+
+
+def serve(host="127.0.0.1", port=8765, state=None):
+    """Start the mock server in a background thread and return it"""
+    handler = type("BoundMockHandler", (MockHandler,), {"state": state or MockState()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="mock-api-server", daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--seed", type=int, default=None, help="seed latency and error sampling")
+    parser.add_argument("--latency", action="append", metavar="ENDPOINT=DIST")
+    parser.add_argument("--error-rate", action="append", metavar="ENDPOINT=P")
+    parser.add_argument("--rate-limit", action="append", metavar="ENDPOINT=RPM")
+    parser.add_argument("--batch-delay", type=float, default=5.0, help="seconds until a batch job succeeds")
+    parser.add_argument("--stream-chunk-delay", type=float, default=0.05, help="seconds between SSE events")
+    cassettes = parser.add_mutually_exclusive_group()
+    cassettes.add_argument("--record", metavar="CASSETTE", help="proxy to the real APIs and record responses")
+    cassettes.add_argument("--replay", metavar="CASSETTE", help="serve recorded responses")
+    args = parser.parse_args()
+
+    cassette = None
+    if args.record:
+        cassette = Cassette(args.record, "record")
+    elif args.replay:
+        cassette = Cassette(args.replay, "replay")
+
+    state = MockState(
+        latency=parse_per_endpoint(args.latency, parse_latency),
+        error_rates=parse_per_endpoint(args.error_rate, float),
+        rate_limits=parse_per_endpoint(args.rate_limit, float),
+        batch_delay=args.batch_delay,
+        stream_chunk_delay=args.stream_chunk_delay,
+        cassette=cassette,
+        seed=args.seed
+    )
+    server = serve(args.host, args.port, state)
+    print(f"Mock API server on http://{args.host}:{args.port} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+        print(json.dumps(state.stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
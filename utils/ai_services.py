@@ -1,25 +1,29 @@
-import requests
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
 import streamlit as st
 from config import Config
+from utils.cache import get_response_cache, prompt_version
+from utils.chunking import chunk_text, estimate_tokens
+from utils.claims import extract_claims
+from utils.concurrency import run_stages
+from utils.factcheck_mirror import get_factcheck_mirror
+from utils.http_client import create_async_http_client, get_http_client
+from utils.metrics import get_metrics_store
+from utils.rate_limiter import RateLimitExceeded, get_rate_limiter
+from utils.resilience import CircuitOpenError, asend_with_retry, get_breaker, send_with_retry
+from utils.response_parser import (
+    SECTION_HEADER, Verdict, parse_forensic_response, report_from_structured, report_risk
+)
+from utils.security import SecurityService
+from utils.singleflight import get_singleflight
 
-class GeminiService:
-    """Enhanced Gemini AI service with specialized prompts"""
-    
-    def __init__(self):
-        self.api_key = "AIzaSyAKo-sIHXM7HIlqCdHF6rsHo"
-        self.base_url = "https://generativelanguage.googleapis.com/v1beta/models"
-    
-    def test_connection(self):
-        """Test if Gemini API is working"""
-        try:
-            response = self._make_request("Hello", model="gemini-1.5-flash")
-            return response is not None
-        except:
-            return False
-    
-    def forensic_analysis(self, text, language="en"):
-        """Specialized forensic analysis prompt"""
-        prompt = f"""
+# Prompt templates are versioned by content hash, so editing one invalidates its cached responses
+FORENSIC_PROMPT = """
         As a digital forensics expert, analyze this content for misinformation:
         
         CONTENT: "{text}"
@@ -70,85 +74,8 @@ class GeminiService:
         Language: {language}
         Be specific, cite sources with links, use emojis for readability.
         """
-        
-        return self._make_request(prompt, model="gemini-1.5-pro")
-    
-    def extract_sources_and_reporting(self, ai_response):
-        """Extract source links and reporting information from AI response"""
-        if not ai_response:
-            return {'sources': [], 'reporting_emails': []}
-        
-        sources = []
-        reporting_emails = []
-        
-        # Extract source links
-        source_section = self._extract_section(ai_response, "🔗 SOURCE LINKS & ARTICLES:")
-        if source_section:
-            lines = source_section.split('\n')
-            for line in lines:
-                line = line.strip()
-                if line.startswith('-') and ':' in line:
-                    # Parse format: "- Source Name: [description] - [URL]"
-                    parts = line[1:].split(':', 1)
-                    if len(parts) == 2:
-                        source_name = parts[0].strip()
-                        description_url = parts[1].strip()
-                        
-                        # Split description and URL
-                        if ' - ' in description_url:
-                            desc, url = description_url.rsplit(' - ', 1)
-                            sources.append({
-                                'name': source_name,
-                                'description': desc.strip(),
-                                'url': url.strip()
-                            })
-                        else:
-                            sources.append({
-                                'name': source_name,
-                                'description': description_url,
-                                'url': None
-                            })
-        
-        # Extract reporting emails
-        reporting_section = self._extract_section(ai_response, "📧 REPORTING INFORMATION:")
-        if reporting_section:
-            lines = reporting_section.split('\n')
-            for line in lines:
-                line = line.strip()
-                if line.startswith('-') and '@' in line:
-                    # Parse format: "- Description: email@domain.com"
-                    if ':' in line:
-                        desc, email = line[1:].split(':', 1)
-                        reporting_emails.append({
-                            'description': desc.strip(),
-                            'email': email.strip()
-                        })
-        
-        return {
-            'sources': sources,
-            'reporting_emails': reporting_emails
-        }
-    
-    def _extract_section(self, text, section_header):
-        """Extract a specific section from AI response"""
-        lines = text.split('\n')
-        in_section = False
-        section_content = []
-        
-        for line in lines:
-            if section_header in line:
-                in_section = True
-                continue
-            elif in_section and line.startswith('🔍') or line.startswith('🧬') or line.startswith('📊') or line.startswith('🎯') or line.startswith('⚠️') or line.startswith('🛡️') or line.startswith('📋'):
-                break
-            elif in_section:
-                section_content.append(line)
-        
-        return '\n'.join(section_content).strip()
-    
-    def trace_origin(self, text):
-        """Attempt to trace content origins"""
-        prompt = f"""
+
+ORIGIN_PROMPT = """
         As a digital investigator, analyze the potential origins of this content:
         
         CONTENT: "{text}"
@@ -162,12 +89,8 @@ class GeminiService:
         
         Provide your best assessment of where/when this originated.
         """
-        
-        return self._make_request(prompt, model="gemini-1.5-pro")
-    
-    def analyze_context(self, text):
-        """Analyze missing context"""
-        prompt = f"""
+
+CONTEXT_PROMPT = """
         As a context analyst, identify what crucial context is missing from this content:
         
         CONTENT: "{text}"
@@ -181,41 +104,1171 @@ class GeminiService:
         
         Explain why this missing context matters for understanding the truth.
         """
+COMBINED_PROMPT = """
+        As a digital forensics expert, investigator and context analyst, analyze this content for
+        misinformation, trace its likely origins and identify the crucial context it leaves out:
+        
+        CONTENT: "{text}"
+        
+        Fill in every field of the JSON response:
+        - forensic.verdict: FALSE INFORMATION, MISLEADING, TRUE or UNVERIFIED
+        - forensic.veracity_assessment: why you reached that verdict
+        - forensic.manipulation_tactics: what psychological tricks are used
+        - forensic.evidence_evaluation: what evidence supports/contradicts this, with specific sources
+        - forensic.target_analysis: who this is meant to influence and how
+        - forensic.harm_potential: what damage it could cause if it spreads
+        - forensic.counter_narrative: the accurate information
+        - forensic.verification_steps: how users can verify this themselves
+        - forensic.sources: 3-5 credible sources that refute or support the claim, with URLs
+        - forensic.reporting_contacts: reporting emails for platforms, fact-checkers and authorities
+        - origin: linguistic patterns, temporal clues, geographic indicators, platform indicators,
+          propagation pattern and your best assessment of where/when this originated
+        - context: missing background, data, timeline and connections, cherry-picking, and why
+          the missing context matters for understanding the truth
         
-        return self._make_request(prompt, model="gemini-1.5-flash")
+        Language: {language}
+        Be specific and cite sources with links.
+        """
+
+_STRING = {"type": "STRING"}
+
+COMBINED_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "forensic": {
+            "type": "OBJECT",
+            "properties": {
+                "verdict": {"type": "STRING", "enum": ["FALSE INFORMATION", "MISLEADING", "TRUE", "UNVERIFIED"]},
+                "veracity_assessment": _STRING,
+                "manipulation_tactics": _STRING,
+                "evidence_evaluation": _STRING,
+                "target_analysis": _STRING,
+                "harm_potential": _STRING,
+                "counter_narrative": _STRING,
+                "verification_steps": _STRING,
+                "sources": {
+                    "type": "ARRAY",
+                    "items": {
+                        "type": "OBJECT",
+                        "properties": {"name": _STRING, "description": _STRING, "url": _STRING},
+                        "required": ["name", "description"]
+                    }
+                },
+                "reporting_contacts": {
+                    "type": "ARRAY",
+                    "items": {
+                        "type": "OBJECT",
+                        "properties": {"description": _STRING, "email": _STRING},
+                        "required": ["description", "email"]
+                    }
+                }
+            },
+            "required": ["verdict", "veracity_assessment", "manipulation_tactics", "evidence_evaluation",
+                         "target_analysis", "harm_potential", "counter_narrative", "verification_steps",
+                         "sources", "reporting_contacts"]
+        },
+        "origin": {
+            "type": "OBJECT",
+            "properties": {
+                "linguistic_patterns": _STRING,
+                "temporal_clues": _STRING,
+                "geographic_indicators": _STRING,
+                "platform_indicators": _STRING,
+                "propagation_pattern": _STRING,
+                "assessment": _STRING
+            },
+            "required": ["linguistic_patterns", "temporal_clues", "geographic_indicators",
+                         "platform_indicators", "propagation_pattern", "assessment"]
+        },
+        "context": {
+            "type": "OBJECT",
+            "properties": {
+                "missing_background": _STRING,
+                "missing_data": _STRING,
+                "missing_timeline": _STRING,
+                "missing_connections": _STRING,
+                "cherry_picking": _STRING,
+                "why_it_matters": _STRING
+            },
+            "required": ["missing_background", "missing_data", "missing_timeline",
+                         "missing_connections", "cherry_picking", "why_it_matters"]
+        }
+    },
+    "required": ["forensic", "origin", "context"]
+}
+
+
+def _render_fields(fields, data):
+    """Render (header, key) pairs of a structured response as emoji-headed text"""
+    return "\n\n".join(f"{header}\n{data.get(key, '')}" for header, key in fields)
+
+
+def render_combined_analysis(structured):
+    """Turn a COMBINED_SCHEMA response into the same text the individual prompts produce"""
+    forensic = structured.get('forensic', {})
+    origin = structured.get('origin', {})
+    context = structured.get('context', {})
     
-    def _make_request(self, prompt, model="gemini-1.5-flash"):
-        """Make request to Gemini API"""
+    sources = "\n".join(
+        f"- {s.get('name', '')}: {s.get('description', '')}" + (f" - {s['url']}" if s.get('url') else "")
+        for s in forensic.get('sources', [])
+    )
+    contacts = "\n".join(
+        f"- {c.get('description', '')}: {c.get('email', '')}"
+        for c in forensic.get('reporting_contacts', [])
+    )
+    forensic_text = "\n\n".join([
+        f"🔍 VERACITY ASSESSMENT:\n{forensic.get('verdict', 'UNVERIFIED')} - {forensic.get('veracity_assessment', '')}",
+        _render_fields([
+            ("🧬 MANIPULATION TACTICS:", 'manipulation_tactics'),
+            ("📊 EVIDENCE EVALUATION:", 'evidence_evaluation'),
+            ("🎯 TARGET ANALYSIS:", 'target_analysis'),
+            ("⚠️ HARM POTENTIAL:", 'harm_potential'),
+            ("🛡️ COUNTER-NARRATIVE:", 'counter_narrative'),
+            ("📋 VERIFICATION STEPS:", 'verification_steps')
+        ], forensic),
+        f"🔗 SOURCE LINKS & ARTICLES:\n{sources}",
+        f"📧 REPORTING INFORMATION:\n{contacts}"
+    ])
+    
+    origin_text = _render_fields([
+        ("🕵️ LINGUISTIC PATTERNS:", 'linguistic_patterns'),
+        ("📅 TEMPORAL CLUES:", 'temporal_clues'),
+        ("🌍 GEOGRAPHIC INDICATORS:", 'geographic_indicators'),
+        ("📱 PLATFORM INDICATORS:", 'platform_indicators'),
+        ("🔄 PROPAGATION PATTERN:", 'propagation_pattern'),
+        ("🧭 ASSESSMENT:", 'assessment')
+    ], origin)
+    
+    context_text = _render_fields([
+        ("📚 MISSING BACKGROUND:", 'missing_background'),
+        ("📊 MISSING DATA:", 'missing_data'),
+        ("⏰ MISSING TIMELINE:", 'missing_timeline'),
+        ("🔗 MISSING CONNECTIONS:", 'missing_connections'),
+        ("📝 CHERRY-PICKING:", 'cherry_picking'),
+        ("❗ WHY IT MATTERS:", 'why_it_matters')
+    ], context)
+    
+    return {
+        'forensic': forensic_text,
+        'origin': origin_text,
+        'context': context_text,
+        'structured': structured,
+        'report': report_from_structured(structured, raw=forensic_text)
+    }
+
+CHUNK_PROMPT = """
+        As a digital forensics expert, analyze this excerpt of a longer document for misinformation.
+        Judge only the claims made in the excerpt itself:
+        
+        EXCERPT: "{text}"
+        
+        Fill in every field of the JSON response:
+        - verdict: FALSE INFORMATION, MISLEADING, TRUE or UNVERIFIED for the excerpt's claims
+        - summary: one or two sentences on why
+        - manipulation_tactics: short names of the psychological tricks used (empty if none)
+        - flagged_claims: claims in the excerpt that are false, misleading or unverifiable
+        
+        Language: {language}
+        """
+
+CHUNK_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "verdict": {"type": "STRING", "enum": ["FALSE INFORMATION", "MISLEADING", "TRUE", "UNVERIFIED"]},
+        "summary": _STRING,
+        "manipulation_tactics": {"type": "ARRAY", "items": _STRING},
+        "flagged_claims": {"type": "ARRAY", "items": _STRING}
+    },
+    "required": ["verdict", "summary", "manipulation_tactics", "flagged_claims"]
+}
+
+# Most severe first: one false excerpt makes the document false
+VERDICT_SEVERITY = [Verdict.FALSE, Verdict.MISLEADING, Verdict.UNVERIFIED, Verdict.TRUE]
+
+
+def reduce_chunk_analyses(analyses):
+    """
+    Merge per-excerpt CHUNK_SCHEMA results (None for failed excerpts) into one forensic report.
+    
+    Returns a dict with the report text (FORENSIC_PROMPT format), the union of
+    manipulation tactics, and how many excerpts were analyzed, or None if none were.
+    """
+    analyzed = [(i, a) for i, a in enumerate(analyses, 1) if a]
+    if not analyzed:
+        return None
+    
+    verdicts = []
+    for _, analysis in analyzed:
         try:
-            url = f"{self.base_url}/{model}:generateContent"
-            headers = {
-                "Content-Type": "application/json",
-                "x-goog-api-key": self.api_key
+            verdicts.append(Verdict(str(analysis.get('verdict', '')).upper()))
+        except ValueError:
+            verdicts.append(Verdict.UNVERIFIED)
+    
+    counts = {v: verdicts.count(v) for v in VERDICT_SEVERITY if v in verdicts}
+    if Verdict.FALSE in counts or Verdict.MISLEADING in counts:
+        verdict = next(v for v in VERDICT_SEVERITY if v in counts)
+    elif counts.get(Verdict.TRUE, 0) * 2 > len(verdicts):
+        verdict = Verdict.TRUE
+    else:
+        verdict = Verdict.UNVERIFIED
+    
+    # Union of tactics in first-seen order, remembering which excerpts use them
+    tactics = {}
+    for index, analysis in analyzed:
+        for tactic in analysis.get('manipulation_tactics') or []:
+            tactic = str(tactic).strip()
+            if tactic:
+                tactics.setdefault(tactic.lower(), (tactic, []))[1].append(index)
+    
+    breakdown = ", ".join(f"{n} {v.value}" for v, n in counts.items())
+    excerpt_lines = "\n".join(
+        f"- Excerpt {i} ({v.value}): {a.get('summary', '')}" for (i, a), v in zip(analyzed, verdicts)
+    )
+    tactic_lines = "\n".join(
+        f"- {name} (excerpts {', '.join(map(str, where))})" for name, where in tactics.values()
+    )
+    claim_lines = "\n".join(
+        f"- Excerpt {i}: {claim}" for i, a in analyzed for claim in a.get('flagged_claims') or []
+    )
+    text = "\n\n".join([
+        f"🔍 VERACITY ASSESSMENT:\n{verdict.value} - combined from {len(analyzed)} of {len(analyses)} "
+        f"excerpts ({breakdown}).\n{excerpt_lines}",
+        f"🧬 MANIPULATION TACTICS:\n{tactic_lines or 'None detected'}",
+        f"📊 EVIDENCE EVALUATION:\n{claim_lines or 'No flagged claims'}"
+    ])
+    
+    return {
+        'text': text,
+        'verdict': verdict,
+        'manipulation_tactics': [name for name, _ in tactics.values()],
+        'chunks': len(analyses),
+        'analyzed': len(analyzed)
+    }
+
+# Circuit breakers are keyed per Gemini model, plus one for the Fact Check API
+GEMINI_MODELS = ["gemini-1.5-pro", "gemini-1.5-flash"]
+FACTCHECK_BREAKER = "factcheck"
+
+def merge_fact_checks(claims, results):
+    """Merge per-claim fact checks in claim order, keeping the first review of each URL"""
+    merged, seen = [], set()
+    for claim, checks in zip(claims, results):
+        for check in checks or []:
+            url = check.get('url') or check.get('title')
+            if url in seen:
+                continue
+            seen.add(url)
+            merged.append({**check, 'claim': claim})
+    return merged[:Config.FACTCHECK_MAX_RESULTS]
+
+
+# Fact-check searches being refreshed in the background, shared by every FactCheckService
+_factcheck_refreshing = set()
+_factcheck_refresh_lock = threading.Lock()
+
+
+def iter_sections(chunks):
+    """
+    Group streamed text chunks into (section title, body) pairs.
+
+    A section is yielded as soon as the next section header arrives, so callers
+    can render each part of the analysis while the rest is still generating.
+    """
+    buffer = ""
+    title, body = None, []
+    
+    def _lines(final=False):
+        nonlocal buffer
+        *complete, buffer = buffer.split("\n")
+        if final:
+            complete.append(buffer)
+            buffer = ""
+        return complete
+    
+    def _feed(lines):
+        nonlocal title, body
+        for line in lines:
+            match = SECTION_HEADER.match(line)
+            if match:
+                if title:
+                    yield title, "\n".join(body).strip()
+                title, body = match.group(1), [match.group(2)] if match.group(2) else []
+            elif title:
+                body.append(line)
+    
+    for chunk in chunks:
+        buffer += chunk
+        yield from _feed(_lines())
+    
+    yield from _feed(_lines(final=True))
+    if title:
+        yield title, "\n".join(body).strip()
+
+
+class CascadeStats:
+    """Process-wide counters for the flash -> pro model cascade"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.escalations = 0
+        self.reasons = {}
+        self.flash_seconds = 0.0
+        self.pro_seconds = 0.0
+    
+    def record(self, flash_seconds, escalation_reason=None, pro_seconds=0.0):
+        with self._lock:
+            self.calls += 1
+            self.flash_seconds += flash_seconds
+            if escalation_reason:
+                self.escalations += 1
+                self.pro_seconds += pro_seconds
+                self.reasons[escalation_reason] = self.reasons.get(escalation_reason, 0) + 1
+    
+    def report(self):
+        """Escalation rate and estimated latency saved versus always calling pro"""
+        with self._lock:
+            avg_flash = self.flash_seconds / self.calls if self.calls else 0.0
+            avg_pro = self.pro_seconds / self.escalations if self.escalations else None
+            kept_on_flash = self.calls - self.escalations
+            saved = None
+            if avg_pro is not None:
+                # Answered by flash: a pro call avoided. Escalated: a flash call added.
+                saved = kept_on_flash * (avg_pro - avg_flash) - self.escalations * avg_flash
+            return {
+                'calls': self.calls,
+                'escalations': self.escalations,
+                'escalation_rate': self.escalations / self.calls if self.calls else 0.0,
+                'avg_flash_seconds': avg_flash,
+                'avg_pro_seconds': avg_pro,
+                'estimated_seconds_saved': saved,
+                'reasons': dict(self.reasons)
             }
-            
-            data = {
-                "contents": [{"parts": [{"text": prompt}]}],
-                "generationConfig": {
-                    "temperature": 0.1,
-                    "topK": 40,
-                    "topP": 0.95,
-                    "maxOutputTokens": 2048
-                }
+
+
+cascade_stats = CascadeStats()
+
+
+class GeminiService:
+    """Enhanced Gemini AI service with specialized prompts"""
+    
+    def __init__(self):
+        self.api_key = "AIzaSyAKo-sIHXM7HIlqCdHF6rsHo"
+        self.base_url = f"{Config.GEMINI_API_BASE}/models"
+        self.http = get_http_client()
+        self.cache = get_response_cache()
+        self.security = SecurityService()
+        # Identical analyses from concurrent sessions share one upstream call
+        self.flights = get_singleflight("gemini")
+        self.limiter = get_rate_limiter()
+        self.metrics = get_metrics_store()
+    
+    def test_connection(self):
+        """Test if Gemini API is working"""
+        try:
+            response = self._make_request("Hello", model="gemini-1.5-flash")
+            return response is not None
+        except:
+            return False
+    
+    def health_check(self):
+        """Cheap liveness probe: models.get on flash, no generation or quota spent"""
+        response = self.http.get(
+            f"{self.base_url}/gemini-1.5-flash",
+            headers={"x-goog-api-key": self.api_key},
+            timeout=Config.HEALTH_CHECK_TIMEOUT
+        )
+        return response.status_code == 200
+    
+    def forensic_analysis(self, text, language="en", model="gemini-1.5-pro"):
+        """Specialized forensic analysis prompt"""
+        return self._cached_request(FORENSIC_PROMPT, text, model=model, language=language)
+    
+    def cascade_forensic_analysis(self, text, language="en", heuristic_risk=0, manipulation_risk="LOW", run=None):
+        """
+        Forensic analysis on flash, escalating to pro only for uncertain or contradictory verdicts.
+        
+        heuristic_risk/manipulation_risk come from calculate_risk_score and
+        SecurityService.detect_manipulation_patterns. run(model) may replace the
+        plain request, e.g. with a streaming renderer.
+        """
+        if run is None:
+            run = lambda model: self._cached_request(FORENSIC_PROMPT, text, model=model, language=language)
+        
+        steps = self._cascade_steps(heuristic_risk, manipulation_risk)
+        try:
+            model = next(steps)
+            while True:
+                model = steps.send(run(model))
+        except StopIteration as done:
+            return done.value
+    
+    def _cascade_steps(self, heuristic_risk, manipulation_risk):
+        """
+        The cascade's decisions without its I/O, shared by the sync and asyncio clients.
+        
+        Yields the model to run next and is sent its response; returns the final response.
+        """
+        started = time.monotonic()
+        response = yield "gemini-1.5-flash"
+        flash_seconds = time.monotonic() - started
+        
+        reason = self.escalation_reason(response, heuristic_risk, manipulation_risk)
+        if reason is None:
+            cascade_stats.record(flash_seconds)
+            return response
+        
+        started = time.monotonic()
+        escalated = yield "gemini-1.5-pro"
+        cascade_stats.record(flash_seconds, reason, time.monotonic() - started)
+        return escalated or response
+    
+    def escalation_reason(self, ai_response, heuristic_risk=0, manipulation_risk="LOW"):
+        """Why a flash verdict needs a second opinion from pro, or None if it can stand"""
+        if not ai_response:
+            return "no flash response"
+        
+        verdict = self.parse_analysis(ai_response).verdict
+        if verdict in (Verdict.UNVERIFIED, Verdict.UNKNOWN):
+            return "uncertain verdict"
+        
+        heuristics_alarmed = (heuristic_risk >= Config.CASCADE_HIGH_RISK
+                              or manipulation_risk in ("HIGH", "CRITICAL"))
+        heuristics_calm = heuristic_risk <= Config.CASCADE_LOW_RISK and manipulation_risk == "LOW"
+        if verdict == Verdict.TRUE and heuristics_alarmed:
+            return "TRUE verdict contradicts heuristics"
+        if verdict in (Verdict.FALSE, Verdict.MISLEADING) and heuristics_calm:
+            return "FALSE verdict contradicts heuristics"
+        return None
+    
+    def stream_forensic_analysis(self, text, language="en", model="gemini-1.5-pro"):
+        """
+        Forensic analysis that yields text chunks as Gemini generates them.
+        
+        Raises StreamIncompleteError after the last chunk if the stream did not
+        finish cleanly; the partial text is not cached.
+        """
+        key = self._cache_key(FORENSIC_PROMPT, text, model, language)
+        cached = self.cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+        
+        def generate():
+            chunks, outcome = [], {}
+            prompt = FORENSIC_PROMPT.format(text=text, language=language)
+            for chunk in self._stream_request(prompt, model=model, outcome=outcome):
+                chunks.append(chunk)
+                yield chunk
+            self._finish_stream(key, model, chunks, outcome)
+        
+        yield from self.flights.stream(key, generate)
+    
+    def _finish_stream(self, key, model, chunks, outcome):
+        """Cache a streamed analysis that finished cleanly; raise StreamIncompleteError otherwise"""
+        if outcome.get('finish') != "STOP":
+            raise StreamIncompleteError(model, outcome.get('finish') or outcome.get('error') or "no finish reason")
+        self.cache.set(key, "".join(chunks))
+    
+    def parse_analysis(self, ai_response):
+        """Parse a forensic analysis response into a typed ForensicReport"""
+        return parse_forensic_response(ai_response)
+    
+    def extract_sources_and_reporting(self, ai_response):
+        """Extract source links and reporting information from AI response"""
+        report = self.parse_analysis(ai_response)
+        return {
+            'sources': report.sources_as_dicts(),
+            'reporting_emails': report.reporting_as_dicts()
+        }
+    
+    def trace_origin(self, text):
+        """Attempt to trace content origins"""
+        return self._cached_request(ORIGIN_PROMPT, text, model="gemini-1.5-pro")
+    
+    def analyze_context(self, text):
+        """Analyze missing context"""
+        return self._cached_request(CONTEXT_PROMPT, text, model="gemini-1.5-flash")
+    
+    def combined_analysis(self, text, language="en"):
+        """Forensic, origin and context analysis in a single structured (JSON) request"""
+        response = self._cached_request(COMBINED_PROMPT, text, model="gemini-1.5-pro",
+                                        language=language, response_schema=COMBINED_SCHEMA)
+        return self._load_combined_analysis(response, text, language)
+    
+    def _load_combined_analysis(self, response, text, language):
+        """Render a COMBINED_SCHEMA response, evicting it from the cache if malformed"""
+        if response is None:
+            return None
+        try:
+            return render_combined_analysis(json.loads(response))
+        except ValueError:
+            # Never keep a malformed structured response around
+            self.cache.delete(self._cache_key(COMBINED_PROMPT, text, "gemini-1.5-pro", language, COMBINED_SCHEMA))
+            st.error("Gemini API Error: malformed structured response")
+            return None
+    
+    def chunk_analysis(self, chunk, language="en"):
+        """Structured verdict for one excerpt of a long document (flash)"""
+        response = self._cached_request(CHUNK_PROMPT, chunk, model="gemini-1.5-flash",
+                                        language=language, response_schema=CHUNK_SCHEMA)
+        return self._load_chunk_analysis(response, chunk, language)
+    
+    def long_document_analysis(self, text, language="en", deadline=None):
+        """
+        Map-reduce forensic analysis for documents too long for a single prompt.
+        
+        Splits text into LONG_DOCUMENT_CHUNK_TOKENS excerpts on sentence boundaries,
+        analyzes them in parallel on flash and merges the results with
+        reduce_chunk_analyses. Excerpts that miss the deadline are left out.
+        """
+        chunks = chunk_text(text, Config.LONG_DOCUMENT_CHUNK_TOKENS)
+        deadline = deadline or Config.PIPELINE_STAGE_DEADLINES['long_document']
+        stages = {
+            i: (lambda chunk=chunk: self.chunk_analysis(chunk, language), deadline)
+            for i, chunk in enumerate(chunks)
+        }
+        
+        # A dedicated pool: this already runs on a shared pipeline worker
+        executor = ThreadPoolExecutor(max_workers=Config.LONG_DOCUMENT_PARALLELISM,
+                                      thread_name_prefix="truthlens-chunk")
+        try:
+            results, _ = run_stages(stages, executor=executor)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        return reduce_chunk_analyses([results.get(i) for i in range(len(chunks))])
+    
+    def _load_chunk_analysis(self, response, chunk, language):
+        """Decode a CHUNK_SCHEMA response, evicting it from the cache if malformed"""
+        if response is None:
+            return None
+        try:
+            return json.loads(response)
+        except ValueError:
+            self.cache.delete(self._cache_key(CHUNK_PROMPT, chunk, "gemini-1.5-flash", language, CHUNK_SCHEMA))
+            return None
+    
+    def _cached_request(self, template, text, model, language="", response_schema=None):
+        """Fill a prompt template and serve the response from cache when possible"""
+        key = self._cache_key(template, text, model, language, response_schema)
+        
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        
+        def fetch():
+            response = self._make_request(template.format(text=text, language=language), model=model,
+                                          response_schema=response_schema)
+            if response is not None:
+                self.cache.set(key, response)
+            return response
+        
+        return self.flights.do(key, fetch)
+    
+    def _cache_key(self, template, text, model, language, response_schema=None):
+        """Cache key for a prompt template applied to some content"""
+        content_hash = self.security.hash_content(self.security.normalize_content(text))
+        if response_schema:
+            template += json.dumps(response_schema, sort_keys=True)
+        return self.cache.make_key(content_hash, model, language, prompt_version(template))
+    
+    def _build_request(self, prompt, model, response_schema=None):
+        """Build the URL, headers and body of a generateContent call"""
+        url = f"{self.base_url}/{model}:generateContent"
+        headers = {
+            "Content-Type": "application/json",
+            "x-goog-api-key": self.api_key
+        }
+        
+        data = {
+            "contents": [{"parts": [{"text": prompt}]}],
+            "generationConfig": {
+                "temperature": 0.1,
+                "topK": 40,
+                "topP": 0.95,
+                "maxOutputTokens": 2048
             }
+        }
+        if response_schema:
+            # Structured output: typed JSON fields instead of free text
+            data["generationConfig"]["responseMimeType"] = "application/json"
+            data["generationConfig"]["responseSchema"] = response_schema
+            data["generationConfig"]["maxOutputTokens"] = 4096
+        return url, headers, data
+    
+    def _parse_response(self, result):
+        """Pull the generated text out of a generateContent response"""
+        # Correct path to access the generated text from Gemini API response
+        return result['candidates'][0]['content']['parts'][0]['text']
+    
+    def _make_request(self, prompt, model="gemini-1.5-flash", response_schema=None):
+        """Make request to Gemini API"""
+        started, call, attempts = time.monotonic(), self._new_call(), {}
+        try:
+            url, headers, data = self._build_request(prompt, model, response_schema)
+            self.limiter.acquire(model, self._estimate_tokens(prompt))
+            response = send_with_retry(
+                lambda: self.http.post(url, headers=headers, json=data, timeout=30),
+                get_breaker(model),
+                stats=attempts
+            )
+            return self._handle_response(response, call)
+        except Exception as e:
+            return self._handle_failure(e, call)
+        finally:
+            self._record_call(model, started, call, attempts)
+    
+    def _new_call(self):
+        """Per-call metrics filled in while a request runs, for _record_call"""
+        return {'status': 'exception', 'ttfb': None, 'usage': None}
+    
+    def _handle_response(self, response, call):
+        """Generated text of a generateContent response, or None after reporting its error status"""
+        call['status'] = response.status_code
+        call['ttfb'] = self._time_to_first_byte(response)
+        if response.status_code != 200:
+            self._report_status(response.status_code)
+            return None
+        result = response.json()
+        call['usage'] = result.get('usageMetadata')
+        return self._parse_response(result)
+    
+    def _handle_failure(self, error, call):
+        """Report a request that raised (open circuit, rate limit, network error); returns None"""
+        if isinstance(error, CircuitOpenError):
+            call['status'] = 'circuit_open'
+            st.warning(f"⏳ {error.name} is temporarily unavailable, retrying in {error.retry_in:.0f}s")
+        elif isinstance(error, RateLimitExceeded):
+            call['status'] = 'rate_limited'
+            self._report_busy(error.retry_in)
+        else:
+            st.error(f"Gemini API Exception: {str(error)}")
+        return None
+    
+    def _build_stream_request(self, prompt, model):
+        """URL, headers and body of a streamGenerateContent (SSE) call"""
+        url, headers, data = self._build_request(prompt, model)
+        return url.replace(":generateContent", ":streamGenerateContent"), headers, data
+    
+    def _parse_stream_line(self, line, call, outcome, started):
+        """Text parts of one server-sent event line, noting usage, finish reason and time to first text"""
+        if not line or not line.startswith("data:"):
+            return []
+        event = json.loads(line[5:])
+        # The last event carries the token counts for the whole response
+        call['usage'] = event.get('usageMetadata') or call['usage']
+        texts = []
+        for candidate in event.get('candidates', []):
+            outcome['finish'] = candidate.get('finishReason') or outcome.get('finish')
+            texts.extend(part['text'] for part in candidate.get('content', {}).get('parts', []) if part.get('text'))
+        if texts and call['ttfb'] is None:
+            call['ttfb'] = time.monotonic() - started
+        return texts
+
+    
+    def _stream_request(self, prompt, model="gemini-1.5-flash", outcome=None):
+        """
+        Stream a streamGenerateContent response as text chunks.
+        
+        outcome, if given, receives the candidate's 'finish' reason, or the 'error'
+        that ended the stream early.
+        """
+        outcome = {} if outcome is None else outcome
+        started, call, attempts = time.monotonic(), self._new_call(), {}
+        try:
+            url, headers, data = self._build_stream_request(prompt, model)
+            self.limiter.acquire(model, self._estimate_tokens(prompt))
             
-            response = requests.post(url, headers=headers, json=data, timeout=30)
-            
-            if response.status_code == 200:
-                result = response.json()
-                # Correct path to access the generated text from Gemini API response
-                return result['candidates'][0]['content']['parts'][0]['text']
-            else:
-                st.error(f"Gemini API Error: {response.status_code}")
-                return None
-                
+            response = send_with_retry(
+                lambda: self.http.post(url, headers=headers, json=data, params={'alt': 'sse'},
+                                       timeout=30, stream=True),
+                get_breaker(model),
+                stats=attempts
+            )
+            call['status'] = response.status_code
+            with response:
+                if response.status_code != 200:
+                    self._report_status(response.status_code)
+                    return
+                # Server-sent events: one "data: {json}" line per chunk
+                for line in response.iter_lines(decode_unicode=True):
+                    yield from self._parse_stream_line(line, call, outcome, started)
         except Exception as e:
-            st.error(f"Gemini API Exception: {str(e)}")
+            # Includes read timeouts mid-stream: whatever was yielded is incomplete
+            self._handle_failure(e, call)
+            outcome['error'] = call['status'] if call['status'] in ('circuit_open', 'rate_limited') else str(e)
+        finally:
+            self._record_call(model, started, call, attempts, streamed=True)
+    
+    def _time_to_first_byte(self, response):
+        """Time until the response headers arrived, for clients that report it"""
+        elapsed = getattr(response, 'elapsed', None)
+        return elapsed.total_seconds() if elapsed is not None else None
+    
+    def _record_call(self, model, started, call, attempts, streamed=False):
+        self.metrics.record(
+            model, call['status'], time.monotonic() - started,
+            ttfb_seconds=call['ttfb'], retries=attempts.get('retries', 0),
+            usage=call['usage'], streamed=streamed
+        )
+    
+    def _estimate_tokens(self, prompt):
+        """Tokens a request will count against TPM: the prompt plus the expected response"""
+        return estimate_tokens(prompt) + Config.RATE_LIMIT_OUTPUT_TOKENS
+    
+    def _report_status(self, status_code):
+        """Show an API error status, in plain words for quota exhaustion"""
+        if status_code == 429:
+            self._report_busy()
+        else:
+            st.error(f"Gemini API Error: {status_code}")
+    
+    def _report_busy(self, retry_in=None):
+        wait = f" in about {retry_in:.0f}s" if retry_in else " in a minute"
+        st.warning(f"⏳ TruthLens is handling a lot of analyses right now. Please try again{wait}.")
+
+
+class AsyncGeminiService(GeminiService):
+    """Asyncio Gemini client with the same public methods as GeminiService"""
+    
+    def __init__(self, client=None):
+        super().__init__()
+        self._client = client
+        self._refresh_tasks = set()
+    
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = create_async_http_client()
+        return self._client
+    
+    async def aclose(self):
+        """Close the underlying connection pool"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+    
+    async def test_connection(self):
+        """Test if Gemini API is working"""
+        try:
+            response = await self._make_request("Hello", model="gemini-1.5-flash")
+            return response is not None
+        except Exception:
+            return False
+    
+    async def forensic_analysis(self, text, language="en", model="gemini-1.5-pro"):
+        """Specialized forensic analysis prompt"""
+        return await self._cached_request(FORENSIC_PROMPT, text, model=model, language=language)
+    
+    async def stream_forensic_analysis(self, text, language="en", model="gemini-1.5-pro"):
+        """
+        Forensic analysis that yields text chunks as Gemini generates them (an async generator).
+        
+        Raises StreamIncompleteError after the last chunk if the stream did not
+        finish cleanly. Not coalesced across callers, unlike the sync client.
+        """
+        key = self._cache_key(FORENSIC_PROMPT, text, model, language)
+        cached = self.cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+        
+        chunks, outcome = [], {}
+        prompt = FORENSIC_PROMPT.format(text=text, language=language)
+        async for chunk in self._stream_request(prompt, model=model, outcome=outcome):
+            chunks.append(chunk)
+            yield chunk
+        self._finish_stream(key, model, chunks, outcome)
+    
+    async def trace_origin(self, text):
+        """Attempt to trace content origins"""
+        return await self._cached_request(ORIGIN_PROMPT, text, model="gemini-1.5-pro")
+    
+    async def analyze_context(self, text):
+        """Analyze missing context"""
+        return await self._cached_request(CONTEXT_PROMPT, text, model="gemini-1.5-flash")
+    
+    async def combined_analysis(self, text, language="en"):
+        """Forensic, origin and context analysis in a single structured (JSON) request"""
+        response = await self._cached_request(COMBINED_PROMPT, text, model="gemini-1.5-pro",
+                                              language=language, response_schema=COMBINED_SCHEMA)
+        return self._load_combined_analysis(response, text, language)
+    
+    async def cascade_forensic_analysis(self, text, language="en", heuristic_risk=0, manipulation_risk="LOW", run=None):
+        """Forensic analysis on flash, escalating to pro only for uncertain or contradictory verdicts"""
+        if run is None:
+            run = lambda model: self._cached_request(FORENSIC_PROMPT, text, model=model, language=language)
+        
+        steps = self._cascade_steps(heuristic_risk, manipulation_risk)
+        try:
+            model = next(steps)
+            while True:
+                model = steps.send(await run(model))
+        except StopIteration as done:
+            return done.value
+    
+    async def chunk_analysis(self, chunk, language="en"):
+        """Structured verdict for one excerpt of a long document (flash)"""
+        response = await self._cached_request(CHUNK_PROMPT, chunk, model="gemini-1.5-flash",
+                                              language=language, response_schema=CHUNK_SCHEMA)
+        return self._load_chunk_analysis(response, chunk, language)
+    
+    async def long_document_analysis(self, text, language="en", deadline=None):
+        """Map-reduce forensic analysis for documents too long for a single prompt"""
+        chunks = chunk_text(text, Config.LONG_DOCUMENT_CHUNK_TOKENS)
+        deadline = deadline or Config.PIPELINE_STAGE_DEADLINES['long_document']
+        semaphore = asyncio.Semaphore(Config.LONG_DOCUMENT_PARALLELISM)
+        
+        async def analyze(chunk):
+            async with semaphore:
+                return await self.chunk_analysis(chunk, language)
+        
+        tasks = [asyncio.ensure_future(analyze(chunk)) for chunk in chunks]
+        if not tasks:
             return None
+        done, pending = await asyncio.wait(tasks, timeout=deadline)
+        for task in pending:
+            task.cancel()
+        return reduce_chunk_analyses([
+            task.result() if task in done and task.exception() is None else None
+            for task in tasks
+        ])
+    
+    async def _cached_request(self, template, text, model, language="", response_schema=None):
+        """Fill a prompt template and serve the response from cache when possible"""
+        key = self._cache_key(template, text, model, language, response_schema)
+        
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        
+        async def fetch():
+            response = await self._make_request(template.format(text=text, language=language), model=model,
+                                                response_schema=response_schema)
+            if response is not None:
+                self.cache.set(key, response)
+            return response
+        
+        return await self.flights.ado(key, fetch)
+    
+    async def _make_request(self, prompt, model="gemini-1.5-flash", response_schema=None):
+        """Make request to Gemini API"""
+        started, call, attempts = time.monotonic(), self._new_call(), {}
+        try:
+            url, headers, data = self._build_request(prompt, model, response_schema)
+            await self.limiter.aacquire(model, self._estimate_tokens(prompt))
+            response = await asend_with_retry(
+                lambda: self.client.post(url, headers=headers, json=data, timeout=30),
+                get_breaker(model),
+                stats=attempts
+            )
+            return self._handle_response(response, call)
+        except Exception as e:
+            return self._handle_failure(e, call)
+        finally:
+            self._record_call(model, started, call, attempts)
+    
+    async def _stream_request(self, prompt, model="gemini-1.5-flash", outcome=None):
+        """Stream a streamGenerateContent response as text chunks (see GeminiService._stream_request)"""
+        outcome = {} if outcome is None else outcome
+        started, call, attempts = time.monotonic(), self._new_call(), {}
+        try:
+            url, headers, data = self._build_stream_request(prompt, model)
+            await self.limiter.aacquire(model, self._estimate_tokens(prompt))
+            
+            request = self.client.build_request("POST", url, headers=headers, json=data, params={'alt': 'sse'},
+                                                timeout=30)
+            response = await asend_with_retry(
+                lambda: self.client.send(request, stream=True),
+                get_breaker(model),
+                stats=attempts
+            )
+            call['status'] = response.status_code
+            try:
+                if response.status_code != 200:
+                    self._report_status(response.status_code)
+                    return
+                async for line in response.aiter_lines():
+                    for text in self._parse_stream_line(line, call, outcome, started):
+                        yield text
+            finally:
+                await response.aclose()
+        except Exception as e:
+            self._handle_failure(e, call)
+            outcome['error'] = call['status'] if call['status'] in ('circuit_open', 'rate_limited') else str(e)
+        finally:
+            self._record_call(model, started, call, attempts, streamed=True)
+
+
+BATCH_SUCCEEDED = "BATCH_STATE_SUCCEEDED"
+BATCH_FINAL_STATES = {BATCH_SUCCEEDED, "BATCH_STATE_FAILED", "BATCH_STATE_CANCELLED", "BATCH_STATE_EXPIRED"}
+
+
+class StreamIncompleteError(Exception):
+    """A streamed response that ended without finishReason STOP (error, timeout or truncation)"""
+    
+    def __init__(self, model, reason):
+        self.model = model
+        self.reason = reason
+        super().__init__(f"{model} stream ended early ({reason})")
+
+
+class BatchJobError(Exception):
+    """A batch prediction job that failed, was cancelled, expired or timed out"""
+    
+    def __init__(self, name, state):
+        self.name = name
+        self.state = state
+        super().__init__(f"Batch job {name} ended in {state}")
+
+
+class GeminiBatchService(GeminiService):
+    """
+    Offline bulk forensic analysis through Gemini batch prediction.
+    
+    Thousands of prompts are packed into a few batchGenerateContent jobs,
+    which run at a fraction of the interactive cost. Point GEMINI_API_BASE at
+    tools/mock_api_server.py to exercise it locally.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self.api_base = Config.GEMINI_API_BASE
+    
+    def pack(self, items, model="gemini-1.5-pro", language="en"):
+        """Group (key, text) items into inline batch requests within the job size limits"""
+        batch, size = [], 0
+        for key, text in items:
+            _, _, data = self._build_request(FORENSIC_PROMPT.format(text=text, language=language), model)
+            entry = {"request": data, "metadata": {"key": str(key)}}
+            entry_size = len(json.dumps(entry))
+            if batch and (len(batch) >= Config.GEMINI_BATCH_MAX_REQUESTS
+                          or size + entry_size > Config.GEMINI_BATCH_MAX_BYTES):
+                yield batch
+                batch, size = [], 0
+            batch.append(entry)
+            size += entry_size
+        if batch:
+            yield batch
+    
+    def submit(self, requests, model="gemini-1.5-pro", display_name="truthlens-batch"):
+        """Create a batch job from packed requests and return its name (batches/...)"""
+        url = f"{self.api_base}/models/{model}:batchGenerateContent"
+        body = {
+            "batch": {
+                "display_name": display_name,
+                "input_config": {"requests": {"requests": requests}}
+            }
+        }
+        response = send_with_retry(
+            lambda: self.http.post(url, headers=self._headers(), json=body, timeout=120),
+            get_breaker("gemini-batch")  # batch failures must not trip the interactive model breaker
+        )
+        response.raise_for_status()
+        return response.json()["name"]
+    
+    def get_job(self, name):
+        """Fetch the current state of a batch job"""
+        response = send_with_retry(
+            lambda: self.http.get(f"{self.api_base}/{name}", headers=self._headers(), timeout=30),
+            get_breaker("gemini-batch")
+        )
+        response.raise_for_status()
+        return response.json()
+    
+    def wait(self, name, poll_interval=None, timeout=None):
+        """Poll a batch job until it finishes; returns the job or raises BatchJobError"""
+        deadline = time.monotonic() + (timeout or Config.GEMINI_BATCH_TIMEOUT)
+        while True:
+            job = self.get_job(name)
+            state = self._state(job)
+            if state == BATCH_SUCCEEDED:
+                return job
+            if state in BATCH_FINAL_STATES:
+                raise BatchJobError(name, state)
+            if time.monotonic() > deadline:
+                raise BatchJobError(name, "timed out")
+            time.sleep(poll_interval or Config.GEMINI_BATCH_POLL_INTERVAL)
+    
+    def iter_results(self, job):
+        """Yield (key, response text, error) for every request of a finished job"""
+        output = self._output(job)
+        if output.get('responsesFile'):
+            lines = self._download(output['responsesFile'])
+        else:
+            lines = (output.get('inlinedResponses') or {}).get('inlinedResponses', [])
+        
+        for index, line in enumerate(lines):
+            key = (line.get('metadata') or {}).get('key', line.get('key', str(index)))
+            if line.get('error'):
+                yield key, None, line['error'].get('message', str(line['error']))
+                continue
+            response = line.get('response') or {}
+            try:
+                text = self._parse_response(response)
+            except (KeyError, IndexError, TypeError):
+                # Blocked or empty: one bad prompt must not end the whole job's results
+                yield key, None, self._empty_reason(response)
+                continue
+            yield key, text, None
+    
+    def run(self, items, model="gemini-1.5-pro", language="en", poll_interval=None):
+        """
+        Analyze (key, text) items in batch jobs, yielding (key, response text, error)
+        as each job finishes. Successful responses are also written to the response
+        cache, so interactive analyses of the same content are served instantly.
+        
+        If a submission fails, the jobs already submitted are still polled to the
+        end and the submission error is raised afterwards.
+        """
+        texts = {}
+        
+        def remember(pairs):
+            for key, text in pairs:
+                texts[str(key)] = text
+                yield key, text
+        
+        jobs, submit_error = {}, None
+        try:
+            self.submit_all(remember(items), model, language, jobs=jobs)
+        except Exception as e:
+            if not jobs:
+                raise
+            submit_error = e
+            submitted = {key for keys in jobs.values() for key in keys}
+            for key in texts:
+                if key not in submitted:
+                    yield key, None, f"Not submitted: {e}"
+        
+        while jobs:
+            yield from self.poll(jobs, texts, model, language)
+            if jobs:
+                time.sleep(poll_interval or Config.GEMINI_BATCH_POLL_INTERVAL)
+        if submit_error is not None:
+            raise submit_error
+    
+    def submit_all(self, items, model="gemini-1.5-pro", language="en", jobs=None):
+        """
+        Pack (key, text) items into batch jobs and submit them all; returns {job name: [keys]}.
+        
+        Each job is added to jobs (if given) as soon as it is submitted, so the
+        caller still holds the jobs already running when a later submission raises.
+        """
+        jobs = {} if jobs is None else jobs
+        for number, requests in enumerate(self.pack(items, model, language), 1):
+            # Submit every job up front so they run side by side upstream
+            name = self.submit(requests, model, display_name=f"truthlens-batch-{number}")
+            jobs[name] = [entry["metadata"]["key"] for entry in requests]
+        return jobs
+    
+    def poll(self, jobs, texts, model="gemini-1.5-pro", language="en"):
+        """
+        Check each pending job once, without waiting: yields (key, response text, error)
+        for the jobs that finished and removes them from jobs. texts maps keys to their
+        input, so successful responses can be written to the response cache.
+        """
+        for name in list(jobs):
+            job = self.get_job(name)
+            state = self._state(job)
+            if state not in BATCH_FINAL_STATES:
+                continue
+            keys = jobs.pop(name)
+            if state != BATCH_SUCCEEDED:
+                for key in keys:
+                    yield key, None, str(BatchJobError(name, state))
+                continue
+            for key, text, error in self.iter_results(job):
+                if text is not None and key in texts:
+                    self.cache.set(self._cache_key(FORENSIC_PROMPT, texts[key], model, language), text)
+                yield key, text, error
+    
+    def rescore_records(self, records, model="gemini-1.5-pro", language="en", poll_interval=None):
+        """
+        Re-run forensic analysis over stored analysis records (FirebaseService dicts with
+        'id' and 'full_content'), updating each record in place and yielding it when done.
+        """
+        by_id = {str(r['id']): r for r in records if r.get('full_content')}
+        items = ((key, record['full_content']) for key, record in by_id.items())
+        
+        for key, text, error in self.run(items, model, language, poll_interval):
+            record = by_id.get(str(key))
+            if record is not None:
+                yield self._apply_rescore(record, text, error)
+    
+    def submit_records(self, records, model="gemini-1.5-pro", language="en", jobs=None):
+        """
+        Submit re-scoring jobs for stored analysis records; returns {job name: [record ids]} for poll_records.
+        
+        jobs, if given, is filled as each job is submitted (see submit_all).
+        """
+        return self.submit_all(((str(r['id']), r['full_content']) for r in records if r.get('full_content')),
+                               model, language, jobs=jobs)
+    
+    def poll_records(self, jobs, records, model="gemini-1.5-pro", language="en"):
+        """Check submit_records jobs once, yielding each record whose job finished, updated in place"""
+        by_id = {str(r['id']): r for r in records if r.get('full_content')}
+        texts = {key: record['full_content'] for key, record in by_id.items()}
+        for key, text, error in self.poll(jobs, texts, model, language):
+            record = by_id.get(str(key))
+            if record is not None:
+                yield self._apply_rescore(record, text, error)
+    
+    def _apply_rescore(self, record, text, error):
+        if error is not None:
+            record['rescore_error'] = error
+            return record
+        
+        report = self.parse_analysis(text)
+        record['ai_analysis'] = text
+        record['ai_verdict'] = report.verdict.value
+        record['ai_risk_score'] = report_risk(report)
+        if record.get('heuristic_risk_score') is not None:
+            # Combined as in conduct_forensic_analysis: the higher of the local checks and the AI verdict.
+            # Older records lack the local part, so only their ai_risk_score is updated.
+            record['risk_score'] = max(record['heuristic_risk_score'], record['ai_risk_score'])
+            record['threat_level'] = ('HIGH' if record['risk_score'] > 70
+                                      else 'MEDIUM' if record['risk_score'] > 40 else 'LOW')
+        record['rescored_at'] = datetime.now().isoformat()
+        record.pop('rescore_error', None)
+        return record
+    
+    def _headers(self):
+        return {"Content-Type": "application/json", "x-goog-api-key": self.api_key}
+    
+    def _state(self, job):
+        """Batch state, whether the job is returned bare or wrapped in an operation"""
+        return job.get('state') or (job.get('metadata') or {}).get('state') or (
+            BATCH_SUCCEEDED if job.get('done') and not job.get('error') else None)
+    
+    def _empty_reason(self, response):
+        """Why a batch response carries no text (blocked prompt, stopped candidate)"""
+        block = (response.get('promptFeedback') or {}).get('blockReason')
+        if block:
+            return f"Prompt blocked: {block}"
+        finish = next((c.get('finishReason') for c in response.get('candidates') or [] if c.get('finishReason')), None)
+        return f"No text in response (finish reason: {finish})" if finish else "Empty response"
+    
+    def _output(self, job):
+        return (job.get('response') or job.get('output')
+                or (job.get('metadata') or {}).get('output') or {})
+    
+    def _download(self, file_name):
+        """Stream a JSONL responses file line by line"""
+        url = f"{self.api_base.replace('/v1beta', '/download/v1beta')}/{file_name}:download"
+        response = self.http.get(url, headers=self._headers(), params={'alt': 'media'},
+                                 timeout=Config.HTTP_READ_TIMEOUT * 10, stream=True)
+        with response:
+            response.raise_for_status()
+            for line in response.iter_lines(decode_unicode=True):
+                if line:
+                    yield json.loads(line)
 
 
 class FactCheckService:
@@ -223,7 +1276,12 @@ class FactCheckService:
     
     def __init__(self):
         self.api_key = Config.GOOGLE_API_KEY
-        self.base_url = "https://factchecktools.googleapis.com/v1alpha1"
+        self.base_url = Config.FACTCHECK_API_BASE
+        self.http = get_http_client()
+        self.security = SecurityService()
+        self.flights = get_singleflight(FACTCHECK_BREAKER)
+        self.cache = get_response_cache()
+        self.mirror = get_factcheck_mirror() if Config.FACTCHECK_MIRROR else None
     
     def test_connection(self):
         """Test fact check API"""
@@ -233,34 +1291,211 @@ class FactCheckService:
         except:
             return False
     
-    def search_claims(self, query):
-        """Search for fact-checked claims"""
+    def health_check(self):
+        """Liveness probe: a one-result search, bypassing retries and the UI error reporting"""
+        url, params = self._build_search("test")
+        params['pageSize'] = 1
+        response = self.http.get(url, params=params, timeout=Config.HEALTH_CHECK_TIMEOUT)
+        return response.status_code == 200
+    
+    def search_claims(self, query, language="en"):
+        """Search for fact-checked claims (local mirror first, then the cached API)"""
         try:
-            url = f"{self.base_url}/claims:search"
-            params = {
-                'query': query[:100],
-                'key': self.api_key,
-                'languageCode': 'en'
-            }
-            
-            response = requests.get(url, params=params, timeout=15)
+            results, miss = self._lookup(query, language)
+            if miss is None:
+                return results
             
-            if response.status_code == 200:
-                data = response.json()
-                return self._parse_fact_checks(data)
-            else:
-                return []
-                
+            # Sessions searching the same claim at the same time share one call
+            key, url, params = miss
+            results = self.flights.do(key, lambda: self._fetch_and_cache(key, url, params))
+            return results if results is not None else []
         except Exception as e:
-            st.warning(f"Fact check failed: {str(e)}")
+            return self._search_failed(e)
+    
+    def _lookup(self, query, language):
+        """
+        The part of search_claims without API I/O: (results, None) from the local
+        mirror or the cache, where a stale entry also schedules a background
+        refresh, or (None, (key, url, params)) for the search to run on a miss.
+        """
+        url, params = self._build_search(query, language)
+        local = self._mirror_search(params)
+        if local:
+            return local, None
+        
+        key = self._flight_key(params)
+        cached = self._cached_claims(key)
+        if cached is None:
+            return None, (key, url, params)
+        results, fresh = cached
+        if not fresh:
+            self._refresh_in_background(key, url, params)
+        return results, None
+    
+    def _search_failed(self, error):
+        """No fact checks for a failed search; warn unless the API circuit is open"""
+        # Fact checks are optional, skip them quietly while the API is failing
+        if not isinstance(error, CircuitOpenError):
+            st.warning(f"Fact check failed: {str(error)}")
+        return []
+    
+    def search_text_claims(self, text, language="en", deadline=None):
+        """
+        Fact checks for every check-worthy claim in text, searched concurrently.
+        
+        Claims come from extract_claims (the text itself when none qualify); each
+        is searched through search_claims, so the cache and coalescing apply.
+        Reviews are merged in claim order and deduplicated by URL; claims that
+        miss the deadline are left out.
+        """
+        claims = extract_claims(text, Config.FACTCHECK_MAX_CLAIMS) or [text]
+        deadline = deadline or Config.PIPELINE_STAGE_DEADLINES['fact_checks']
+        stages = {
+            i: (lambda claim=claim: self.search_claims(claim, language), deadline)
+            for i, claim in enumerate(claims)
+        }
+        
+        # A dedicated pool: this already runs on a shared pipeline worker
+        executor = ThreadPoolExecutor(max_workers=Config.FACTCHECK_PARALLELISM,
+                                      thread_name_prefix="truthlens-factcheck")
+        try:
+            results, _ = run_stages(stages, executor=executor)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        return merge_fact_checks(claims, [results.get(i) for i in range(len(claims))])
+    
+    def _fetch_claims(self, url, params):
+        """Run a claims:search call and parse its results (None if the API did not answer 200)"""
+        response = send_with_retry(
+            lambda: self.http.get(url, params=params, timeout=15),
+            get_breaker(FACTCHECK_BREAKER)
+        )
+        return self._handle_search_response(response, params)
+    
+    def _handle_search_response(self, response, params):
+        """Parsed fact checks of a claims:search response (None unless it answered 200)"""
+        if response.status_code != 200:
+            return None
+        data = response.json()
+        self._harvest(data, params)
+        return self._parse_fact_checks(data)
+    
+    def iter_claim_pages(self, query, language="en", page_token=None, max_age_days=None):
+        """Yield (raw claims, nextPageToken) for each page of a claims:search, for mirror syncs"""
+        url, params = self._build_search(query, language)
+        params['pageSize'] = Config.FACTCHECK_MIRROR_PAGE_SIZE
+        if max_age_days:
+            params['maxAgeDays'] = max_age_days
+        
+        while True:
+            if page_token:
+                params['pageToken'] = page_token
+            response = send_with_retry(
+                lambda: self.http.get(url, params=params, timeout=15),
+                get_breaker(FACTCHECK_BREAKER)
+            )
+            response.raise_for_status()
+            data = response.json()
+            page_token = data.get('nextPageToken')
+            yield data.get('claims', []), page_token
+            if not page_token:
+                return
+    
+    def sync_mirror(self, queries=None, language="en", max_pages=None):
+        """Harvest reviews for the seed queries into the local mirror; returns reviews written"""
+        if self.mirror is None:
+            return 0
+        return self.mirror.sync(self.iter_claim_pages, queries or Config.FACTCHECK_MIRROR_SEED_QUERIES,
+                                language, max_pages)
+    
+    def _mirror_search(self, params):
+        if self.mirror is None:
             return []
+        try:
+            return self.mirror.search(params['query'], params['languageCode'])
+        except Exception:
+            return []  # the API still answers
+    
+    def _harvest(self, data, params):
+        """Keep the reviews of a live search in the local mirror"""
+        if self.mirror is None:
+            return
+        try:
+            self.mirror.upsert(data.get('claims', []), params['languageCode'])
+        except Exception:
+            pass
+    
+    def _fetch_and_cache(self, key, url, params):
+        results = self._fetch_claims(url, params)
+        if results is not None:
+            self._store_claims(key, results)
+        return results
+    
+    def _cached_claims(self, key):
+        """(results, is_fresh) for a cached search, or None on miss"""
+        entry = self.cache.get(self.cache.make_key("factcheck", key))
+        if entry is None:
+            return None
+        return entry['results'], entry['fresh_until'] > time.time()
+    
+    def _store_claims(self, key, results):
+        # Claims nobody has fact-checked yet may be soon, so empty results expire sooner
+        ttl = Config.FACTCHECK_CACHE_TTL if results else Config.FACTCHECK_NEGATIVE_TTL
+        self.cache.set(
+            self.cache.make_key("factcheck", key),
+            {'results': results, 'fresh_until': time.time() + ttl},
+            ttl=ttl + Config.FACTCHECK_STALE_TTL
+        )
+    
+    def _refresh_in_background(self, key, url, params):
+        """Re-run a stale search off the request path, once per key at a time"""
+        if not self._claim_refresh(key):
+            return
+        
+        def refresh():
+            try:
+                self.flights.do(key, lambda: self._fetch_and_cache(key, url, params))
+            except Exception:
+                pass  # keep serving the stale entry, the next lookup tries again
+            finally:
+                self._release_refresh(key)
+        
+        threading.Thread(target=refresh, name="factcheck-refresh", daemon=True).start()
+    
+    def _claim_refresh(self, key):
+        """Mark a search as being refreshed; False if a refresh of it is already running"""
+        with _factcheck_refresh_lock:
+            if key in _factcheck_refreshing:
+                return False
+            _factcheck_refreshing.add(key)
+            return True
+    
+    def _release_refresh(self, key):
+        with _factcheck_refresh_lock:
+            _factcheck_refreshing.discard(key)
+    
+    def _flight_key(self, params):
+        """Coalescing and cache key of a search: normalized query hash plus language"""
+        # Claim search is case-insensitive, so differently cased queries share an entry
+        content_hash = self.security.hash_content(self.security.normalize_content(params['query']).casefold())
+        return f"{content_hash}:{params['languageCode']}"
+    
+    def _build_search(self, query, language="en"):
+        """Build the URL and query parameters of a claims:search call"""
+        url = f"{self.base_url}/claims:search"
+        params = {
+            'query': query[:100],
+            'key': self.api_key,
+            'languageCode': language
+        }
+        return url, params
     
     def _parse_fact_checks(self, data):
         """Parse fact check response"""
         results = []
         
         if 'claims' in data:
-            for claim in data['claims'][:5]:
+            for claim in data['claims'][:Config.FACTCHECK_RESULTS_PER_CLAIM]:
                 for review in claim.get('claimReview', []):
                     results.append({
                         'title': review.get('title', 'No title'),
@@ -271,3 +1506,100 @@ class FactCheckService:
                     })
         
         return results
+
+
+class AsyncFactCheckService(FactCheckService):
+    """Asyncio Fact Check Tools client with the same public methods as FactCheckService"""
+    
+    def __init__(self, client=None):
+        super().__init__()
+        self._client = client
+        self._refresh_tasks = set()
+    
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = create_async_http_client()
+        return self._client
+    
+    async def aclose(self):
+        """Close the underlying connection pool"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+    
+    async def _fetch_claims(self, url, params):
+        """Run a claims:search call and parse its results (None if the API did not answer 200)"""
+        response = await asend_with_retry(
+            lambda: self.client.get(url, params=params, timeout=15),
+            get_breaker(FACTCHECK_BREAKER)
+        )
+        return self._handle_search_response(response, params)
+    
+    async def _fetch_and_cache(self, key, url, params):
+        results = await self._fetch_claims(url, params)
+        if results is not None:
+            self._store_claims(key, results)
+        return results
+    
+    def _refresh_in_background(self, key, url, params):
+        """Re-run a stale search as a task on the running loop, once per key at a time"""
+        if not self._claim_refresh(key):
+            return
+        
+        async def refresh():
+            try:
+                await self.flights.ado(key, lambda: self._fetch_and_cache(key, url, params))
+            except Exception:
+                pass  # keep serving the stale entry, the next lookup tries again
+            finally:
+                self._release_refresh(key)
+                self._refresh_tasks.discard(task)
+        
+        # Keep a reference so the task is not garbage collected mid-flight
+        task = asyncio.ensure_future(refresh())
+        self._refresh_tasks.add(task)
+    
+    async def test_connection(self):
+        """Test fact check API"""
+        try:
+            await self.search_claims("test")
+            return True
+        except Exception:
+            return False
+    
+    async def search_text_claims(self, text, language="en", deadline=None):
+        """Fact checks for every check-worthy claim in text, searched concurrently"""
+        claims = extract_claims(text, Config.FACTCHECK_MAX_CLAIMS) or [text]
+        deadline = deadline or Config.PIPELINE_STAGE_DEADLINES['fact_checks']
+        semaphore = asyncio.Semaphore(Config.FACTCHECK_PARALLELISM)
+        
+        async def search(claim):
+            async with semaphore:
+                return await self.search_claims(claim, language)
+        
+        tasks = [asyncio.ensure_future(search(claim)) for claim in claims]
+        done, pending = await asyncio.wait(tasks, timeout=deadline)
+        for task in pending:
+            task.cancel()
+        results = [task.result() if task in done and not task.exception() else None for task in tasks]
+        return merge_fact_checks(claims, results)
+    
+    async def search_claims(self, query, language="en"):
+        """Search for fact-checked claims (local mirror first, then the cached API)"""
+        try:
+            results, miss = self._lookup(query, language)
+            if miss is None:
+                return results
+            
+            key, url, params = miss
+            results = await self.flights.ado(key, lambda: self._fetch_and_cache(key, url, params))
+            return results if results is not None else []
+        except Exception as e:
+            return self._search_failed(e)
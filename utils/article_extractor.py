@@ -0,0 +1,111 @@
+import re
+
+from bs4 import BeautifulSoup
+
+# Elements that never hold article body text
+_BOILERPLATE_TAGS = ("script", "style", "noscript", "template", "iframe", "svg", "canvas", "form", "button",
+                     "select", "nav", "header", "footer", "aside", "menu")
+# class/id fragments of page chrome, and of containers that usually hold the story
+_NEGATIVE = re.compile(r"comment|share|social|related|recommend|promo|advert|\bads?\b|sponsor|cookie|consent|"
+                       r"newsletter|subscribe|signup|sidebar|footer|masthead|menu|\bnav|breadcrumb|byline|"
+                       r"caption|popup|modal|paywall|outbrain|taboola", re.IGNORECASE)
+_POSITIVE = re.compile(r"article|story|body|content|entry|post|main|text", re.IGNORECASE)
+_BLOCKS = ("p", "h2", "h3", "h4", "blockquote", "pre", "li")
+_WHITESPACE = re.compile(r"\s+")
+
+MIN_PARAGRAPH_CHARS = 40
+
+
+def _text(tag):
+    return _WHITESPACE.sub(" ", tag.get_text(" ")).strip()
+
+
+def _link_density(tag, text):
+    """Share of a tag's text that sits inside links"""
+    linked = sum(len(_text(a)) for a in tag.find_all("a"))
+    return linked / max(len(text), 1)
+
+
+def _class_weight(tag):
+    names = " ".join(tag.get("class") or []) + " " + (tag.get("id") or "")
+    weight = 0
+    if _NEGATIVE.search(names):
+        weight -= 25
+    if _POSITIVE.search(names):
+        weight += 25
+    return weight
+
+
+def _meta(soup, *names):
+    for name in names:
+        tag = soup.find("meta", attrs={"property": name}) or soup.find("meta", attrs={"name": name})
+        if tag and tag.get("content"):
+            return tag["content"].strip()
+    return None
+
+
+def extract_article(html, encoding=None):
+    """
+    Main body text and metadata of an HTML article page.
+
+    Page chrome (navigation, headers, share bars, comments, ads) is removed,
+    then paragraphs are scored onto their parent containers by length, link
+    density and class names, and the text of the best container is kept.
+    Returns {'title', 'site_name', 'published_at', 'text'}.
+    """
+    soup = BeautifulSoup(html, "html.parser", from_encoding=encoding)
+    title = _meta(soup, "og:title", "twitter:title")
+    if not title and soup.title:
+        title = _text(soup.title)
+    article = {
+        'title': title or None,
+        'site_name': _meta(soup, "og:site_name", "application-name"),
+        'published_at': _meta(soup, "article:published_time", "datePublished", "date", "pubdate"),
+        'text': ""
+    }
+
+    for tag in soup.find_all(_BOILERPLATE_TAGS):
+        tag.decompose()
+    for tag in soup.find_all(True):
+        if tag.decomposed or tag.name in ("html", "body", "article", "main"):
+            continue
+        if _class_weight(tag) < 0:
+            tag.decompose()
+
+    # Each paragraph credits its container, and half as much the container's parent
+    scores = {}
+    for paragraph in soup.find_all("p"):
+        text = _text(paragraph)
+        if len(text) < MIN_PARAGRAPH_CHARS:
+            continue
+        points = 1 + text.count(",") + min(len(text) // 100, 3)
+        for parent, share in ((paragraph.parent, 1.0), (paragraph.parent and paragraph.parent.parent, 0.5)):
+            if parent is None or parent.name == "[document]":
+                continue
+            if id(parent) not in scores:
+                base = 25 if parent.name in ("article", "main") else _class_weight(parent)
+                scores[id(parent)] = [parent, base]
+            scores[id(parent)][1] += points * share
+
+    if scores:
+        container = max(scores.values(), key=lambda item: item[1] * (1 - _link_density(item[0], _text(item[0]))))[0]
+        paragraphs = []
+        for block in container.find_all(_BLOCKS):
+            # Nested blocks (a <p> inside an <li>) are read through their outermost block
+            outer = block.find_parent(_BLOCKS)
+            if outer is not None and any(parent is container for parent in outer.parents):
+                continue
+            text = _text(block)
+            if not text or _link_density(block, text) > 0.5:
+                continue
+            if block.name in ("p", "li", "blockquote", "pre") and len(text) < MIN_PARAGRAPH_CHARS // 2:
+                continue
+            paragraphs.append(text)
+        article['text'] = "\n\n".join(paragraphs)
+
+    if not article['text']:
+        # No paragraph markup: keep the longer lines of whatever text is left
+        body = soup.body or soup
+        lines = (_WHITESPACE.sub(" ", line).strip() for line in body.get_text("\n").splitlines())
+        article['text'] = "\n\n".join(line for line in lines if len(line) >= MIN_PARAGRAPH_CHARS)
+    return article
@@ -0,0 +1,191 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from config import Config
+from utils.news_dedupe import canonical_url
+
+
+class ArticleStore:
+    """
+    Local SQLite store of ingested news articles with per-feed polling cursors.
+
+    Articles are kept once per canonical URL and numbered in ingestion order,
+    so downstream consumers (the trending engine) can read only what arrived
+    after the last id they saw. Date-sorted feeds (searches) are polled past a
+    publishedAt cursor; ranked feeds (headlines) by the URLs already listed.
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path or Config.NEWS_STORE_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA foreign_keys=ON")
+        self._create_schema()
+        self._pruned_at = 0.0
+
+    def _create_schema(self):
+        with self._lock, self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS articles (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    canonical_url TEXT UNIQUE NOT NULL,
+                    provider TEXT,
+                    published_at TEXT,
+                    ingested_at REAL NOT NULL,
+                    article TEXT NOT NULL
+                )
+            """)
+            # An article can belong to several feeds (a headline that also matches a search)
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS feed_articles (
+                    feed TEXT NOT NULL,
+                    article_id INTEGER NOT NULL REFERENCES articles (id) ON DELETE CASCADE,
+                    PRIMARY KEY (feed, article_id)
+                )
+            """)
+            self._db.execute("CREATE INDEX IF NOT EXISTS articles_published ON articles (published_at)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS articles_ingested ON articles (ingested_at)")
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS cursors (
+                    feed TEXT PRIMARY KEY,
+                    high_water TEXT,
+                    seen TEXT NOT NULL DEFAULT '[]',
+                    polled_at REAL
+                )
+            """)
+
+    def cursor(self, feed):
+        """(high-water publishedAt, canonical URLs seen at exactly that time) of a feed"""
+        with self._lock:
+            row = self._db.execute("SELECT high_water, seen FROM cursors WHERE feed = ?", (feed,)).fetchone()
+        if row is None:
+            return None, set()
+        return row['high_water'], set(json.loads(row['seen']))
+
+    def known(self, feed, articles):
+        """Store ids of the given articles already listed under a feed, by canonical URL"""
+        urls = [url for url in (canonical_url(article.get('url')) for article in articles) if url]
+        if not urls:
+            return {}
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT a.canonical_url, a.id FROM articles a JOIN feed_articles f ON f.article_id = a.id "
+                f"WHERE f.feed = ? AND a.canonical_url IN ({','.join('?' * len(urls))})",
+                (feed, *urls)
+            ).fetchall()
+        return {row['canonical_url']: row['id'] for row in rows}
+
+    def is_new(self, feed, article, cursor=None):
+        """Whether an article is past the high-water mark of a date-sorted feed"""
+        high_water, seen = cursor or self.cursor(feed)
+        published = article.get('publishedAt') or ""
+        if not published:
+            return True  # undated articles have no place in the order; ingest skips stored ones
+        if high_water is None or published > high_water:
+            return True
+        return published == high_water and canonical_url(article.get('url')) not in seen
+
+    def ingest(self, feed, articles):
+        """
+        Append the articles not stored yet and advance the feed's cursor.
+
+        Returns the articles new to the store (not just to this feed), each with its store 'id'.
+        """
+        added, now = [], time.time()
+        high_water, seen = self.cursor(feed)
+
+        with self._lock, self._db:
+            for article in articles:
+                url = canonical_url(article.get('url'))
+                if not url:
+                    continue
+                published = article.get('publishedAt') or ""
+                if high_water is None or published > high_water:
+                    high_water, seen = published, set()
+                if published == high_water:
+                    seen.add(url)
+
+                cursor = self._db.execute(
+                    "INSERT OR IGNORE INTO articles (canonical_url, provider, published_at, ingested_at, article) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (url, article.get('provider'), published, now, json.dumps(article))
+                )
+                if cursor.rowcount:
+                    article_id = cursor.lastrowid
+                    added.append(dict(article, id=article_id))
+                else:
+                    article_id = self._db.execute(
+                        "SELECT id FROM articles WHERE canonical_url = ?", (url,)
+                    ).fetchone()['id']
+                self._db.execute("INSERT OR IGNORE INTO feed_articles (feed, article_id) VALUES (?, ?)",
+                                 (feed, article_id))
+
+            self._db.execute("""
+                INSERT INTO cursors (feed, high_water, seen, polled_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT(feed) DO UPDATE SET
+                    high_water=excluded.high_water, seen=excluded.seen, polled_at=excluded.polled_at
+            """, (feed, high_water, json.dumps(sorted(seen)), now))
+
+        if now - self._pruned_at > 3600:
+            self._pruned_at = now
+            self.prune()
+        return added
+
+    def latest(self, feeds, limit=30):
+        """Most recently published articles of the given feeds"""
+        feeds = [feeds] if isinstance(feeds, str) else list(feeds)
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT DISTINCT a.id, a.article, a.published_at FROM articles a "
+                "JOIN feed_articles f ON f.article_id = a.id "
+                f"WHERE f.feed IN ({','.join('?' * len(feeds))}) "
+                "ORDER BY a.published_at DESC, a.id DESC LIMIT ?",
+                (*feeds, limit)
+            ).fetchall()
+        return [dict(json.loads(row['article']), id=row['id']) for row in rows]
+
+    def read_after(self, last_id, since=None, limit=None):
+        """
+        Articles with a store id above last_id (optionally ingested since a timestamp), oldest first.
+
+        Readers keep their own last_id, so an in-memory reader starts over after a restart.
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, article FROM articles WHERE id > ? AND ingested_at >= ? ORDER BY id LIMIT ?",
+                (last_id, since or 0, limit or -1)
+            ).fetchall()
+        return [dict(json.loads(row['article']), id=row['id']) for row in rows]
+
+    def prune(self, max_age_days=None):
+        """Drop articles ingested more than max_age_days ago; returns how many"""
+        max_age_days = max_age_days or Config.NEWS_STORE_RETENTION_DAYS
+        with self._lock, self._db:
+            cursor = self._db.execute("DELETE FROM articles WHERE ingested_at < ?",
+                                      (time.time() - max_age_days * 86400,))
+        return cursor.rowcount
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_article_store():
+    """Get the process-wide local news article store"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ArticleStore()
+    return _store
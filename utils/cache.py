@@ -0,0 +1,213 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from config import Config
+
+
+def prompt_version(template):
+    """Short fingerprint of a prompt template, changes whenever the template does"""
+    return hashlib.sha256(template.encode()).hexdigest()[:12]
+
+
+class ResponseCache:
+    """
+    Two-tier response cache: in-memory LRU in front of a JSON store on disk.
+
+    The memory tier is bounded by entry count and by serialized size, so a few
+    large values (fetched article text) cannot crowd out many small analyses.
+    Each disk file's mtime is its expiry time, so eviction only needs stat().
+    """
+
+    def __init__(self, cache_dir=None, max_memory_entries=None, max_disk_entries=None, ttl=None,
+                 max_memory_bytes=None):
+        self.cache_dir = Path(cache_dir or Config.CACHE_DIR)
+        self.max_memory_entries = max_memory_entries or Config.CACHE_MEMORY_ENTRIES
+        self.max_memory_bytes = max_memory_bytes or Config.CACHE_MEMORY_BYTES
+        self.max_disk_entries = max_disk_entries or Config.CACHE_DISK_ENTRIES
+        self.ttl = Config.CACHE_TTL if ttl is None else ttl
+
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._disk_count = None
+        self._evicting = False
+
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+
+    def make_key(self, *parts):
+        """Build a cache key from its components"""
+        return hashlib.sha256("|".join(str(p) for p in parts).encode()).hexdigest()
+
+    def get(self, key):
+        """Get a cached value, or None on miss or expiry"""
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry:
+                if entry[0] > now:
+                    self._memory.move_to_end(key)
+                    self.stats['memory_hits'] += 1
+                    return entry[1]
+                self._forget(key)
+
+        entry, size = self._read_disk(key)
+        if entry and entry['expires_at'] > now:
+            self._remember(key, entry['value'], entry['expires_at'], size)
+            with self._lock:
+                self.stats['disk_hits'] += 1
+            return entry['value']
+
+        if entry:
+            self._delete_disk(key)
+        with self._lock:
+            self.stats['misses'] += 1
+        return None
+
+    def set(self, key, value, ttl=None):
+        """Store a JSON-serializable value in both tiers"""
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        try:
+            payload = json.dumps({'expires_at': expires_at, 'value': value})
+        except TypeError:
+            return
+        self._remember(key, value, expires_at, len(payload))
+        self._write_disk(key, payload, expires_at)
+
+    def delete(self, key):
+        """Drop one entry from both tiers"""
+        with self._lock:
+            self._forget(key)
+        self._delete_disk(key)
+
+    def clear(self):
+        """Drop every cached entry"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            for path in self._disk_files():
+                path.unlink(missing_ok=True)
+            self._disk_count = 0
+
+    def _remember(self, key, value, expires_at, size):
+        """Insert into the memory tier, evicting the least recently used entries past either bound"""
+        with self._lock:
+            self._forget(key)
+            self._memory[key] = (expires_at, value, size)
+            self._memory_bytes += size
+            # A value larger than the whole byte budget ends up on disk only
+            while self._memory and (len(self._memory) > self.max_memory_entries
+                                    or self._memory_bytes > self.max_memory_bytes):
+                _, (_, _, evicted) = self._memory.popitem(last=False)
+                self._memory_bytes -= evicted
+
+    def _forget(self, key):
+        """Drop one memory entry (caller holds the lock)"""
+        entry = self._memory.pop(key, None)
+        if entry:
+            self._memory_bytes -= entry[2]
+
+    def _path(self, key):
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _disk_files(self):
+        if not self.cache_dir.exists():
+            return []
+        return list(self.cache_dir.glob("*/*.json"))
+
+    def _read_disk(self, key):
+        """(entry, serialized size) from disk, or (None, 0)"""
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                payload = f.read()
+            return json.loads(payload), len(payload)
+        except (OSError, ValueError):
+            return None, 0
+
+    def _write_disk(self, key, payload, expires_at):
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            is_new = not path.exists()
+            tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(payload)
+            # The expiry doubles as the mtime, so eviction can tell expired files apart with stat()
+            os.utime(tmp_path, (expires_at, expires_at))
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+
+        with self._lock:
+            if self._disk_count is None:
+                self._disk_count = len(self._disk_files())
+            elif is_new:
+                self._disk_count += 1
+            evict = self._disk_count > self.max_disk_entries and not self._evicting
+            if evict:
+                self._evicting = True
+        if evict:
+            # Outside the lock: other threads keep reading and writing during the scan
+            try:
+                self._evict_disk()
+            finally:
+                with self._lock:
+                    self._evicting = False
+
+    def _delete_disk(self, key):
+        try:
+            self._path(key).unlink()
+            with self._lock:
+                if self._disk_count:
+                    self._disk_count -= 1
+        except OSError:
+            pass
+
+    def _evict_disk(self):
+        """Remove expired entries, then those closest to expiry, down to 90% of the bound"""
+        now = time.time()
+        files = []
+        for path in self._disk_files():
+            try:
+                files.append((path.stat().st_mtime, path))
+            except OSError:
+                continue
+
+        removed = 0
+        survivors = []
+        for expires_at, path in files:
+            if expires_at <= now:
+                path.unlink(missing_ok=True)
+                removed += 1
+            else:
+                survivors.append((expires_at, path))
+
+        survivors.sort()
+        target = int(self.max_disk_entries * 0.9)
+        while len(survivors) > target:
+            _, path = survivors.pop(0)
+            path.unlink(missing_ok=True)
+            removed += 1
+
+        with self._lock:
+            # Files written during the scan were counted by their writers
+            self._disk_count = max(0, self._disk_count - removed)
+
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """Get the process-wide AI response cache"""
+    global _response_cache
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = ResponseCache()
+    return _response_cache
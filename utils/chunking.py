@@ -0,0 +1,72 @@
+import re
+
+# Sentence ends at . ! ? (optionally followed by closing quotes/brackets) and whitespace
+_SENTENCE_END = re.compile(r"(?<=[.!?])[\"')\]]*\s+")
+
+# Gemini tokenizes English at roughly four characters per token
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text):
+    """Rough token count of text, good enough for budgeting prompts"""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def split_sentences(text):
+    """Split text into sentences, keeping their punctuation"""
+    sentences, start = [], 0
+    for match in _SENTENCE_END.finditer(text):
+        sentences.append(text[start:match.end()].strip())
+        start = match.end()
+    tail = text[start:].strip()
+    if tail:
+        sentences.append(tail)
+    return [s for s in sentences if s]
+
+
+def _split_long_sentence(sentence, max_chars):
+    """Break a sentence longer than the budget on word boundaries"""
+    pieces, current = [], []
+    size = 0
+    words = [w[i:i + max_chars] for w in sentence.split() for i in range(0, len(w), max_chars)]
+    for word in words:
+        if current and size + len(word) + 1 > max_chars:
+            pieces.append(" ".join(current))
+            current, size = [], 0
+        current.append(word)
+        size += len(word) + 1
+    if current:
+        pieces.append(" ".join(current))
+    return pieces
+
+
+def chunk_text(text, max_tokens, overlap_sentences=1):
+    """
+    Split text into chunks of at most max_tokens, on sentence boundaries.
+
+    The last overlap_sentences of each chunk are repeated at the start of the
+    next one, so a claim straddling a boundary is seen whole at least once.
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    sentences = []
+    for sentence in split_sentences(text or ""):
+        if len(sentence) > max_chars:
+            sentences.extend(_split_long_sentence(sentence, max_chars))
+        else:
+            sentences.append(sentence)
+
+    chunks, current = [], []
+    size = 0
+    for sentence in sentences:
+        if current and size + len(sentence) + 1 > max_chars:
+            chunks.append(" ".join(current))
+            current = current[-overlap_sentences:] if overlap_sentences else []
+            size = sum(len(s) + 1 for s in current)
+            # Drop the overlap if it would not leave room for the next sentence
+            if size + len(sentence) + 1 > max_chars:
+                current, size = [], 0
+        current.append(sentence)
+        size += len(sentence) + 1
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
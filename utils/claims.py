@@ -0,0 +1,65 @@
+import re
+
+from utils.chunking import split_sentences
+
+# Fact Check Tools truncates long queries; claims are cut on a word boundary below this
+MAX_QUERY_CHARS = 100
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+_NUMBER = re.compile(r"\d")
+# A capitalized word that does not open the sentence: a name, place or organization
+_PROPER_NOUN = re.compile(r"(?<!^)(?<![.!?]\s)\b[A-Z][\w'-]+")
+_CLAIM_CUES = re.compile(
+    r"\b(is|are|was|were|has|have|had|will|causes?|caused|kills?|killed|cures?|proves?|proved|"
+    r"shows?|showed|confirm(?:s|ed)?|reveal(?:s|ed)?|according|study|studies|report(?:s|ed)?|"
+    r"percent|million|billion|government|officials?|scientists?|doctors?)\b",
+    re.IGNORECASE
+)
+# Calls to action and opinions rarely match a fact check
+_NOT_CLAIMS = re.compile(
+    r"^\s*(share|forward|please|click|subscribe|follow|like|retweet|comment|watch|read)\b|"
+    r"\b(i think|i feel|in my opinion|imo)\b",
+    re.IGNORECASE
+)
+
+
+def claim_score(sentence):
+    """How check-worthy a sentence is: factual cues, numbers and named entities score higher"""
+    words = _WORD.findall(sentence)
+    if len(words) < 5 or sentence.rstrip().endswith("?") or _NOT_CLAIMS.search(sentence):
+        return 0
+    score = len(_CLAIM_CUES.findall(sentence))
+    score += 2 * bool(_NUMBER.search(sentence))
+    score += min(3, len(_PROPER_NOUN.findall(sentence)))
+    if len(words) > 60:
+        score -= 1  # run-on text, likely boilerplate rather than one claim
+    return score
+
+
+def to_query(sentence, max_chars=MAX_QUERY_CHARS):
+    """Shorten a claim to a search query, cutting on a word boundary"""
+    sentence = " ".join(sentence.split()).strip("\"'“”‘’ ")
+    if len(sentence) <= max_chars:
+        return sentence
+    cut = sentence[:max_chars].rsplit(" ", 1)[0]
+    return cut or sentence[:max_chars]
+
+
+def extract_claims(text, max_claims=8):
+    """
+    Check-worthy sentences of text as search queries, best first.
+
+    Sentences without a factual cue are skipped, and near-identical claims
+    (same words ignoring case and punctuation) are kept once.
+    """
+    scored, seen = [], set()
+    for position, sentence in enumerate(split_sentences(text or "")):
+        score = claim_score(sentence)
+        if score <= 0:
+            continue
+        fingerprint = " ".join(_WORD.findall(sentence.casefold()))
+        if fingerprint in seen:
+            continue
+        seen.add(fingerprint)
+        scored.append((-score, position, to_query(sentence)))
+    return [query for _, _, query in sorted(scored)[:max_claims]]
@@ -0,0 +1,107 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from config import Config
+
+try:
+    from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+except ImportError:  # Older/newer Streamlit layouts, or running outside Streamlit
+    add_script_run_ctx = None
+    get_script_run_ctx = None
+
+
+class StageTimeout(TimeoutError):
+    """Raised for a pipeline stage that missed its deadline"""
+
+    def __init__(self, stage, deadline):
+        super().__init__(f"{stage} did not finish within {deadline:g}s")
+        self.stage = stage
+        self.deadline = deadline
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Get the process-wide bounded executor for pipeline stages"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=Config.PIPELINE_MAX_WORKERS,
+                    thread_name_prefix="truthlens-stage"
+                )
+    return _executor
+
+
+def _bind_script_context(fn):
+    """Let a worker thread use the calling session's st.* elements"""
+    ctx = get_script_run_ctx() if get_script_run_ctx else None
+    if ctx is None:
+        return fn
+
+    def _run():
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return fn()
+    return _run
+
+
+def run_stages(stages, on_result=None, executor=None):
+    """
+    Run independent stages concurrently, each with its own deadline.
+
+    Parameters:
+    - stages: dict of name -> (zero-argument callable, deadline in seconds)
+    - on_result: optional callback(name, value, error) called in the caller's
+      thread as each stage finishes, fails or times out
+    - executor: executor to use (default: the shared bounded executor)
+
+    Returns:
+    - (results, errors) dicts keyed by stage name
+    """
+    executor = executor or get_executor()
+    started = time.monotonic()
+
+    futures = {}
+    for name, (fn, deadline) in stages.items():
+        future = executor.submit(_bind_script_context(fn))
+        futures[future] = (name, started + deadline, deadline)
+
+    results, errors = {}, {}
+
+    def _finish(name, value=None, error=None):
+        if error is None:
+            results[name] = value
+        else:
+            errors[name] = error
+        if on_result:
+            on_result(name, value, error)
+
+    pending = set(futures)
+    while pending:
+        next_deadline = min(futures[f][1] for f in pending)
+        done, pending = wait(
+            pending,
+            timeout=max(0, next_deadline - time.monotonic()),
+            return_when=FIRST_COMPLETED
+        )
+
+        for future in done:
+            name = futures[future][0]
+            try:
+                _finish(name, value=future.result())
+            except Exception as e:
+                _finish(name, error=e)
+
+        now = time.monotonic()
+        for future in [f for f in pending if futures[f][1] <= now]:
+            name, _, deadline = futures[future]
+            # The worker cannot be interrupted; it finishes in the background
+            future.cancel()
+            pending.discard(future)
+            _finish(name, error=StageTimeout(name, deadline))
+
+    return results, errors
@@ -2,6 +2,9 @@ import streamlit as st
 from datetime import datetime, timedelta
 import uuid
 import random
+from config import Config
+from utils.near_duplicate import get_near_duplicate_index
+from utils.response_parser import Verdict
 
 class FirebaseService:
     """Firebase database service simulation"""
@@ -36,6 +39,7 @@ class FirebaseService:
                 'content_preview': content[:100] + "..." if len(content) > 100 else content,
                 'full_content': content,
                 'risk_score': results['risk_score'],
+                'heuristic_risk_score': results.get('heuristic_risk_score'),
                 'credibility_score': results['credibility_score'],
                 'threat_level': 'HIGH' if results['risk_score'] > 70 else 'MEDIUM' if results['risk_score'] > 40 else 'LOW',
                 'manipulation_tactics': results['manipulation_tactics'],
@@ -44,6 +48,7 @@ class FirebaseService:
             }
             
             st.session_state.firebase_data['analyses'].append(analysis_record)
+            self._index_near_duplicate(analysis_id, content, results)
             
             # Update statistics
             st.session_state.firebase_data['statistics']['analyzed_today'] += 1
@@ -56,6 +61,29 @@ class FirebaseService:
             st.error(f"Database error: {str(e)}")
             return None
     
+    def _index_near_duplicate(self, analysis_id, content, results):
+        """Make a fresh AI verdict reusable for near-duplicate submissions"""
+        if not results.get('ai_report') or results.get('near_duplicate'):
+            return
+        # A failed or unparseable call must not become the verdict of every near-duplicate
+        ai_analysis = results.get('ai_analysis')
+        if not isinstance(ai_analysis, str) or not ai_analysis.strip() or results['ai_report'].verdict == Verdict.UNKNOWN:
+            return
+        if len(content) > Config.LONG_DOCUMENT_CHARS:
+            return
+        
+        def usable(section):
+            value = results.get(section)
+            return value if value and "unavailable" not in value[:40] else None
+        
+        get_near_duplicate_index().add(content, {
+            'analysis_id': analysis_id,
+            'language': results.get('language'),
+            'ai_analysis': results['ai_analysis'],
+            'origin_analysis': usable('origin_analysis'),
+            'context_analysis': usable('context_analysis')
+        })
+    
     def save_image_analysis(self, image_name, results):
         """Save image analysis results"""
         try:
@@ -0,0 +1,242 @@
+import math
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from config import Config
+from utils.trending import STOPWORDS
+
+_TERM = re.compile(r"\w{3,}", re.UNICODE)
+
+
+def query_terms(text):
+    """Distinct content terms of text (casefolded, stopwords dropped), in order"""
+    return list(dict.fromkeys(term for term in _TERM.findall((text or "").casefold()) if term not in STOPWORDS))
+
+
+class FactCheckMirror:
+    """
+    Local SQLite mirror of ClaimReview data with a full-text index over claims.
+
+    Reviews harvested from Fact Check Tools (by live searches or sync()) are
+    stored once per review URL. Lookups use FTS5 when the SQLite build has it,
+    and a LIKE scan otherwise.
+    """
+
+    def __init__(self, path=None, min_match=None):
+        self.path = Path(path or Config.FACTCHECK_MIRROR_PATH)
+        self.min_match = min_match if min_match is not None else Config.FACTCHECK_MIRROR_MIN_MATCH
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self.fts = self._create_schema()
+        self.stats = {'hits': 0, 'misses': 0, 'stored': 0}
+
+    def _create_schema(self):
+        with self._lock, self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS reviews (
+                    id INTEGER PRIMARY KEY,
+                    url TEXT UNIQUE NOT NULL,
+                    claim TEXT NOT NULL,
+                    claimant TEXT,
+                    title TEXT,
+                    publisher TEXT,
+                    verdict TEXT,
+                    review_date TEXT,
+                    language TEXT,
+                    fetched_at REAL
+                )
+            """)
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    query TEXT NOT NULL,
+                    language TEXT NOT NULL,
+                    page_token TEXT,
+                    max_age_days INTEGER,
+                    synced_at REAL,
+                    PRIMARY KEY (query, language)
+                )
+            """)
+            try:
+                self._db.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS reviews_fts USING fts5("
+                    "claim, title, content='reviews', content_rowid='id')"
+                )
+                return True
+            except sqlite3.OperationalError:  # SQLite built without FTS5
+                return False
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM reviews").fetchone()[0]
+
+    def upsert(self, claims, language="en"):
+        """Store the claimReview entries of raw claims:search results; returns reviews written"""
+        rows = []
+        now = time.time()
+        for claim in claims or []:
+            for review in claim.get('claimReview', []):
+                if not review.get('url'):
+                    continue
+                rows.append((
+                    review['url'], claim.get('text') or review.get('title', ''), claim.get('claimant'),
+                    review.get('title', 'No title'), review.get('publisher', {}).get('name', 'Unknown'),
+                    review.get('textualRating', 'No verdict'), review.get('reviewDate', 'Unknown date'),
+                    review.get('languageCode', language), now
+                ))
+        if not rows:
+            return 0
+
+        with self._lock, self._db:
+            for row in rows:
+                old = self._db.execute("SELECT id, claim, title FROM reviews WHERE url = ?", (row[0],)).fetchone()
+                if old and self.fts:
+                    # External-content FTS tables need the old values to drop a row from the index
+                    self._db.execute(
+                        "INSERT INTO reviews_fts(reviews_fts, rowid, claim, title) VALUES ('delete', ?, ?, ?)",
+                        (old['id'], old['claim'], old['title'])
+                    )
+                cursor = self._db.execute("""
+                    INSERT INTO reviews (url, claim, claimant, title, publisher, verdict, review_date, language, fetched_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(url) DO UPDATE SET
+                        claim=excluded.claim, claimant=excluded.claimant, title=excluded.title,
+                        publisher=excluded.publisher, verdict=excluded.verdict, review_date=excluded.review_date,
+                        language=excluded.language, fetched_at=excluded.fetched_at
+                """, row)
+                if self.fts:
+                    row_id = old['id'] if old else cursor.lastrowid
+                    self._db.execute(
+                        "INSERT INTO reviews_fts(rowid, claim, title) VALUES (?, ?, ?)", (row_id, row[1], row[3])
+                    )
+            self.stats['stored'] += len(rows)
+        return len(rows)
+
+    def search(self, query, language="en", limit=None):
+        """
+        Reviews matching the query, best first.
+
+        A review matches when its claim covers at least min_match of the query
+        terms, weighted by rarity, including the query's rarest term; common
+        words alone cannot make a hit. Returns results shaped like
+        FactCheckService._parse_fact_checks, or [] on a miss.
+        """
+        terms = query_terms(query)
+        limit = limit or Config.FACTCHECK_RESULTS_PER_CLAIM
+        if not terms:
+            return []
+
+        with self._lock:
+            weights = self._term_weights(terms)
+            anchor = max(terms, key=lambda term: weights[term])
+            if self.fts:
+                match = " OR ".join('"{}"'.format(term.replace('"', '""')) for term in terms)
+                rows = self._db.execute("""
+                    SELECT r.* FROM reviews_fts JOIN reviews r ON r.id = reviews_fts.rowid
+                    WHERE reviews_fts MATCH ? AND r.language = ?
+                    ORDER BY bm25(reviews_fts) LIMIT ?
+                """, (match, language, limit * 10)).fetchall()
+            else:
+                # Rows must share the rarest-looking term at least
+                rows = self._db.execute(
+                    "SELECT * FROM reviews WHERE language = ? AND (claim LIKE ? OR title LIKE ?) LIMIT ?",
+                    (language, f"%{anchor}%", f"%{anchor}%", limit * 50)
+                ).fetchall()
+
+        total = sum(weights.values())
+        scored = []
+        for row in rows:
+            words = set(query_terms(f"{row['claim']} {row['title']}"))
+            if anchor not in words:
+                continue
+            coverage = sum(weights[term] for term in terms if term in words) / total
+            if coverage >= self.min_match:
+                scored.append((coverage, row))
+        scored.sort(key=lambda item: item[0], reverse=True)
+
+        results = [{
+            'title': row['title'],
+            'url': row['url'],
+            'publisher': row['publisher'],
+            'verdict': row['verdict'],
+            'date': row['review_date']
+        } for _, row in scored[:limit]]
+        with self._lock:
+            self.stats['hits' if results else 'misses'] += 1
+        return results
+
+    def _term_weights(self, terms):
+        """Inverse document frequency of each term over stored claims (term length without FTS5)"""
+        if not self.fts:
+            return {term: float(len(term)) for term in terms}
+        count = self._db.execute("SELECT COUNT(*) FROM reviews").fetchone()[0]
+        weights = {}
+        for term in terms:
+            matches = self._db.execute(
+                "SELECT COUNT(*) FROM reviews_fts WHERE reviews_fts MATCH ?", ('"{}"'.format(term.replace('"', '""')),)
+            ).fetchone()[0]
+            weights[term] = math.log((count + 1) / (matches + 0.5))
+        return weights
+
+    def sync(self, pages, queries, language="en", max_pages=None):
+        """
+        Incrementally harvest reviews for each query.
+
+        pages(query, language, page_token, max_age_days) yields (claims, next_page_token)
+        per API page. A query resumes from its saved page token; once fully paged it
+        is re-synced only for reviews newer than its last sync. Returns reviews written.
+        """
+        max_pages = max_pages or Config.FACTCHECK_MIRROR_SYNC_PAGES
+        written = 0
+        for query in queries:
+            page_token, max_age_days, synced_at = self._sync_state(query, language)
+            if synced_at and not page_token:
+                max_age_days = int((time.time() - synced_at) // 86400) + 1
+
+            for page, (claims, page_token) in enumerate(pages(query, language, page_token, max_age_days)):
+                written += self.upsert(claims, language)
+                # A page token is only valid with the filters it was issued for
+                self._save_sync_state(query, language, page_token, max_age_days if page_token else None)
+                if not page_token or page + 1 >= max_pages:
+                    break
+        return written
+
+    def _sync_state(self, query, language):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT page_token, max_age_days, synced_at FROM sync_state WHERE query = ? AND language = ?",
+                (query, language)
+            ).fetchone()
+        return (row['page_token'], row['max_age_days'], row['synced_at']) if row else (None, None, None)
+
+    def _save_sync_state(self, query, language, page_token, max_age_days):
+        with self._lock, self._db:
+            self._db.execute("""
+                INSERT INTO sync_state (query, language, page_token, max_age_days, synced_at) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(query, language) DO UPDATE SET
+                    page_token=excluded.page_token, max_age_days=excluded.max_age_days, synced_at=excluded.synced_at
+            """, (query, language, page_token, max_age_days, time.time()))
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+_mirror = None
+_mirror_lock = threading.Lock()
+
+
+def get_factcheck_mirror():
+    """Get the process-wide local fact-check mirror"""
+    global _mirror
+    if _mirror is None:
+        with _mirror_lock:
+            if _mirror is None:
+                _mirror = FactCheckMirror()
+    return _mirror
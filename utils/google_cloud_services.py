@@ -1,14 +1,15 @@
 import streamlit as st
-import requests
 import json
 from config import Config
+from utils.http_client import get_http_client
 
 class GoogleCloudVisionService:
     """Google Cloud Vision API service for image analysis"""
     
     def __init__(self):
         self.api_key = Config.GEMINI_API_KEY  # Using same key for now
-        self.base_url = "https://vision.googleapis.com/v1/images:annotate"
+        self.base_url = f"{Config.VISION_API_BASE}/images:annotate"
+        self.http = get_http_client()
     
     def analyze_image(self, image_data):
         """Analyze image using Google Cloud Vision API"""
@@ -36,7 +37,7 @@ class GoogleCloudVisionService:
             }
             
             # Make API call
-            response = requests.post(
+            response = self.http.post(
                 f"{self.base_url}?key={self.api_key}",
                 headers={'Content-Type': 'application/json'},
                 data=json.dumps(request_data),
@@ -59,6 +60,7 @@ class GoogleCloudNaturalLanguageService:
     def __init__(self):
         self.api_key = Config.GEMINI_API_KEY
         self.base_url = "https://language.googleapis.com/v1/documents:analyzeSentiment"
+        self.http = get_http_client()
     
     def analyze_sentiment(self, text):
         """Analyze sentiment using Google Cloud Natural Language API"""
@@ -71,7 +73,7 @@ class GoogleCloudNaturalLanguageService:
                 "encodingType": "UTF8"
             }
             
-            response = requests.post(
+            response = self.http.post(
                 f"{self.base_url}?key={self.api_key}",
                 headers={'Content-Type': 'application/json'},
                 data=json.dumps(request_data),
@@ -93,6 +95,7 @@ class GoogleCloudTranslateService:
     def __init__(self):
         self.api_key = Config.GEMINI_API_KEY
         self.base_url = "https://translation.googleapis.com/language/translate/v2"
+        self.http = get_http_client()
     
     def translate_text(self, text, target_language='en'):
         """Translate text using Google Cloud Translate API"""
@@ -103,7 +106,7 @@ class GoogleCloudTranslateService:
                 "format": "text"
             }
             
-            response = requests.post(
+            response = self.http.post(
                 f"{self.base_url}?key={self.api_key}",
                 headers={'Content-Type': 'application/json'},
                 data=json.dumps(request_data),
@@ -0,0 +1,115 @@
+import threading
+import time
+
+from config import Config
+
+
+class HealthMonitor:
+    """
+    Background prober of external dependencies with cached results.
+
+    Each probe runs on its own interval in a daemon thread, so page renders
+    only read the last known status instead of calling the APIs themselves.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._probes = {}
+        self._status = {}
+        self._thread = None
+
+    def register(self, name, probe, interval=None):
+        """
+        Probe a dependency every `interval` seconds; probe() returns True when healthy.
+
+        Registering an existing name again swaps the probe but keeps its last status.
+        """
+        interval = interval or Config.HEALTH_CHECK_INTERVALS.get(name, Config.HEALTH_CHECK_DEFAULT_INTERVAL)
+        with self._lock:
+            known = self._probes.get(name)
+            self._probes[name] = {
+                'probe': probe,
+                'interval': interval,
+                'next_run': known['next_run'] if known else 0.0
+            }
+        self._start()
+        self._wake.set()
+
+    def status(self, name):
+        """
+        Last probe result: {'ok', 'checked_at', 'latency', 'error'}.
+
+        'ok' is None while the first probe is pending or when the last result is
+        older than two intervals (the prober itself is stuck).
+        """
+        with self._lock:
+            probe = self._probes.get(name)
+            status = dict(self._status.get(name) or {'ok': None, 'checked_at': None, 'latency': None, 'error': None})
+        if probe and status['checked_at'] and time.time() - status['checked_at'] > 2 * probe['interval']:
+            status['ok'] = None
+        return status
+
+    def statuses(self):
+        with self._lock:
+            names = list(self._probes)
+        return {name: self.status(name) for name in names}
+
+    def refresh(self, name=None):
+        """Run one probe (or all of them) on the next loop iteration"""
+        with self._lock:
+            for probe_name, probe in self._probes.items():
+                if name is None or probe_name == name:
+                    probe['next_run'] = 0.0
+        self._wake.set()
+
+    def _start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="health-monitor", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wake.clear()
+            now = time.monotonic()
+            with self._lock:
+                due = [(name, p) for name, p in self._probes.items() if p['next_run'] <= now]
+                for _, probe in due:
+                    probe['next_run'] = now + probe['interval']
+
+            for name, probe in due:
+                self._check(name, probe['probe'])
+
+            with self._lock:
+                next_run = min((p['next_run'] for p in self._probes.values()), default=now + 60)
+            self._wake.wait(max(0.0, next_run - time.monotonic()))
+
+    def _check(self, name, probe):
+        started = time.monotonic()
+        try:
+            ok, error = bool(probe()), None
+        except Exception as e:
+            ok, error = False, str(e)
+        with self._lock:
+            self._status[name] = {
+                'ok': ok,
+                'checked_at': time.time(),
+                'latency': time.monotonic() - started,
+                'error': error
+            }
+
+
+_monitor = None
+_monitor_lock = threading.Lock()
+
+
+def get_health_monitor():
+    """Get the process-wide dependency health monitor"""
+    global _monitor
+    if _monitor is None:
+        with _monitor_lock:
+            if _monitor is None:
+                _monitor = HealthMonitor()
+    return _monitor
@@ -0,0 +1,269 @@
+import asyncio
+import socket
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+
+from config import Config
+
+# DNS answers (IP addresses) for the hosts our pooled clients connect to, least
+# recently used first; nothing else in the process resolves through this cache
+_dns_cache = OrderedDict()
+_dns_lock = threading.Lock()
+
+
+def resolve(host, port):
+    """IP addresses a TCP connection to host:port may use, in getaddrinfo order"""
+    infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    return list(dict.fromkeys(info[4][0] for info in infos))
+
+
+def _cached_addresses(host, port):
+    """Unexpired cached addresses of host:port, or None"""
+    with _dns_lock:
+        entry = _dns_cache.get((host, port))
+        if entry and entry[0] > time.monotonic():
+            _dns_cache.move_to_end((host, port))
+            return entry[1]
+    return None
+
+
+def cached_resolve(host, port):
+    """resolve() with a bounded TTL cache in front of it (HTTP_DNS_TTL, HTTP_DNS_CACHE_SIZE)"""
+    if Config.HTTP_DNS_TTL <= 0:
+        return resolve(host, port)
+    addresses = _cached_addresses(host, port)
+    if addresses is None:
+        addresses = resolve(host, port)
+        with _dns_lock:
+            _dns_cache[(host, port)] = (time.monotonic() + Config.HTTP_DNS_TTL, addresses)
+            _dns_cache.move_to_end((host, port))
+            while len(_dns_cache) > Config.HTTP_DNS_CACHE_SIZE:
+                _dns_cache.popitem(last=False)
+    return addresses
+
+
+class _ResolvingConnection:
+    """
+    urllib3 connection mixin that connects to the addresses of self.resolve(host, port).
+
+    Only the TCP connect goes to the resolved IP; the Host header, TLS SNI and
+    certificate check still use the URL's hostname.
+    """
+    resolve = None
+
+    def _new_conn(self):
+        hostname = self._dns_host
+        try:
+            addresses = self.resolve(hostname, self.port)
+        except (OSError, ValueError) as e:
+            raise NewConnectionError(self, f"Failed to resolve {hostname}: {e}") from e
+        if not addresses:
+            raise NewConnectionError(self, f"No addresses for {hostname}")
+
+        error = None
+        for address in addresses:
+            # urllib3 connects to _dns_host; the hostname is back in place before TLS starts
+            self._dns_host = address
+            try:
+                return super()._new_conn()
+            except (ConnectTimeoutError, NewConnectionError) as e:
+                error = e
+            finally:
+                self._dns_host = hostname
+        raise error
+
+
+def _pool_classes(resolver):
+    """urllib3 pool classes (by scheme) whose connections resolve hostnames with resolver"""
+    classes = {}
+    for scheme, pool, connection in (("http", HTTPConnectionPool, HTTPConnection),
+                                     ("https", HTTPSConnectionPool, HTTPSConnection)):
+        connection_class = type(connection.__name__, (_ResolvingConnection, connection),
+                                {'resolve': staticmethod(resolver)})
+        classes[scheme] = type(pool.__name__, (pool,), {'ConnectionCls': connection_class})
+    return classes
+
+
+class ResolvingAdapter(HTTPAdapter):
+    """requests adapter whose connections resolve hostnames with resolver(host, port) -> [ip, ...]"""
+
+    def __init__(self, resolver, **kwargs):
+        self.resolver = resolver
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = _pool_classes(self.resolver)
+
+
+class HTTPClient:
+    """Shared pooled HTTP transport for outbound API calls"""
+
+    def __init__(self, pool_connections=None, pool_maxsize=None,
+                 connect_timeout=None, read_timeout=None):
+        self.pool_connections = pool_connections or Config.HTTP_POOL_CONNECTIONS
+        self.pool_maxsize = pool_maxsize or Config.HTTP_POOL_MAXSIZE
+        self.connect_timeout = connect_timeout or Config.HTTP_CONNECT_TIMEOUT
+        self.read_timeout = read_timeout or Config.HTTP_READ_TIMEOUT
+
+        self.session = requests.Session()
+        # One keep-alive pool per host, retries are handled by the callers
+        adapter = ResolvingAdapter(
+            cached_resolve,
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            max_retries=0,
+            pool_block=False
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._warmed_hosts = set()
+        self._warm_lock = threading.Lock()
+
+    def _timeout(self, timeout):
+        """Build a (connect, read) timeout tuple"""
+        if isinstance(timeout, tuple):
+            return timeout
+        return (self.connect_timeout, timeout or self.read_timeout)
+
+    def request(self, method, url, timeout=None, **kwargs):
+        """Send a request over the shared connection pools"""
+        return self.session.request(method, url, timeout=self._timeout(timeout), **kwargs)
+
+    def pinned_request(self, method, url, addresses, timeout=None, **kwargs):
+        """
+        Send a request that connects only to the given (already vetted) addresses of the URL's host.
+
+        The connection is not pooled and ignores proxy settings, so no other DNS
+        answer or proxy can take its place; Host, SNI and the certificate check
+        still use the hostname. Redirects must be followed (and vetted) by the caller.
+        """
+        host = urlparse(url).hostname
+
+        def vetted(hostname, port):
+            if hostname != host:
+                raise OSError(f"{hostname} was not vetted")
+            return addresses
+
+        session = requests.Session()
+        session.trust_env = False
+        adapter = ResolvingAdapter(vetted, max_retries=0)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        kwargs['allow_redirects'] = False
+        try:
+            return session.request(method, url, timeout=self._timeout(timeout), **kwargs)
+        finally:
+            # A streamed response keeps its connection until it is closed
+            session.close()
+
+    def get(self, url, timeout=None, **kwargs):
+        """Send a GET request"""
+        return self.request("GET", url, timeout=timeout, **kwargs)
+
+    def post(self, url, timeout=None, **kwargs):
+        """Send a POST request"""
+        return self.request("POST", url, timeout=timeout, **kwargs)
+
+    def warm_up(self, urls, background=True):
+        """Open connections to the given hosts ahead of the first real call"""
+        pending = []
+        with self._warm_lock:
+            for url in urls:
+                parsed = urlparse(url)
+                origin = f"{parsed.scheme}://{parsed.netloc}"
+                if origin not in self._warmed_hosts:
+                    self._warmed_hosts.add(origin)
+                    pending.append(origin)
+
+        if not pending:
+            return
+
+        def _warm():
+            for origin in pending:
+                try:
+                    # Any response (even 404) leaves a TLS connection in the pool
+                    self.request("HEAD", f"{origin}/", timeout=self.connect_timeout,
+                                 allow_redirects=False)
+                except Exception:
+                    with self._warm_lock:
+                        self._warmed_hosts.discard(origin)
+
+        if background:
+            threading.Thread(target=_warm, name="http-warmup", daemon=True).start()
+        else:
+            _warm()
+
+    def close(self):
+        """Close every pooled connection"""
+        self.session.close()
+
+
+def _caching_network_backend(backend):
+    """Wrap an httpcore network backend so TCP connects use cached_resolve()"""
+    import httpcore
+
+    class CachingNetworkBackend(httpcore.AsyncNetworkBackend):
+        async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+            addresses = _cached_addresses(host, port) if Config.HTTP_DNS_TTL > 0 else None
+            if addresses is None:
+                addresses = await asyncio.to_thread(cached_resolve, host, port)
+            error = httpcore.ConnectError(f"No addresses for {host}")
+            for address in addresses:
+                # TLS is started by the connection with the origin's hostname, not this address
+                try:
+                    return await backend.connect_tcp(address, port, timeout=timeout, local_address=local_address,
+                                                     socket_options=socket_options)
+                except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                    error = e
+            raise error
+
+        async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+            return await backend.connect_unix_socket(path, timeout=timeout, socket_options=socket_options)
+
+        async def sleep(self, seconds):
+            await backend.sleep(seconds)
+
+    return CachingNetworkBackend()
+
+
+def create_async_http_client():
+    """Create a pooled httpx.AsyncClient for asyncio services (one per event loop)"""
+    import httpx
+
+    transport = httpx.AsyncHTTPTransport(
+        limits=httpx.Limits(
+            max_connections=Config.HTTP_ASYNC_MAX_CONNECTIONS,
+            max_keepalive_connections=Config.HTTP_POOL_MAXSIZE
+        )
+    )
+    # httpx has no resolver option; its connection pool takes the network backend
+    transport._pool._network_backend = _caching_network_backend(transport._pool._network_backend)
+
+    return httpx.AsyncClient(
+        transport=transport,
+        timeout=httpx.Timeout(Config.HTTP_READ_TIMEOUT, connect=Config.HTTP_CONNECT_TIMEOUT)
+    )
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_http_client():
+    """Get the process-wide HTTP client"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HTTPClient()
+    return _client
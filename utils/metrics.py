@@ -0,0 +1,89 @@
+import math
+import threading
+import time
+from collections import deque
+
+from config import Config
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of values (q in 0..100), or None if empty"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = min(len(ordered) - 1, max(0, math.ceil(q / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+class MetricsStore:
+    """Bounded in-process store of per-call API metrics (oldest calls are dropped first)"""
+
+    def __init__(self, max_calls=None):
+        self._calls = deque(maxlen=max_calls or Config.METRICS_MAX_CALLS)
+        self._lock = threading.Lock()
+
+    def record(self, model, status, wall_seconds, ttfb_seconds=None, retries=0, usage=None, streamed=False):
+        """Record one call; usage is Gemini's usageMetadata"""
+        usage = usage or {}
+        call = {
+            'timestamp': time.time(),
+            'model': model,
+            'status': status,
+            'wall_seconds': wall_seconds,
+            'ttfb_seconds': ttfb_seconds,
+            'retries': retries,
+            'prompt_tokens': usage.get('promptTokenCount', 0),
+            'output_tokens': usage.get('candidatesTokenCount', 0),
+            'total_tokens': usage.get('totalTokenCount', 0),
+            'streamed': streamed
+        }
+        with self._lock:
+            self._calls.append(call)
+
+    def calls(self, model=None, since=None):
+        """Recorded calls, optionally for one model and/or newer than a timestamp"""
+        with self._lock:
+            calls = list(self._calls)
+        return [c for c in calls
+                if (model is None or c['model'] == model) and (since is None or c['timestamp'] >= since)]
+
+    def summary(self, model=None, window=None):
+        """Latency percentiles, error rate and token throughput over the last `window` seconds"""
+        now = time.time()
+        calls = self.calls(model, since=now - window if window else None)
+        ok = [c for c in calls if c['status'] == 200]
+        latencies = [c['wall_seconds'] for c in ok]
+        ttfbs = [c['ttfb_seconds'] for c in ok if c['ttfb_seconds'] is not None]
+        tokens = sum(c['total_tokens'] or c['prompt_tokens'] + c['output_tokens'] for c in calls)
+        span = (now - calls[0]['timestamp']) if calls else 0.0
+        return {
+            'calls': len(calls),
+            'errors': len(calls) - len(ok),
+            'error_rate': (len(calls) - len(ok)) / len(calls) if calls else 0.0,
+            'p50': percentile(latencies, 50),
+            'p95': percentile(latencies, 95),
+            'p99': percentile(latencies, 99),
+            'ttfb_p50': percentile(ttfbs, 50),
+            'avg_retries': sum(c['retries'] for c in calls) / len(calls) if calls else 0.0,
+            'prompt_tokens': sum(c['prompt_tokens'] for c in calls),
+            'output_tokens': sum(c['output_tokens'] for c in calls),
+            'tokens_per_minute': tokens / span * 60 if span > 0 else 0.0
+        }
+
+    def models(self):
+        with self._lock:
+            return sorted({c['model'] for c in self._calls})
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_metrics_store():
+    """Get the process-wide API call metrics store"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = MetricsStore()
+    return _store
@@ -0,0 +1,167 @@
+import re
+import threading
+import unicodedata
+import zlib
+
+import numpy as np
+
+from config import Config
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_NON_WORD = re.compile(r"[^\w\s]+")
+
+
+def shingles(text):
+    """
+    Word-bigram shingles of text, insensitive to casing, emoji and punctuation.
+
+    One changed word only touches the two bigrams around it, so light edits
+    keep a high Jaccard similarity with the original.
+    """
+    words = _NON_WORD.sub(" ", unicodedata.normalize("NFKC", text or "").casefold()).split()
+    if len(words) < 2:
+        return set(words)
+    return {f"{a} {b}" for a, b in zip(words, words[1:])}
+
+
+class NearDuplicateIndex:
+    """
+    MinHash/LSH index of analyzed texts for near-duplicate lookups.
+
+    Signatures are split into bands; each band is hashed to one int64 key kept
+    in a sorted array (plus a small unsorted buffer for recent additions), so a
+    lookup is a handful of binary searches regardless of index size.
+    """
+
+    def __init__(self, num_perm=None, bands=None, threshold=None, merge_every=4096, seed=1):
+        self.num_perm = num_perm or Config.NEAR_DUPLICATE_PERMUTATIONS
+        self.bands = bands or Config.NEAR_DUPLICATE_BANDS
+        if self.num_perm % self.bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.rows = self.num_perm // self.bands
+        self.threshold = threshold or Config.NEAR_DUPLICATE_THRESHOLD
+        self.merge_every = merge_every
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 1 << 32, size=self.num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 1 << 32, size=self.num_perm, dtype=np.uint64)
+        # Odd multipliers fold one band's rows into a single 64-bit key
+        self._band_mix = rng.randint(1, 1 << 62, size=self.rows, dtype=np.uint64) | np.uint64(1)
+
+        self._lock = threading.RLock()
+        self._signatures = np.empty((1024, self.num_perm), dtype=np.uint32)
+        self._payloads = []
+        self._sorted_keys = [np.empty(0, dtype=np.int64) for _ in range(self.bands)]
+        self._sorted_ids = [np.empty(0, dtype=np.int32) for _ in range(self.bands)]
+        self._pending = [{} for _ in range(self.bands)]
+        self._pending_count = 0
+
+    def __len__(self):
+        return len(self._payloads)
+
+    def signature(self, text):
+        """MinHash signature of text, or None if it has no words"""
+        hashes = np.fromiter((zlib.crc32(s.encode()) for s in shingles(text)), dtype=np.uint64)
+        if not hashes.size:
+            return None
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) % _MERSENNE_PRIME
+        return (permuted & _MAX_HASH).min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, signature):
+        with np.errstate(over="ignore"):
+            mixed = signature.reshape(self.bands, self.rows).astype(np.uint64) * self._band_mix
+        return mixed.sum(axis=1, dtype=np.uint64).view(np.int64)
+
+    def add(self, text, payload):
+        """Index text with the payload to hand back on a match; returns False for empty text"""
+        signature = self.signature(text)
+        if signature is None:
+            return False
+        keys = self._band_keys(signature)
+
+        with self._lock:
+            entry_id = len(self._payloads)
+            if entry_id == len(self._signatures):
+                self._signatures = np.concatenate([self._signatures, np.empty_like(self._signatures)])
+            self._signatures[entry_id] = signature
+            self._payloads.append(payload)
+
+            for band, key in enumerate(keys.tolist()):
+                self._pending[band].setdefault(key, []).append(entry_id)
+            self._pending_count += 1
+            if self._pending_count >= self.merge_every:
+                self._merge()
+        return True
+
+    def _merge(self):
+        """
+        Fold the pending buffer into the sorted band arrays.
+
+        Only the pending batch is sorted; it is spliced into the sorted run at
+        its searchsorted positions, a linear copy instead of re-sorting the index.
+        """
+        for band in range(self.bands):
+            pending = self._pending[band]
+            if not pending:
+                continue
+            new_keys = np.fromiter((k for k, ids in pending.items() for _ in ids), dtype=np.int64)
+            new_ids = np.fromiter((i for ids in pending.values() for i in ids), dtype=np.int32)
+            order = np.argsort(new_keys, kind="stable")
+            new_keys, new_ids = new_keys[order], new_ids[order]
+            # After equal keys, so ids of one key stay in insertion order
+            positions = np.searchsorted(self._sorted_keys[band], new_keys, side="right")
+            self._sorted_keys[band] = np.insert(self._sorted_keys[band], positions, new_keys)
+            self._sorted_ids[band] = np.insert(self._sorted_ids[band], positions, new_ids)
+            self._pending[band] = {}
+        self._pending_count = 0
+
+    def lookup(self, text, threshold=None, **match):
+        """
+        Most similar indexed text at or above the Jaccard threshold.
+
+        Keyword arguments restrict the candidates to payloads with those values
+        (lookup(text, language="en")). Returns {'similarity', 'payload'} or None.
+        """
+        signature = self.signature(text)
+        if signature is None:
+            return None
+        keys = self._band_keys(signature).tolist()
+        threshold = self.threshold if threshold is None else threshold
+
+        with self._lock:
+            candidates = set()
+            for band, key in enumerate(keys):
+                sorted_keys = self._sorted_keys[band]
+                start = np.searchsorted(sorted_keys, key, side="left")
+                end = np.searchsorted(sorted_keys, key, side="right")
+                if end > start:
+                    candidates.update(self._sorted_ids[band][start:end].tolist())
+                candidates.update(self._pending[band].get(key, ()))
+            if match:
+                candidates = {entry_id for entry_id in candidates
+                              if all(self._payloads[entry_id].get(k) == v for k, v in match.items())}
+            if not candidates:
+                return None
+
+            ids = np.fromiter(candidates, dtype=np.int64)
+            # Fraction of matching MinHash values estimates the Jaccard similarity
+            similarities = (self._signatures[ids] == signature).mean(axis=1)
+            best = int(similarities.argmax())
+            if similarities[best] < threshold:
+                return None
+            return {'similarity': float(similarities[best]), 'payload': self._payloads[ids[best]]}
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_near_duplicate_index():
+    """Get the process-wide near-duplicate index of analyzed texts"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = NearDuplicateIndex()
+    return _index
@@ -0,0 +1,126 @@
+import threading
+import time
+
+from config import Config
+from utils.singleflight import get_singleflight
+
+
+class NewsFeedCache:
+    """
+    Process-wide snapshots of news feeds, kept fresh by a background refresher.
+
+    A feed is loaded the first time any session asks for it, then re-fetched
+    every refresh_interval seconds for as long as someone keeps reading it, so
+    upstream calls scale with the interval rather than with page views. A
+    failed refresh keeps serving the previous snapshot.
+    """
+
+    def __init__(self, refresh_interval=None, idle_ttl=None):
+        self.refresh_interval = refresh_interval or Config.NEWS_REFRESH_INTERVAL
+        self.idle_ttl = idle_ttl or Config.NEWS_FEED_IDLE_TTL
+
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._feeds = {}
+        self._flights = get_singleflight("news")
+        self._thread = None
+        self.stats = {'reads': 0, 'refreshes': 0, 'failures': 0}
+
+    def get(self, key, loader):
+        """
+        Latest snapshot of a feed: {'articles', 'fetched_at', 'error'}.
+
+        loader() fetches the feed's articles; it runs inline (once, however many
+        sessions ask) only while the feed has no snapshot yet.
+        """
+        now = time.time()
+        with self._lock:
+            feed = self._feeds.setdefault(key, {'loader': loader, 'snapshot': None, 'last_read': now})
+            feed['loader'] = loader
+            feed['last_read'] = now
+            snapshot = feed['snapshot']
+            self.stats['reads'] += 1
+
+        if snapshot is None:
+            self._flights.do(repr(key), lambda: self._refresh(key))
+            with self._lock:
+                snapshot = feed['snapshot']
+        self._start()
+        return dict(snapshot or {'articles': [], 'fetched_at': None, 'error': None})
+
+    def request_refresh(self, key, min_age=None):
+        """Refresh a feed in the background unless its snapshot is younger than min_age seconds"""
+        min_age = Config.NEWS_MIN_REFRESH_AGE if min_age is None else min_age
+        with self._lock:
+            feed = self._feeds.get(key)
+            if feed is None or not feed['snapshot']:
+                return False
+            if time.time() - feed['snapshot']['fetched_at'] < min_age:
+                return False
+            feed['refresh_now'] = True
+        self._start()
+        self._wake.set()
+        return True
+
+    def _refresh(self, key):
+        with self._lock:
+            feed = self._feeds.get(key)
+            if feed is None:
+                return
+            loader = feed['loader']
+            previous = feed['snapshot']
+
+        try:
+            snapshot = {'articles': loader(), 'fetched_at': time.time(), 'error': None}
+        except Exception as e:
+            # Keep the last good articles; retry at the next interval
+            snapshot = dict(previous or {'articles': []}, fetched_at=time.time(), error=str(e))
+            with self._lock:
+                self.stats['failures'] += 1
+
+        with self._lock:
+            feed['snapshot'] = snapshot
+            feed['refresh_now'] = False
+            self.stats['refreshes'] += 1
+
+    def _start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="news-refresher", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wake.clear()
+            now = time.time()
+            with self._lock:
+                # Stop polling feeds nobody has read for a while
+                for key in [k for k, f in self._feeds.items() if now - f['last_read'] > self.idle_ttl]:
+                    del self._feeds[key]
+                due = [key for key, feed in self._feeds.items()
+                       if feed['snapshot'] is not None and (
+                           feed.get('refresh_now') or now - feed['snapshot']['fetched_at'] >= self.refresh_interval)]
+
+            for key in due:
+                self._flights.do(repr(key), lambda key=key: self._refresh(key))
+
+            with self._lock:
+                next_due = min((f['snapshot']['fetched_at'] + self.refresh_interval
+                                for f in self._feeds.values() if f['snapshot'] is not None),
+                               default=now + self.refresh_interval)
+            self._wake.wait(max(1.0, next_due - time.time()))
+
+
+_news_cache = None
+_news_cache_lock = threading.Lock()
+
+
+def get_news_cache():
+    """Get the process-wide news feed cache"""
+    global _news_cache
+    if _news_cache is None:
+        with _news_cache_lock:
+            if _news_cache is None:
+                _news_cache = NewsFeedCache()
+    return _news_cache
@@ -0,0 +1,90 @@
+import hashlib
+import re
+import unicodedata
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track the click, not the article
+_TRACKING_PARAMS = re.compile(r"^(utm_\w+|fbclid|gclid|mc_cid|mc_eid|ref|ref_src|cmpid|smid|ocid|taid|at_\w+)$")
+_AMP_PATH = re.compile(r"(/amp/?$|\.amp(?=$|\.html$))")
+_WORD = re.compile(r"\w+", re.UNICODE)
+# "BREAKING: ..." / "... - Reuters" decorations that vary between copies of one story
+_TITLE_PREFIX = re.compile(r"^\s*(breaking|update|updated|watch|live|exclusive|just in)\s*[:|-]\s*", re.IGNORECASE)
+_TITLE_SUFFIX = re.compile(r"\s+[-|–—]\s+[^-|–—]{2,40}$")
+
+
+def canonical_url(url):
+    """URL with scheme, www., tracking parameters, fragments, AMP suffixes and trailing slashes normalized away"""
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if host.startswith("amp."):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    path = _AMP_PATH.sub("", parts.path).rstrip("/") or "/"
+    query = urlencode(sorted((k, v) for k, v in parse_qsl(parts.query) if not _TRACKING_PARAMS.match(k)))
+    return urlunsplit(("https", host, path, query, ""))
+
+
+def title_key(title):
+    """Headline without the publisher suffix and breaking-news prefix"""
+    return _TITLE_PREFIX.sub("", _TITLE_SUFFIX.sub("", title or ""))
+
+
+def simhash(text, bits=64):
+    """
+    64-bit SimHash of text over word unigrams and bigrams.
+
+    Copies of a headline that differ in casing, punctuation or Unicode forms
+    hash within a few bits of each other; distinct headlines land far apart.
+    """
+    words = _WORD.findall(unicodedata.normalize("NFKC", text or "").casefold())
+    features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    if not features:
+        return 0
+    weights = [0] * bits
+    for feature in features:
+        digest = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "big")
+        for bit in range(bits):
+            weights[bit] += 1 if digest >> bit & 1 else -1
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+
+def dedupe_articles(articles, max_distance=3):
+    """
+    Drop syndicated copies from a list of normalized articles, keeping the first of each story.
+
+    Two articles are the same story when their canonical URLs match or their
+    title SimHashes are within max_distance bits. The sources of dropped copies
+    are listed on the kept article under 'also_reported_by'.
+    """
+    kept, by_url, fingerprints = [], {}, []
+    for article in articles:
+        url = canonical_url(article.get('url'))
+        fingerprint = simhash(title_key(article.get('title')))
+
+        original = by_url.get(url) if url else None
+        if original is None and article.get('title'):
+            original = next((k for k, fp in fingerprints if hamming(fp, fingerprint) <= max_distance), None)
+
+        if original is not None:
+            source = article.get('source', {}).get('name')
+            if source and source != original.get('source', {}).get('name') \
+                    and source not in original['also_reported_by']:
+                original['also_reported_by'].append(source)
+            continue
+
+        article = dict(article, also_reported_by=[])
+        kept.append(article)
+        if url:
+            by_url[url] = article
+        if article.get('title'):
+            fingerprints.append((article, fingerprint))
+    return kept
@@ -0,0 +1,221 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+from config import Config
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, the file backend is unavailable
+    fcntl = None
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a call would have to wait longer than the limiter allows"""
+
+    def __init__(self, model, retry_in):
+        self.model = model
+        self.retry_in = retry_in
+        super().__init__(f"{model} rate limit reached, retry in {retry_in:.0f}s")
+
+
+def _take(state, requests, now):
+    """
+    Refill and try to draw from every bucket in requests, all or nothing.
+
+    requests is a list of (key, capacity, rate per second, amount). Returns 0.0
+    when granted, otherwise the seconds until every bucket could cover its amount.
+    """
+    wait = 0.0
+    levels = {}
+    for key, capacity, rate, amount in requests:
+        tokens, updated_at = state.get(key, (capacity, now))
+        tokens = min(capacity, tokens + max(0.0, now - updated_at) * rate)
+        levels[key] = tokens
+        amount = min(amount, capacity)
+        if tokens < amount:
+            wait = max(wait, (amount - tokens) / rate)
+
+    for key, capacity, rate, amount in requests:
+        tokens = levels[key]
+        if not wait:
+            tokens -= min(amount, capacity)
+        state[key] = (tokens, now)
+    return wait
+
+
+class MemoryBucketStore:
+    """Token bucket state shared by the threads of this process"""
+
+    # try_acquire only holds an in-process lock briefly, safe to call on an event loop
+    blocking = False
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state = {}
+
+    def try_acquire(self, requests):
+        with self._lock:
+            return _take(self._state, requests, time.time())
+
+
+class FileBucketStore:
+    """Token bucket state in a locked JSON file, shared by every worker process on the host"""
+
+    # try_acquire waits on flock and fsyncs
+    blocking = True
+
+    def __init__(self, path):
+        if fcntl is None:
+            raise RuntimeError("The file rate limit backend needs fcntl (POSIX)")
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def try_acquire(self, requests):
+        with self._lock, open(self.path, "a+", encoding="utf-8") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                try:
+                    state = {k: tuple(v) for k, v in json.loads(f.read() or "{}").items()}
+                except ValueError:
+                    state = {}
+                # Wall clock, since monotonic clocks are not comparable across processes
+                wait = _take(state, requests, time.time())
+                f.seek(0)
+                f.truncate()
+                json.dump(state, f)
+                f.flush()
+                os.fsync(f.fileno())
+                return wait
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class RateLimiter:
+    """
+    Per-model request (RPM) and token (TPM) budgets in front of an upstream.
+
+    Callers of the same model queue in FIFO order; only the head of the queue
+    draws from the buckets, so a burst cannot starve earlier callers.
+    """
+
+    def __init__(self, limits=None, store=None, max_wait=None):
+        # model -> (requests per minute, tokens per minute)
+        self.limits = limits if limits is not None else Config.GEMINI_RATE_LIMITS
+        self.store = store or MemoryBucketStore()
+        self.max_wait = max_wait if max_wait is not None else Config.RATE_LIMIT_MAX_WAIT
+
+        self._cond = threading.Condition()
+        self._queues = {}
+        self.stats = {'granted': 0, 'rejected': 0, 'waited_seconds': 0.0}
+
+    def _requests(self, model, tokens):
+        rpm, tpm = self.limits[model]
+        requests = [(f"{model}:requests", rpm, rpm / 60.0, 1)]
+        if tpm:
+            requests.append((f"{model}:tokens", tpm, tpm / 60.0, tokens))
+        return requests
+
+    def acquire(self, model, tokens=0, max_wait=None):
+        """
+        Block until model has budget for one request of about `tokens` tokens.
+
+        Returns the seconds waited. Raises RateLimitExceeded if that would take
+        longer than max_wait.
+        """
+        if model not in self.limits:
+            return 0.0
+
+        started = time.monotonic()
+        deadline = started + (self.max_wait if max_wait is None else max_wait)
+        requests = self._requests(model, tokens)
+        ticket = object()
+
+        with self._cond:
+            queue = self._queues.setdefault(model, deque())
+            queue.append(ticket)
+        try:
+            while True:
+                with self._cond:
+                    while queue[0] is not ticket:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise RateLimitExceeded(model, self.max_wait)
+                        self._cond.wait(remaining)
+
+                wait = self.store.try_acquire(requests)
+                if not wait:
+                    return self._granted(started)
+                if time.monotonic() + wait > deadline:
+                    raise RateLimitExceeded(model, wait)
+                time.sleep(wait)
+        except RateLimitExceeded:
+            with self._cond:
+                self.stats['rejected'] += 1
+            raise
+        finally:
+            with self._cond:
+                queue.remove(ticket)
+                self._cond.notify_all()
+
+    async def aacquire(self, model, tokens=0, max_wait=None):
+        """
+        Asyncio counterpart of acquire() (no FIFO queue, callers poll the buckets).
+
+        Stores that block (the file backend) are polled on a worker thread, off the event loop.
+        """
+        if model not in self.limits:
+            return 0.0
+
+        started = time.monotonic()
+        deadline = started + (self.max_wait if max_wait is None else max_wait)
+        requests = self._requests(model, tokens)
+        while True:
+            if getattr(self.store, 'blocking', True):
+                wait = await asyncio.to_thread(self.store.try_acquire, requests)
+            else:
+                wait = self.store.try_acquire(requests)
+            if not wait:
+                return self._granted(started)
+            if time.monotonic() + wait > deadline:
+                with self._cond:
+                    self.stats['rejected'] += 1
+                raise RateLimitExceeded(model, wait)
+            await asyncio.sleep(wait)
+
+    def _granted(self, started):
+        waited = time.monotonic() - started
+        with self._cond:
+            self.stats['granted'] += 1
+            self.stats['waited_seconds'] += waited
+        return waited
+
+    def queue_depth(self, model=None):
+        """Callers currently waiting (or drawing) for one model, or for all of them"""
+        with self._cond:
+            if model is not None:
+                return len(self._queues.get(model, ()))
+            return {name: len(queue) for name, queue in self._queues.items()}
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter():
+    """Get the process-wide Gemini rate limiter (RATE_LIMIT_BACKEND picks its state store)"""
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                store = None
+                if Config.RATE_LIMIT_BACKEND == "file" and fcntl is not None:
+                    store = FileBucketStore(Path(Config.RATE_LIMIT_DIR) / "gemini.json")
+                _limiter = RateLimiter(store=store)
+    return _limiter
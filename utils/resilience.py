@@ -0,0 +1,288 @@
+import asyncio
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from config import Config
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit breaker is open"""
+
+    def __init__(self, breaker):
+        self.name = breaker.name
+        self.retry_in = breaker.retry_in()
+        super().__init__(f"{self.name} circuit is open, retry in {self.retry_in:.0f}s")
+
+
+def parse_retry_after(value):
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def _is_transient_exception(exc):
+    """Connection resets and timeouts are worth retrying, programming errors are not"""
+    if isinstance(exc, (ConnectionError, TimeoutError)):
+        return True
+    try:
+        import requests
+        if isinstance(exc, (requests.ConnectionError, requests.Timeout)):
+            return True
+    except ImportError:
+        pass
+    try:
+        import httpx
+        if isinstance(exc, httpx.TransportError):
+            return True
+    except ImportError:
+        pass
+    return False
+
+
+class RetryPolicy:
+    """Classifies failures and computes jittered exponential backoff"""
+
+    RETRYABLE_STATUSES = {408, 429, 500, 502, 503, 504}
+
+    def __init__(self, max_attempts=None, base_delay=None, max_delay=None, max_retry_after=None):
+        self.max_attempts = max_attempts or Config.RETRY_MAX_ATTEMPTS
+        self.base_delay = base_delay or Config.RETRY_BASE_DELAY
+        self.max_delay = max_delay or Config.RETRY_MAX_DELAY
+        # A Retry-After longer than this is not waited out in the user's request
+        self.max_retry_after = max_retry_after or Config.RETRY_MAX_RETRY_AFTER
+
+    def is_retryable_status(self, status_code):
+        return status_code in self.RETRYABLE_STATUSES
+
+    def is_retryable_exception(self, exc):
+        return _is_transient_exception(exc)
+
+    def backoff(self, attempt, retry_after=None):
+        """Delay before retry number attempt+1 ("full jitter"), honoring Retry-After"""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+
+class CircuitBreaker:
+    """Per-upstream circuit breaker: closed -> open after repeated failures -> half-open probe"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name, failure_threshold=None, recovery_timeout=None):
+        self.name = name
+        self.failure_threshold = failure_threshold or Config.BREAKER_FAILURE_THRESHOLD
+        self.recovery_timeout = recovery_timeout or Config.BREAKER_RECOVERY_TIMEOUT
+
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_until = 0.0
+        self._probe_in_flight = False
+        self.last_error = None
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self):
+        if self._state == self.OPEN and time.monotonic() >= self._opened_until:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def allow(self):
+        """Whether a call may go through right now"""
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._probe_in_flight:
+                # Let a single probe through to test recovery
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def retry_in(self):
+        """Seconds until the breaker lets a probe through"""
+        with self._lock:
+            return max(0.0, self._opened_until - time.monotonic())
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self, error=None, retry_after=None):
+        """Count a failed call; open the circuit at the threshold or when told to back off"""
+        with self._lock:
+            self._failures += 1
+            self.last_error = error
+            state = self._current_state()
+            if (state == self.HALF_OPEN or self._failures >= self.failure_threshold
+                    or retry_after is not None):
+                cooldown = max(self.recovery_timeout, retry_after or 0)
+                self._state = self.OPEN
+                self._opened_until = time.monotonic() + cooldown
+                self._probe_in_flight = False
+
+    def snapshot(self):
+        """State summary for status panels"""
+        with self._lock:
+            state = self._current_state()
+            return {
+                'state': state,
+                'failures': self._failures,
+                'retry_in': max(0.0, self._opened_until - time.monotonic()) if state == self.OPEN else 0.0,
+                'last_error': self.last_error
+            }
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name):
+    """Get the process-wide circuit breaker for an upstream (e.g. a Gemini model)"""
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name)
+        return _breakers[name]
+
+
+def get_breaker_states():
+    """Snapshot every registered circuit breaker"""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.snapshot() for breaker in breakers}
+
+
+def _close(response):
+    close = getattr(response, 'close', None)
+    if callable(close):
+        try:
+            close()
+        except Exception:
+            pass
+
+
+def _next_step(policy, breaker, attempt, response=None, error=None):
+    """
+    Decide what to do after one attempt.
+
+    Returns ('return', None), ('raise', None) or ('retry', delay).
+    """
+    last_attempt = attempt + 1 >= policy.max_attempts
+
+    if error is not None:
+        if policy.is_retryable_exception(error) and not last_attempt:
+            return 'retry', policy.backoff(attempt)
+        breaker.record_failure(str(error))
+        return 'raise', None
+
+    status = response.status_code
+    if not policy.is_retryable_status(status):
+        # Success, or a client error that says nothing about upstream health
+        breaker.record_success()
+        return 'return', None
+
+    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+    if retry_after is not None and retry_after > policy.max_retry_after:
+        # Upstream asked for a longer pause than we will make the user wait
+        breaker.record_failure(f"HTTP {status}", retry_after=retry_after)
+        return 'return', None
+    if last_attempt:
+        breaker.record_failure(f"HTTP {status}")
+        return 'return', None
+    return 'retry', policy.backoff(attempt, retry_after)
+
+
+async def _aclose(response):
+    """Release a (possibly streamed) async response before retrying"""
+    aclose = getattr(response, 'aclose', None)
+    if callable(aclose):
+        try:
+            await aclose()
+        except Exception:
+            pass
+
+
+def send_with_retry(send, breaker, policy=None, stats=None):
+    """
+    Call send() (which returns an HTTP response) with classified retries.
+
+    Raises CircuitOpenError without calling send() while the breaker is open.
+    Returns the final response, which may still be an error response.
+    If given, stats['retries'] is kept up to date with the retries made.
+    """
+    policy = policy or RetryPolicy()
+    if not breaker.allow():
+        raise CircuitOpenError(breaker)
+
+    attempt = 0
+    while True:
+        response, error = None, None
+        if stats is not None:
+            stats['retries'] = attempt
+        try:
+            response = send()
+        except Exception as e:
+            error = e
+
+        action, delay = _next_step(policy, breaker, attempt, response, error)
+        if action == 'return':
+            return response
+        if action == 'raise':
+            raise error
+
+        if response is not None:
+            _close(response)
+        attempt += 1
+        time.sleep(delay)
+
+
+async def asend_with_retry(send, breaker, policy=None, stats=None):
+    """Asyncio counterpart of send_with_retry; send() returns an awaitable response"""
+    policy = policy or RetryPolicy()
+    if not breaker.allow():
+        raise CircuitOpenError(breaker)
+
+    attempt = 0
+    while True:
+        response, error = None, None
+        if stats is not None:
+            stats['retries'] = attempt
+        try:
+            response = await send()
+        except Exception as e:
+            error = e
+
+        action, delay = _next_step(policy, breaker, attempt, response, error)
+        if action == 'return':
+            return response
+        if action == 'raise':
+            raise error
+
+        if response is not None:
+            await _aclose(response)
+        attempt += 1
+        await asyncio.sleep(delay)
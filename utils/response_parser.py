@@ -0,0 +1,260 @@
+import re
+from dataclasses import dataclass, field
+from enum import Enum
+
+# Emoji-delimited sections of a FORENSIC_PROMPT response, in prompt order
+FORENSIC_SECTIONS = [
+    "VERACITY ASSESSMENT",
+    "MANIPULATION TACTICS",
+    "EVIDENCE EVALUATION",
+    "TARGET ANALYSIS",
+    "HARM POTENTIAL",
+    "COUNTER-NARRATIVE",
+    "VERIFICATION STEPS",
+    "SOURCE LINKS & ARTICLES",
+    "REPORTING INFORMATION"
+]
+
+# Optional markdown (#, *), one or more emoji, then a known title and an optional colon
+SECTION_HEADER = re.compile(
+    r"^[\s#*]*(?:[^\w\s]+\s*)+(" + "|".join(re.escape(t) for t in FORENSIC_SECTIONS) + r")\s*:?\**\s*(.*)$"
+)
+
+_VERDICT_PATTERN = re.compile(r"\b(false information|misleading|unverified|true)\b", re.IGNORECASE)
+# Scheme, a dotted host, then anything up to whitespace, quotes or closing brackets
+_URL_PATTERN = re.compile(r"https?://[\w-]+(?:\.[\w-]+)+(?::\d+)?(?:/[^\s\"'<>\]\)]*)?")
+_EMAIL_PATTERN = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+
+# Fallback wording used when the model does not state a verdict
+HIGH_RISK_TERMS = [
+    'false', 'misinformation', 'disinformation', 'fake', 'untrue',
+    'deceptive', 'manipulative', 'harmful', 'dangerous',
+    'conspiracy', 'hoax', 'scam', 'fraud', 'deceit'
+]
+MEDIUM_RISK_TERMS = [
+    'questionable', 'suspicious', 'unreliable',
+    'biased', 'exaggerated', 'incomplete', 'outdated'
+]
+
+
+class Verdict(Enum):
+    """Veracity verdict stated at the top of a forensic analysis"""
+    FALSE = "FALSE INFORMATION"
+    MISLEADING = "MISLEADING"
+    UNVERIFIED = "UNVERIFIED"
+    TRUE = "TRUE"
+    UNKNOWN = "UNKNOWN"
+
+    @classmethod
+    def from_text(cls, text):
+        """First verdict phrase in text, or UNKNOWN"""
+        match = _VERDICT_PATTERN.search(text or "")
+        if not match:
+            return cls.UNKNOWN
+        return cls(match.group(1).upper())
+
+
+# Risk implied by an explicit verdict (UNKNOWN falls back to the risk wording)
+VERDICT_RISK = {
+    Verdict.FALSE: 90,       # Very high risk for false information
+    Verdict.MISLEADING: 80,  # High risk for misleading content
+    Verdict.UNVERIFIED: 60,  # Medium-high risk for unverified content
+    Verdict.TRUE: 10         # Low risk for verified true content
+}
+
+
+@dataclass
+class Source:
+    name: str
+    description: str
+    url: str = None
+
+
+@dataclass
+class ReportingContact:
+    description: str
+    email: str
+
+
+@dataclass
+class ForensicReport:
+    """Typed view of a forensic analysis response"""
+    verdict: Verdict = Verdict.UNKNOWN
+    sections: dict = field(default_factory=dict)
+    sources: list = field(default_factory=list)
+    reporting_contacts: list = field(default_factory=list)
+    raw: str = ""
+    _risk_terms: tuple = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def high_risk_terms(self):
+        """High-risk fallback wording in the raw response (scanned on first use)"""
+        return self._scan_risk_terms()[0]
+
+    @property
+    def medium_risk_terms(self):
+        """Medium-risk fallback wording in the raw response (scanned on first use)"""
+        return self._scan_risk_terms()[1]
+
+    def _scan_risk_terms(self):
+        # Only needed when there is no verdict, so parsing does not pay for it
+        if self._risk_terms is None:
+            lowered = self.raw.lower()
+            self._risk_terms = ({t for t in HIGH_RISK_TERMS if t in lowered},
+                                {t for t in MEDIUM_RISK_TERMS if t in lowered})
+        return self._risk_terms
+
+    def sources_as_dicts(self):
+        return [{'name': s.name, 'description': s.description, 'url': s.url} for s in self.sources]
+
+    def reporting_as_dicts(self):
+        return [{'description': c.description, 'email': c.email} for c in self.reporting_contacts]
+
+
+def _clean_url(value):
+    """Return the first valid http(s) URL in value, or None"""
+    match = _URL_PATTERN.search(value or "")
+    return match.group(0).rstrip(".,;:") if match else None
+
+
+def _parse_source(line):
+    """Parse "- Source Name: description - URL" (quotes and markdown links tolerated)"""
+    item = line.lstrip("-*• ")
+    colon = item.find(':')
+    if colon <= 0:
+        return None
+    name = item[:colon].strip(" \"'*[]")
+    if not name or name.startswith("http"):
+        return None
+    rest = item[colon + 1:]
+
+    match = _URL_PATTERN.search(rest)
+    description = rest[:match.start()] if match else rest
+    if ' - ' in description:
+        head, tail = description.rsplit(' - ', 1)
+        # Drop a separator followed only by link markup such as '"' or '[link]('
+        if not tail.strip(" \"'[]()") or tail.lstrip().startswith('['):
+            description = head
+    description = description.strip(" -[]()*")
+    # Drop quotes left unbalanced by the split, or wrapping the whole description
+    if description.count('"') % 2:
+        description = description.strip('"')
+    if len(description) > 1 and description[0] == description[-1] == '"':
+        description = description[1:-1]
+
+    url = match.group(0).rstrip(".,;:") if match else None
+    return Source(name=name, description=description, url=url)
+
+
+def _parse_contact(line):
+    """Parse "- Description: email@domain" """
+    match = _EMAIL_PATTERN.search(line)
+    if not match:
+        return None
+    description = line[:match.start()].lstrip("-*• ").strip().rstrip(":-* ").strip(" \"'")
+    return ReportingContact(description=description or "Report", email=match.group(0))
+
+
+def parse_forensic_response(text):
+    """
+    Parse a forensic analysis response in a single pass over its lines.
+
+    Returns a ForensicReport with the verdict, every section's body, and validated
+    source links and reporting contacts; the fallback risk wording is scanned
+    only if asked for.
+    """
+    report = ForensicReport(raw=text or "")
+    if not text:
+        return report
+
+    current, body = None, []
+    preamble = []
+
+    def _close_section():
+        if current:
+            report.sections[current] = "\n".join(body).strip()
+
+    for line in text.splitlines():
+        # Headers open with markdown or an emoji, so most lines skip the regex
+        match = SECTION_HEADER.match(line) if line and not line[0].isalnum() and line[0] != '-' else None
+        if match:
+            _close_section()
+            current, body = match.group(1), []
+            line = match.group(2)
+            if not line:
+                continue
+
+        if not current:
+            preamble.append(line)
+            continue
+        body.append(line)
+
+        if current == "SOURCE LINKS & ARTICLES":
+            stripped = line.strip()
+            if stripped.startswith(("-", "*", "•")):
+                source = _parse_source(stripped)
+                if source:
+                    report.sources.append(source)
+        elif current == "REPORTING INFORMATION":
+            stripped = line.strip()
+            if stripped.startswith(("-", "*", "•")):
+                contact = _parse_contact(stripped)
+                if contact:
+                    report.reporting_contacts.append(contact)
+
+    _close_section()
+
+    # Prefer the statement opening the veracity section over stray mentions
+    if "VERACITY ASSESSMENT" in report.sections:
+        report.verdict = Verdict.from_text(report.sections["VERACITY ASSESSMENT"])
+    if report.verdict == Verdict.UNKNOWN and preamble:
+        report.verdict = Verdict.from_text("\n".join(preamble))
+
+    return report
+
+
+def report_risk(report):
+    """Risk score (0-100) a forensic report implies: its verdict, else its risk wording"""
+    if report.verdict in VERDICT_RISK:
+        return VERDICT_RISK[report.verdict]
+    if report.high_risk_terms:
+        return 75  # High risk for concerning factors
+    if report.medium_risk_terms:
+        return 50  # Medium risk
+    return 0  # No additional risk from AI analysis
+
+
+def report_from_structured(structured, raw=""):
+    """Build a ForensicReport from a COMBINED_SCHEMA response, validating its fields"""
+    forensic = structured.get('forensic') or {}
+    try:
+        verdict = Verdict(str(forensic.get('verdict', '')).upper())
+    except ValueError:
+        verdict = Verdict.UNKNOWN
+
+    report = ForensicReport(verdict=verdict, raw=raw)
+    report.sections = {
+        "VERACITY ASSESSMENT": str(forensic.get('veracity_assessment', '')),
+        "MANIPULATION TACTICS": str(forensic.get('manipulation_tactics', '')),
+        "EVIDENCE EVALUATION": str(forensic.get('evidence_evaluation', '')),
+        "TARGET ANALYSIS": str(forensic.get('target_analysis', '')),
+        "HARM POTENTIAL": str(forensic.get('harm_potential', '')),
+        "COUNTER-NARRATIVE": str(forensic.get('counter_narrative', '')),
+        "VERIFICATION STEPS": str(forensic.get('verification_steps', ''))
+    }
+    for source in forensic.get('sources') or []:
+        if isinstance(source, dict) and source.get('name'):
+            report.sources.append(Source(
+                name=str(source['name']),
+                description=str(source.get('description', '')),
+                url=_clean_url(source.get('url'))
+            ))
+    for contact in forensic.get('reporting_contacts') or []:
+        if isinstance(contact, dict):
+            email = _EMAIL_PATTERN.search(str(contact.get('email', '')))
+            if email:
+                report.reporting_contacts.append(ReportingContact(
+                    description=str(contact.get('description', '')) or "Report",
+                    email=email.group(0)
+                ))
+    return report
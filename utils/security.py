@@ -2,6 +2,7 @@ import streamlit as st
 import hashlib
 import hmac
 import re
+import unicodedata
 from datetime import datetime
 from config import Config
 
@@ -56,6 +57,11 @@ class SecurityService:
         """Generate hash for content tracking"""
         return hashlib.sha256(content.encode()).hexdigest()[:16]
     
+    def normalize_content(self, content):
+        """Normalize content so trivially different copies hash the same"""
+        content = unicodedata.normalize('NFKC', content)
+        return re.sub(r'\s+', ' ', content).strip()
+    
     def check_content_safety(self, content):
         """Basic content safety check"""
         content_lower = content.lower()
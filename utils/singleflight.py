@@ -0,0 +1,198 @@
+import asyncio
+import threading
+
+
+class _Call:
+    """One in-flight call, shared by everyone who asked for it"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class StreamAbandonedError(RuntimeError):
+    """The stream being replayed was abandoned before it finished"""
+
+
+class _StreamCall:
+    """One in-flight generator whose chunks are replayed to every follower"""
+
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.chunks = []
+        self.finished = False
+        self.error = None
+        self.followers = 0
+
+    def append(self, chunk):
+        with self.cond:
+            self.chunks.append(chunk)
+            self.cond.notify_all()
+
+    def finish(self, error=None):
+        with self.cond:
+            self.finished = True
+            self.error = error
+            self.cond.notify_all()
+
+    def replay(self):
+        index = 0
+        while True:
+            with self.cond:
+                while index >= len(self.chunks) and not self.finished:
+                    self.cond.wait()
+                if index >= len(self.chunks):
+                    if self.error is not None:
+                        raise self.error
+                    return
+                chunk = self.chunks[index]
+            index += 1
+            yield chunk
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one execution"""
+
+    def __init__(self, name):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._streams = {}
+        self._async_calls = {}
+        self.stats = {'calls': 0, 'coalesced': 0}
+
+    def do(self, key, fn):
+        """
+        Run fn() unless a call with the same key is already in flight,
+        in which case wait for it and share its result (or exception).
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.stats['calls'] += 1
+            else:
+                self.stats['coalesced'] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = fn()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            # Forget the key first so later callers start a fresh call
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.value
+
+    def stream(self, key, make_iter):
+        """
+        Generator counterpart of do(): the first caller iterates make_iter(),
+        concurrent callers with the same key replay its chunks as they arrive.
+
+        If the first caller stops reading early, the rest of the stream is
+        drained on a background thread for the callers still replaying it.
+        """
+        with self._lock:
+            call = self._streams.get(key)
+            leader = call is None
+            if leader:
+                call = self._streams[key] = _StreamCall()
+                self.stats['calls'] += 1
+            else:
+                call.followers += 1
+                self.stats['coalesced'] += 1
+
+        if not leader:
+            yield from call.replay()
+            return
+
+        chunks = iter(make_iter())
+        error, completed, handed_off = None, False, False
+        try:
+            for chunk in chunks:
+                call.append(chunk)
+                yield chunk
+            completed = True
+        except GeneratorExit:
+            handed_off = self._hand_off(key, call, chunks)
+            if not handed_off:
+                raise
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            if not handed_off:
+                if not completed and error is None:
+                    error = StreamAbandonedError(f"{self.name}: stream {key!r} was abandoned")
+                    getattr(chunks, "close", lambda: None)()
+                with self._lock:
+                    self._streams.pop(key, None)
+                call.finish(error)
+
+    def _hand_off(self, key, call, chunks):
+        """Keep draining a stream its leader abandoned, if anyone is replaying it"""
+        with self._lock:
+            if not call.followers:
+                self._streams.pop(key, None)
+                return False
+
+        def drain():
+            error = None
+            try:
+                for chunk in chunks:
+                    call.append(chunk)
+            except Exception as e:
+                error = e
+            finally:
+                with self._lock:
+                    self._streams.pop(key, None)
+                call.finish(error)
+
+        threading.Thread(target=drain, name=f"{self.name}-drain", daemon=True).start()
+        return True
+
+    async def ado(self, key, fn):
+        """Asyncio counterpart of do(); fn() returns an awaitable, calls are shared per event loop"""
+        loop_key = (id(asyncio.get_running_loop()), key)
+        with self._lock:
+            future = self._async_calls.get(loop_key)
+            leader = future is None
+            if leader:
+                future = self._async_calls[loop_key] = asyncio.ensure_future(fn())
+                self.stats['calls'] += 1
+            else:
+                self.stats['coalesced'] += 1
+        try:
+            # shield: one cancelled waiter must not cancel the call for the others
+            return await asyncio.shield(future)
+        finally:
+            if leader:
+                with self._lock:
+                    self._async_calls.pop(loop_key, None)
+
+    def in_flight(self):
+        """Number of distinct calls currently running"""
+        with self._lock:
+            return len(self._calls) + len(self._streams) + len(self._async_calls)
+
+
+_flights = {}
+_flights_lock = threading.Lock()
+
+
+def get_singleflight(name):
+    """Get the process-wide request coalescing group for an upstream"""
+    with _flights_lock:
+        if name not in _flights:
+            _flights[name] = SingleFlight(name)
+        return _flights[name]
@@ -0,0 +1,230 @@
+import heapq
+import re
+import threading
+import time
+import zlib
+from datetime import datetime
+
+import numpy as np
+
+from config import Config
+from utils.news_dedupe import title_key
+
+_WORD = re.compile(r"[^\W\d_][\w'-]*", re.UNICODE)
+# Runs of capitalized words: "Federal Reserve", "Joe Biden", "NATO"
+_ENTITY = re.compile(r"\b(?:[A-Z][\w'-]*|[A-Z]{2,})(?:\s+(?:of|the|de|[A-Z][\w'-]*))*(?<!\bof)(?<!\bthe)(?<!\bde)")
+STOPWORDS = frozenset("""
+a about after again against all also an and any are as at be because been before being between both but by can
+could did do does during each few for from further had has have having he her here hers him his how i if in into
+is it its just more most my new news no nor not now of off on once only or other our out over own said same says
+she should so some such than that the their them then there these they this those through to too under until up
+very was we were what when where which while who whom why will with would you your report reports live update
+updates video watch breaking latest today year years day week first last one two us get gets
+""".split())
+
+
+def extract_topics(title, description=""):
+    """
+    Distinct topic features of an article: named entities, then word unigrams and
+    bigrams (casefolded, without stopwords) not already covered by an entity.
+    """
+    title = title_key(title)
+    text = f"{title}. {description or ''}"
+    entities = set()
+    for match in _ENTITY.finditer(text):
+        words = match.group(0).split()
+        while words and words[0].casefold() in STOPWORDS:
+            words.pop(0)
+        if not words:
+            continue
+        entity = " ".join(words)
+        # A lone capitalized word opening a sentence is usually not a name
+        opens_sentence = match.start() == 0 or text[match.start() - 2:match.start()] in (". ", "! ", "? ")
+        if len(words) > 1 or entity.isupper() or not opens_sentence:
+            entities.add(entity)
+    covered = {word for entity in entities for word in entity.casefold().split()}
+
+    words = [m.group(0).casefold() for m in _WORD.finditer(title)]
+    kept = [len(w) > 2 and w not in STOPWORDS for w in words]
+    grams = {w for w, keep in zip(words, kept) if keep and w not in covered}
+    grams.update(f"{a} {b}" for (a, keep_a), (b, keep_b) in zip(zip(words, kept), zip(words[1:], kept[1:]))
+                 if keep_a and keep_b and not (a in covered and b in covered))
+    return entities | grams
+
+
+class TrendingEngine:
+    """
+    Streaming topic counter over a sliding time window.
+
+    The window is a ring of time buckets. Each bucket holds a count-min sketch
+    of topic mentions and its `capacity` heaviest topics, so memory and query
+    cost stay constant however many articles have been counted. Growth compares
+    the mention rate of the most recent buckets against the rest of the window.
+    """
+
+    def __init__(self, bucket_seconds=None, buckets=None, recent_buckets=None, width=16384, depth=4, capacity=None):
+        self.bucket_seconds = bucket_seconds or Config.TRENDING_BUCKET_SECONDS
+        self.buckets = buckets or Config.TRENDING_BUCKETS
+        self.recent_buckets = recent_buckets or Config.TRENDING_RECENT_BUCKETS
+        if not 0 < self.recent_buckets < self.buckets:
+            raise ValueError("recent_buckets must be between 0 and buckets")
+        self.width = width
+        self.depth = depth
+        self.capacity = capacity or Config.TRENDING_CAPACITY
+
+        self._lock = threading.Lock()
+        self._counts = np.zeros((self.buckets, depth, width), dtype=np.int32)
+        self._epochs = np.full(self.buckets, -1, dtype=np.int64)
+        self._heavy = [{} for _ in range(self.buckets)]
+        self._heaps = [[] for _ in range(self.buckets)]
+        self._rows = np.arange(depth)
+        self._last_id = 0
+        self._sync_lock = threading.Lock()
+        self.stats = {'articles': 0, 'mentions': 0, 'late': 0}
+
+    def _columns(self, topic):
+        """Sketch column of topic in each row (double hashing over two CRCs)"""
+        data = topic.encode()
+        h1, h2 = zlib.crc32(data), zlib.adler32(data) | 1
+        return (h1 + self._rows * h2) % self.width
+
+    def _slot(self, epoch):
+        """Ring slot of a bucket epoch, clearing it if it last held an older bucket; None if too old"""
+        slot = epoch % self.buckets
+        current = self._epochs[slot]
+        if current == epoch:
+            return slot
+        if current > epoch:
+            return None
+        self._counts[slot] = 0
+        self._heavy[slot] = {}
+        self._heaps[slot] = []
+        self._epochs[slot] = epoch
+        return slot
+
+    def add(self, topics, timestamp=None):
+        """Count one article mentioning each of topics at timestamp (default now)"""
+        now = time.time()
+        timestamp = min(timestamp or now, now)
+        epoch = int(timestamp // self.bucket_seconds)
+        with self._lock:
+            if epoch <= int(now // self.bucket_seconds) - self.buckets:
+                self.stats['late'] += 1
+                return
+            slot = self._slot(epoch)
+            if slot is None:
+                self.stats['late'] += 1
+                return
+
+            counts, heavy, heap = self._counts[slot], self._heavy[slot], self._heaps[slot]
+            for topic in topics:
+                columns = self._columns(topic)
+                counts[self._rows, columns] += 1
+                estimate = int(counts[self._rows, columns].min())
+                self._track(heavy, heap, topic, estimate)
+            self.stats['articles'] += 1
+            self.stats['mentions'] += len(topics)
+
+    def _track(self, heavy, heap, topic, estimate):
+        """Keep the `capacity` topics with the highest estimates (min-heap with lazy deletion)"""
+        if topic not in heavy and len(heavy) >= self.capacity:
+            while heap and heavy.get(heap[0][1]) != heap[0][0]:
+                heapq.heappop(heap)  # stale entry
+            if heap and heap[0][0] >= estimate:
+                return
+            _, evicted = heapq.heappop(heap)
+            del heavy[evicted]
+        heavy[topic] = estimate
+        heapq.heappush(heap, (estimate, topic))
+        if len(heap) > 4 * self.capacity:
+            heap[:] = [(count, t) for t, count in heavy.items()]
+            heapq.heapify(heap)
+
+    def add_article(self, article):
+        """Count the topics of a NewsAPI-shaped article at its publication time"""
+        topics = extract_topics(article.get('title'), article.get('description'))
+        if topics:
+            self.add(topics, parse_timestamp(article.get('publishedAt')))
+
+    def sync(self, store):
+        """Count the articles stored since the last sync (only those within the window on a cold start)"""
+        with self._sync_lock:
+            since = time.time() - self.buckets * self.bucket_seconds
+            articles = store.read_after(self._last_id, since=since)
+            for article in articles:
+                self.add_article(article)
+            if articles:
+                self._last_id = articles[-1]['id']
+        return len(articles)
+
+    def top(self, k=10, by="count", min_count=None):
+        """
+        The k trending topics: [{'topic', 'count', 'recent', 'growth'}].
+
+        count is mentions in the whole window, recent those in the last
+        recent_buckets; growth is the recent mention rate relative to the earlier
+        part of the window (1.0 = twice as frequent), or None until that earlier
+        part has collected any mentions (a cold start). by="growth" ranks rising
+        topics with at least min_count mentions first.
+        """
+        min_count = Config.TRENDING_MIN_COUNT if min_count is None else min_count
+        now_epoch = int(time.time() // self.bucket_seconds)
+        with self._lock:
+            live = [slot for slot in range(self.buckets) if self._epochs[slot] > now_epoch - self.buckets]
+            recent = [slot for slot in live if self._epochs[slot] > now_epoch - self.recent_buckets]
+            # Growth needs a baseline: mentions counted before the recent buckets
+            has_baseline = any(self._heavy[slot] for slot in live if slot not in recent)
+            candidates = sorted({topic for slot in live for topic in self._heavy[slot]})
+            if not candidates:
+                return []
+            columns = np.stack([self._columns(topic) for topic in candidates])  # (topics, depth)
+            gathered = self._counts[:, self._rows, columns]  # (buckets, topics, depth)
+            in_window = gathered[live].sum(axis=0).min(axis=1)
+            in_recent = gathered[recent].sum(axis=0).min(axis=1) if recent else np.zeros(len(candidates))
+
+        recent_span = self.recent_buckets
+        earlier_span = self.buckets - self.recent_buckets
+        topics = []
+        for topic, count, recent_count in zip(candidates, in_window.tolist(), in_recent.tolist()):
+            if count < min_count:
+                continue
+            growth = None
+            if has_baseline:
+                earlier_rate = max(count - recent_count, 1) / earlier_span
+                growth = round((recent_count / recent_span) / earlier_rate - 1, 2)
+            topics.append({
+                'topic': topic,
+                'count': int(count),
+                'recent': int(recent_count),
+                'growth': growth
+            })
+
+        if by == "growth" and has_baseline:
+            key = lambda t: (t['growth'], t['count'])
+        else:
+            key = lambda t: (t['count'], t['growth'] or 0)
+        return heapq.nlargest(k, topics, key=key)
+
+
+def parse_timestamp(value):
+    """Epoch seconds of an ISO 8601 publishedAt, or None"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_trending_engine():
+    """Get the process-wide trending topic engine"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = TrendingEngine()
+    return _engine